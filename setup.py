@@ -71,6 +71,7 @@ lib_exts = [
     "yt/geometry/*.pyx",
     "yt/utilities/cython_fortran_utils.pyx",
     "yt/frontends/ramses/io_utils.pyx",
+    "yt/frontends/enzo/io_utils.pyx",
     "yt/utilities/lib/cykdtree/kdtree.pyx",
     "yt/utilities/lib/cykdtree/utils.pyx",
     "yt/frontends/artio/_artio_caller.pyx",
@@ -21,6 +21,7 @@ ytcfg_defaults = dict(
     __global_parallel_size="1",
     __topcomm_parallel_rank="0",
     __topcomm_parallel_size="1",
+    __parallel_processes="1",
     __command_line="False",
     storeparameterfiles="False",
     parameterfilestore="parameter_files.csv",
@@ -51,6 +52,21 @@ ytcfg_defaults = dict(
     thread_field_detection="False",
     ignore_invalid_unit_operation_errors="False",
     chunk_size="1000",
+    io_cache_size="0",
+    io_prefetch_depth="0",
+    io_prefetch_threads="2",
+    prefetch_datasets="0",
+    prefetch_dataset_index="False",
+    prefetch_datasets_memory="0",
+    field_dependency_cache_dir="",
+    enzo_index_cache="False",
+    ramses_index_cache="False",
+    ramses_index_nprocs="1",
+    particle_index_nprocs="1",
+    particle_index_block_size="0",
+    particle_id_index_cache="False",
+    kdtree_brick_cache_size="256",
+    projection_threads="1",
     xray_data_dir="/does/not/exist",
     supp_data_dir="/does/not/exist",
     default_colormap="arbre",
@@ -1,8 +1,11 @@
 import fileinput
 import io
 import os
+import queue
 import warnings
 import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from re import finditer
 from tempfile import NamedTemporaryFile, TemporaryFile
@@ -19,7 +22,14 @@ from yt.data_objects.selection_objects.data_selection_objects import (
 from yt.extern.tqdm import tqdm
 from yt.fields.field_exceptions import NeedsGridType, NeedsOriginalGrid
 from yt.frontends.sph.data_structures import ParticleDataset
-from yt.funcs import ensure_list, get_memory_usage, iterable, mylog, only_on_root
+from yt.funcs import (
+    ensure_list,
+    get_memory_usage,
+    get_thread_count,
+    iterable,
+    mylog,
+    only_on_root,
+)
 from yt.geometry import particle_deposit as particle_deposit
 from yt.geometry.coordinates.cartesian_coordinates import all_data
 from yt.loaders import load_uniform_grid
@@ -36,13 +46,14 @@ from yt.utilities.lib.interpolators import ghost_zone_interpolate
 from yt.utilities.lib.marching_cubes import march_cubes_grid, march_cubes_grid_flux
 from yt.utilities.lib.misc_utilities import fill_region, fill_region_float
 from yt.utilities.lib.pixelization_routines import (
-    interpolate_sph_grid_gather,
+    interpolate_sph_grid_gather_fields,
     interpolate_sph_positions_gather,
     normalization_1d_utility,
     normalization_3d_utility,
-    pixelize_sph_kernel_arbitrary_grid,
+    pixelize_sph_kernel_arbitrary_grid_fields,
+    pixelize_sph_kernel_projection,
 )
-from yt.utilities.lib.quad_tree import QuadTree
+from yt.utilities.lib.quad_tree import QuadTree, merge_quadtrees
 from yt.utilities.minimal_representation import MinimalProjectionData
 from yt.utilities.parallel_tools.parallel_analysis_interface import (
     communication_system,
@@ -235,15 +246,8 @@ class YTProj(YTSelectionContainer2D):
         if communication_system.communicators[-1].size > 1:
             for chunk in self.data_source.chunks([], "io", local_only=False):
                 self._initialize_chunk(chunk, tree)
-        _units_initialized = False
         with self.data_source._field_parameter_state(self.field_parameters):
-            for chunk in parallel_objects(
-                self.data_source.chunks([], "io", local_only=True)
-            ):
-                if not _units_initialized:
-                    self._initialize_projected_units(fields, chunk)
-                    _units_initialized = True
-                self._handle_chunk(chunk, fields, tree)
+            self._fill_tree(tree, fields)
         # if there's less than nprocs chunks, units won't be initialized
         # on all processors, so sync with _projected_units on rank 0
         projected_units = self.comm.mpi_bcast(self._projected_units)
@@ -363,7 +367,70 @@ class YTProj(YTSelectionContainer2D):
 
 class YTParticleProj(YTProj):
     """
-    A projection operation optimized for SPH particle data.
+    This is a data object corresponding to a line integral through the
+    simulation domain for particle data.
+
+    This object is typically accessed through the `proj` object that hangs
+    off of particle datasets.  The projection is a uniform grid of pixels
+    covering the data source in the image plane.  Every particle of an SPH
+    field is smoothed with its kernel onto the pixels and integrated along
+    the axis.  The particles of other particle fields, such as those of
+    N-body datasets, are deposited in the pixel they fall in, so that their
+    integral is the sum of their values per unit area of the pixel.  The
+    pixels are stored like the cells of a quadtree projection, with their
+    centers and half-widths in the px, py, pdx and pdy fields.  The
+    projection of a field is only made the first time it is accessed, chunk
+    by chunk, and the images made by every processor are combined when
+    running in parallel.
+
+    Parameters
+    ----------
+    field : string
+        This is the field which will be "projected" along the axis.  If
+        multiple are specified (in a list) they will all be projected in
+        the first pass.
+    axis : int
+        The axis along which to slice.  Can be 0, 1, or 2 for x, y, z.
+    weight_field : string
+        If supplied, the field being projected will be multiplied by this
+        weight value before being integrated, and at the conclusion of the
+        projection the resultant values will be divided by the projected
+        `weight_field`.
+    center : array_like, optional
+        The 'center' supplied to fields that use it.  Note that this does
+        not have to have `coord` as one value.  Strictly optional.
+    data_source : `yt.data_objects.data_containers.YTSelectionContainer`, optional
+        If specified, this will be the data source used for selecting
+        regions to project.
+    method : string, optional
+        The method of projection to be performed.
+        "integrate" : integration along the axis
+        "mip" : maximum intensity projection, where each pixel takes the
+        largest value of the particles whose kernel covers it, or that it
+        holds for fields that are not SPH fields.  Pixels that no particle
+        covers are NaN.
+        "sum" : the sum of the values of the particles in each pixel,
+        without any smoothing, for every field.
+    style : string, optional
+        The same as the method keyword.  Deprecated as of version 3.0.2.
+        Please use method keyword instead.
+    field_parameters : dict of items
+        Values to be passed as field parameters that can be
+        accessed by generated fields.
+    buff_size : tuple of ints, optional
+        The number of pixels along the x and y axes of the image plane.
+        Default: (800, 800).
+
+    Examples
+    --------
+
+    >>> ds = load("snapshot_033/snap_033.0.hdf5")
+    >>> prj = ds.proj(("gas", "density"), 2)
+    >>> print(prj["gas", "density"])
+
+    >>> ds = load("output_00080/info_00080.txt")
+    >>> prj = ds.proj(("all", "particle_mass"), 2)
+    >>> print(prj["all", "particle_mass"].to("Msun/kpc**2"))
     """
 
     _type_name = "particle_proj"
@@ -380,6 +447,7 @@ class YTParticleProj(YTProj):
         method="integrate",
         field_parameters=None,
         max_level=None,
+        buff_size=(800, 800),
     ):
         super(YTParticleProj, self).__init__(
             field,
@@ -393,11 +461,226 @@ class YTParticleProj(YTProj):
             field_parameters,
             max_level,
         )
+        if not iterable(buff_size):
+            buff_size = (buff_size, buff_size)
+        self.buff_size = tuple(int(n) for n in buff_size)
+
+    @property
+    def bounds(self):
+        """
+        The extent of the image plane, (xmin, xmax, ymin, ymax), in code
+        units.
+        """
+        xax = self.ds.coordinates.x_axis[self.axis]
+        yax = self.ds.coordinates.y_axis[self.axis]
+        le, re = self.data_source.get_bbox()
+        le = np.maximum(le.to("code_length").d, self.ds.domain_left_edge.d)
+        re = np.minimum(re.to("code_length").d, self.ds.domain_right_edge.d)
+        return (le[xax], re[xax], le[yax], re[yax])
+
+    def _generate_container_field(self, field):
+        x_min, x_max, y_min, y_max = self.bounds
+        nx, ny = self.buff_size
+        dx = (x_max - x_min) / nx
+        dy = (y_max - y_min) / ny
+        if field == "px":
+            px = x_min + (np.arange(nx) + 0.5) * dx
+            rv = np.repeat(px, ny)
+        elif field == "py":
+            py = y_min + (np.arange(ny) + 0.5) * dy
+            rv = np.tile(py, nx)
+        elif field == "pdx":
+            rv = np.full(nx * ny, 0.5 * dx)
+        elif field == "pdy":
+            rv = np.full(nx * ny, 0.5 * dy)
+        else:
+            raise KeyError(field)
+        return self.ds.arr(rv, "code_length")
+
+    def _is_deposited(self, field):
+        # Whether the particles of a field are deposited in the pixel they
+        # fall in, rather than smoothed with their kernel.
+        return self._sum_only or not self.ds._get_field_info(field).is_sph_field
+
+    def _initialize_projected_units(self, fields, chunk):
+        fields = [
+            field
+            for field in self.data_source._determine_fields(fields)
+            if field not in self._projected_units
+        ]
+        super(YTParticleProj, self)._initialize_projected_units(fields, chunk)
+        if self.method != "integrate" or self._sum_only or self.weight_field:
+            return
+        # Deposited particles are integrated over the area of their pixel.
+        registry = self.ds.unit_registry
+        length_unit = Unit(self.ds.unit_system["length"], registry=registry)
+        for field in fields:
+            if self._is_deposited(field):
+                self._projected_units[field] /= length_unit ** 3
+
+    def get_data(self, fields=None):
+        fields = fields or []
+        fields = self._determine_fields(ensure_list(fields))
+        if len(fields) == 0:
+            return
+        for field in fields + [self.weight_field]:
+            if field is None:
+                continue
+            finfo = self.ds._get_field_info(field)
+            if not finfo.is_sph_field and finfo.sampling_type != "particle":
+                raise NotImplementedError(
+                    f"Cannot project {field}, only particle fields can be projected."
+                )
+        deposited = [self._is_deposited(field) for field in fields]
+        nx, ny = self.buff_size
+        mip = self.method == "mip"
+        # The pixelization routines accumulate into each image in place.
+        images = np.full((len(fields), nx, ny), -np.inf if mip else 0.0)
+        # The weights are smoothed like the SPH fields, and deposited for
+        # the particle type of each deposited field.
+        weight_keys = [
+            field[0] if is_deposited else None
+            for field, is_deposited in zip(fields, deposited)
+        ]
+        weight_images = {}
+        if self.weight_field is not None and not mip:
+            weight_images = {key: np.zeros((nx, ny)) for key in weight_keys}
+        with self.data_source._field_parameter_state(self.field_parameters):
+            for chunk in parallel_objects(
+                self.data_source.chunks([], "io", local_only=True)
+            ):
+                self._initialize_projected_units(fields, chunk)
+                self._handle_chunk(chunk, fields, (images, weight_images))
+        # if there's less than nprocs chunks, units won't be initialized
+        # on all processors, so sync with _projected_units on rank 0
+        projected_units = self.comm.mpi_bcast(self._projected_units)
+        self._projected_units = projected_units
+        images = self.comm.mpi_allreduce(images, op="max" if mip else "sum")
+        for key in weight_images:
+            weight_images[key] = self.comm.mpi_allreduce(weight_images[key], op="sum")
+        # The kernel is integrated in code length, so convert to the length
+        # unit of the unit system, like the path elements of a grid
+        # projection.
+        dl_conv = self.ds.quan(1.0, "code_length").to(self.ds.unit_system["length"])
+        x_min, x_max, y_min, y_max = self.bounds
+        pixel_area = (x_max - x_min) / nx * (y_max - y_min) / ny
+        for fi, key in enumerate(weight_keys):
+            if mip:
+                images[fi][np.isinf(images[fi])] = np.nan
+            elif weight_images:
+                # Leave the pixels no particle contributes to as NaNs, to be
+                # auto-masked by Matplotlib
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    np.divide(images[fi], weight_images[key], images[fi])
+            elif self._sum_only:
+                pass
+            elif deposited[fi]:
+                images[fi] /= pixel_area * dl_conv.v ** 2
+            else:
+                images[fi] *= dl_conv.v
+        for fi, field in enumerate(fields):
+            mylog.debug("Setting field %s", field)
+            input_units = self._projected_units[field]
+            self[field] = self.ds.arr(images[fi].ravel(), input_units)
+        for field in ("px", "py", "pdx", "pdy"):
+            if field not in self.field_data:
+                self[field] = self._generate_container_field(field)
+        weight_image = weight_images.get(weight_keys[0], np.ones((nx, ny)))
+        self["weight_field"] = weight_image.ravel()
+        mylog.info("Projection completed")
 
     def _handle_chunk(self, chunk, fields, tree):
-        raise NotImplementedError(
-            "Particle projections have not yet been " "implemented"
-        )
+        images, weight_images = tree
+        xax = self.ds.coordinates.x_axis[self.axis]
+        yax = self.ds.coordinates.y_axis[self.axis]
+        px_name = self.ds.coordinates.axis_name[xax]
+        py_name = self.ds.coordinates.axis_name[yax]
+        period = self.ds.domain_width.to("code_length").d[[xax, yax]]
+        check_period = int(self.ds.periodicity[xax] and self.ds.periodicity[yax])
+        bounds = self.bounds
+        nx, ny = self.buff_size
+
+        particle_data = {}
+        pixels = {}
+
+        def _particle_type(ptype):
+            if ptype == "gas":
+                return self.ds._sph_ptypes[0]
+            return ptype
+
+        def _particle_data(ptype):
+            ptype = _particle_type(ptype)
+            if ptype not in particle_data:
+                particle_data[ptype] = (
+                    chunk[ptype, px_name].to("code_length"),
+                    chunk[ptype, py_name].to("code_length"),
+                    chunk[ptype, "smoothing_length"].to("code_length"),
+                    chunk[ptype, "mass"].to("code_mass"),
+                    chunk[ptype, "density"].to("code_density"),
+                )
+            return particle_data[ptype]
+
+        def _pixels(ptype):
+            # The particles of ptype in the image, and the pixels they fall in.
+            ptype = _particle_type(ptype)
+            if ptype not in pixels:
+                x = chunk[ptype, f"particle_position_{px_name}"].to("code_length").d
+                y = chunk[ptype, f"particle_position_{py_name}"].to("code_length").d
+                inside = (x >= bounds[0]) & (x <= bounds[1])
+                inside &= (y >= bounds[2]) & (y <= bounds[3])
+                xi = (x[inside] - bounds[0]) / (bounds[1] - bounds[0]) * nx
+                yi = (y[inside] - bounds[2]) / (bounds[3] - bounds[2]) * ny
+                xi = np.clip(xi.astype("int64"), 0, nx - 1)
+                yi = np.clip(yi.astype("int64"), 0, ny - 1)
+                pixels[ptype] = (inside, xi * ny + yi)
+            return pixels[ptype]
+
+        def _deposit(image, ptype, values):
+            inside, index = _pixels(ptype)
+            image += np.bincount(
+                index, weights=values[inside], minlength=nx * ny
+            ).reshape(nx, ny)
+
+        if self.weight_field is not None:
+            weight_units = self.ds.field_info[self.weight_field].output_units
+        for i, field in enumerate(fields):
+            values = chunk[field].in_units(self.ds.field_info[field].output_units)
+            if not self._is_deposited(field):
+                if None in weight_images:
+                    weight = chunk[self.weight_field].in_units(weight_units)
+                else:
+                    weight = None
+                pixelize_sph_kernel_projection(
+                    images[i],
+                    *_particle_data(field[0]),
+                    values,
+                    bounds,
+                    check_period=check_period,
+                    period=period,
+                    weight_field=weight,
+                    method=self.method,
+                )
+            elif self.method == "mip":
+                inside, index = _pixels(field[0])
+                np.maximum.at(images[i].reshape(-1), index, values.d[inside])
+            elif field[0] in weight_images:
+                weight = chunk[field[0], self.weight_field[1]].in_units(weight_units)
+                _deposit(images[i], field[0], values.d * weight.d)
+            else:
+                _deposit(images[i], field[0], values.d)
+        for ptype, weight_image in weight_images.items():
+            if ptype is None:
+                pixelize_sph_kernel_projection(
+                    weight_image,
+                    *_particle_data(self.weight_field[0]),
+                    chunk[self.weight_field].in_units(weight_units),
+                    bounds,
+                    check_period=check_period,
+                    period=period,
+                )
+            else:
+                weight = chunk[ptype, self.weight_field[1]].in_units(weight_units)
+                _deposit(weight_image, ptype, weight.d)
 
 
 class YTQuadTreeProj(YTProj):
@@ -414,9 +697,11 @@ class YTQuadTreeProj(YTProj):
     weighting) and average along a line of sight (weighting.)  What makes
     `proj` different from the standard projection mechanism is that it
     utilizes a quadtree data structure, rather than the old mechanism for
-    projections.  It will not run in parallel, but serial runs should be
-    substantially faster.  Note also that lines of sight are integrated at
-    every projected finest-level cell.
+    projections.  Each processor adds its IO chunks to the quadtree, on as
+    many threads as the ``projection_threads`` configuration option sets,
+    and the quadtrees of all processors are combined at the end.  Note also
+    that lines of sight are integrated at every projected finest-level
+    cell.
 
     Parameters
     ----------
@@ -543,7 +828,60 @@ class YTQuadTreeProj(YTProj):
         ilevel = chunk.ires * self.ds.ires_factor
         tree.initialize_chunk(i1, i2, ilevel)
 
+    def _fill_tree(self, tree, fields):
+        nthreads = ytcfg.getint("yt", "projection_threads")
+        chunks = parallel_objects(self.data_source.chunks([], "io", local_only=True))
+        _units_initialized = False
+        if nthreads <= 1:
+            for chunk in chunks:
+                if not _units_initialized:
+                    self._initialize_projected_units(fields, chunk)
+                    _units_initialized = True
+                self._handle_chunk(chunk, fields, tree)
+            return
+        # Reading chunks and generating their fields is not thread safe, so
+        # it is done here, while worker threads add the chunks read so far to
+        # trees of their own.  These are then merged into the tree.
+        trees = [self._get_tree(len(fields)) for i in range(nthreads)]
+        free_trees = queue.Queue()
+        for t in trees:
+            free_trees.put(t)
+
+        def _add_to_tree(values):
+            t = free_trees.get()
+            try:
+                t.add_chunk_to_tree(*values)
+            finally:
+                free_trees.put(t)
+
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=nthreads) as executor:
+            for chunk in chunks:
+                if not _units_initialized:
+                    self._initialize_projected_units(fields, chunk)
+                    _units_initialized = True
+                values = self._get_chunk_values(chunk, fields)
+                pending.append(executor.submit(_add_to_tree, values))
+                # Only hold a few chunks in memory while they wait for a thread.
+                while len(pending) > 2 * nthreads:
+                    pending.popleft().result()
+            for future in pending:
+                future.result()
+            merge_style = -1 if self.method == "mip" else 1
+            trees.insert(0, tree)
+            while len(trees) > 1:
+                merges = [
+                    executor.submit(merge_quadtrees, t1, t2, merge_style)
+                    for t1, t2 in zip(trees[::2], trees[1::2])
+                ]
+                for future in merges:
+                    future.result()
+                trees = trees[::2]
+
     def _handle_chunk(self, chunk, fields, tree):
+        tree.add_chunk_to_tree(*self._get_chunk_values(chunk, fields))
+
+    def _get_chunk_values(self, chunk, fields):
         mylog.debug(
             "Adding chunk (%s) to tree (%0.3e GB RAM)",
             chunk.ires.size,
@@ -576,7 +914,7 @@ class YTQuadTreeProj(YTProj):
         i1 = icoords[:, xax]
         i2 = icoords[:, yax]
         ilevel = chunk.ires * self.ds.ires_factor
-        tree.add_chunk_to_tree(i1, i2, ilevel, v, w)
+        return i1, i2, ilevel, v, w
 
 
 class YTCoveringGrid(YTSelectionContainer3D):
@@ -878,92 +1216,147 @@ class YTCoveringGrid(YTSelectionContainer3D):
         # TODO maybe there is a better way of handling this
         is_periodic = int(any(self.ds.periodicity))
 
-        if smoothing_style == "scatter":
-            for field in fields:
-                fi = self.ds._get_field_info(field)
-                ptype = fi.name[0]
-                if ptype not in self.ds._sph_ptypes:
-                    raise KeyError(f"{ptype} is not a SPH particle type!")
-                buff = np.zeros(size, dtype="float64")
-                if normalize:
-                    buff_den = np.zeros(size, dtype="float64")
+        # The fields of each particle type are all smoothed in a single pass
+        # over its particles.
+        ptype_fields = {}
+        for field in fields:
+            ptype = self.ds._get_field_info(field).name[0]
+            if ptype not in self.ds._sph_ptypes:
+                raise KeyError(f"{ptype} is not a SPH particle type!")
+            ptype_fields.setdefault(ptype, []).append(field)
+
+        for ptype, pfields in ptype_fields.items():
+            finfos = [self.ds._get_field_info(field) for field in pfields]
+            buffs = np.zeros((len(pfields),) + tuple(size), dtype="float64")
 
-                pbar = tqdm(desc=f"Interpolating SPH field {field}")
-                for chunk in self._data_source.chunks([field], "io"):
+            if smoothing_style == "scatter":
+                buff_den = np.zeros(size, dtype="float64") if normalize else None
+                num_threads = get_thread_count()
+                desc = f"Interpolating SPH fields {', '.join(map(str, pfields))}"
+                pbar = tqdm(desc=desc)
+                for chunk in self._data_source.chunks(pfields, "io"):
                     px = chunk[(ptype, "particle_position_x")].in_base("code").d
                     py = chunk[(ptype, "particle_position_y")].in_base("code").d
                     pz = chunk[(ptype, "particle_position_z")].in_base("code").d
                     hsml = chunk[(ptype, "smoothing_length")].in_base("code").d
                     mass = chunk[(ptype, "particle_mass")].in_base("code").d
                     dens = chunk[(ptype, "density")].in_base("code").d
-                    field_quantity = chunk[field].d
+                    quantities = np.empty((len(pfields), px.size), dtype="float64")
+                    for i, field in enumerate(pfields):
+                        quantities[i] = chunk[field].d
 
-                    pixelize_sph_kernel_arbitrary_grid(
-                        buff,
+                    pixelize_sph_kernel_arbitrary_grid_fields(
+                        buffs,
                         px,
                         py,
                         pz,
                         hsml,
                         mass,
                         dens,
-                        field_quantity,
+                        quantities,
                         bounds,
+                        buff_den=buff_den,
                         pbar=pbar,
                         check_period=is_periodic,
                         period=period,
+                        num_threads=num_threads,
                     )
-                    if normalize:
-                        pixelize_sph_kernel_arbitrary_grid(
-                            buff_den,
-                            px,
-                            py,
-                            pz,
-                            hsml,
-                            mass,
-                            dens,
-                            np.ones(dens.shape[0]),
-                            bounds,
-                            pbar=pbar,
-                            check_period=is_periodic,
-                            period=period,
-                        )
 
                 if normalize:
-                    normalization_3d_utility(buff, buff_den)
-
-                self[field] = self.ds.arr(buff, fi.units)
+                    for buff in buffs:
+                        normalization_3d_utility(buff, buff_den)
                 pbar.close()
 
-        if smoothing_style == "gather":
-            num_neighbors = getattr(self.ds, "num_neighbors", 32)
-            for field in fields:
-                buff = np.zeros(size, dtype="float64")
-
+            elif smoothing_style == "gather":
+                num_neighbors = getattr(self.ds, "num_neighbors", 32)
                 fields_to_get = [
                     "particle_position",
                     "density",
                     "particle_mass",
                     "smoothing_length",
-                    field[1],
                 ]
-                all_fields = all_data(self.ds, field[0], fields_to_get, kdtree=True)
+                fields_to_get += [field[1] for field in pfields]
+                # Only the particles within the largest smoothing length of
+                # the grid are read, once for all the fields, and searched for
+                # neighbors in a tree of their own.  Should the neighbors of a
+                # cell lie further away than that, the particles are read
+                # again from further away.
+                ad = self.ds.all_data()
+                pad = ad.max((ptype, "smoothing_length")).in_base("code").d
+                while True:
+                    pdata, kdtree = self._read_gather_particles(
+                        ptype, fields_to_get, bounds, pad, num_neighbors
+                    )
+                    quantities = np.empty(
+                        (len(pfields), pdata["density"].size), dtype="float64"
+                    )
+                    for i, (field, fi) in enumerate(zip(pfields, finfos)):
+                        quantities[i] = pdata[field[1]].in_units(fi.units).d
 
-                fi = self.ds._get_field_info(field)
-                interpolate_sph_grid_gather(
-                    buff,
-                    all_fields["particle_position"],
-                    bounds,
-                    all_fields["smoothing_length"],
-                    all_fields["particle_mass"],
-                    all_fields["density"],
-                    all_fields[field[1]].in_units(fi.units),
-                    self.ds.index.kdtree,
-                    use_normalization=normalize,
-                    num_neigh=num_neighbors,
-                )
+                    buffs[...] = 0.0
+                    max_dist = interpolate_sph_grid_gather_fields(
+                        buffs,
+                        pdata["particle_position"],
+                        bounds,
+                        pdata["smoothing_length"],
+                        pdata["particle_mass"],
+                        pdata["density"],
+                        quantities,
+                        kdtree,
+                        use_normalization=normalize,
+                        num_neigh=num_neighbors,
+                    )
+                    if kdtree is self.ds.index.kdtree or max_dist <= pad:
+                        break
+                    pad = max_dist
 
+            for buff, field, fi in zip(buffs, pfields, finfos):
                 self[field] = self.ds.arr(buff, fi.units)
 
+    def _read_gather_particles(self, ptype, fields, bounds, pad, num_neighbors):
+        # Reads the particles within pad of the grid and builds a tree of
+        # them.  Every particle and the tree of the index are used instead if
+        # the padded grid covers the domain or holds too few particles.
+        from yt.utilities.lib.cykdtree import PyKDTree
+
+        dle = self.ds.domain_left_edge.to("code_length").d
+        dre = self.ds.domain_right_edge.to("code_length").d
+        periodic = np.array(self.ds.periodicity)
+        left = np.array(bounds[::2]) - pad
+        right = np.array(bounds[1::2]) + pad
+        # Regions may only go through the boundaries of periodic domains.
+        wrap = periodic & (right - left < dre - dle)
+        left = np.where(wrap, left, np.maximum(left, dle))
+        right = np.where(wrap, right, np.minimum(right, dre))
+        if not wrap.any() and (left <= dle).all() and (right >= dre).all():
+            pdata = all_data(self.ds, ptype, fields, kdtree=True)
+            return pdata, self.ds.index.kdtree
+
+        source = self.ds.region(
+            self.ds.arr((left + right) / 2, "code_length"),
+            self.ds.arr(left, "code_length"),
+            self.ds.arr(right, "code_length"),
+        )
+        pdata = {field: [] for field in fields}
+        for chunk in source.chunks([], "io"):
+            for field in fields:
+                pdata[field].append(chunk[ptype, field].in_base("code"))
+        pdata = {field: uconcatenate(values) for field, values in pdata.items()}
+        if pdata["particle_position"].shape[0] < num_neighbors:
+            pdata = all_data(self.ds, ptype, fields, kdtree=True)
+            return pdata, self.ds.index.kdtree
+
+        kdtree = PyKDTree(
+            pdata["particle_position"].d.astype("float64"),
+            left_edge=self.ds.domain_left_edge,
+            right_edge=self.ds.domain_right_edge,
+            periodic=periodic,
+            leafsize=2 * int(num_neighbors),
+        )
+        for field in fields:
+            pdata[field] = pdata[field][kdtree.idx]
+        return pdata, kdtree
+
     def _fill_fields(self, fields):
         fields = [f for f in fields if f not in self.field_data]
         if len(fields) == 0:
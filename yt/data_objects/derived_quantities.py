@@ -28,8 +28,20 @@ def get_position_fields(field, data):
     return position_fields
 
 
+class _PlannedQuantity(Exception):
+    # Raised by a quantity being planned by DerivedQuantityCollection.many,
+    # with the arguments its chunks are to be processed with.
+    def __init__(self, args, kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+
 class DerivedQuantity(ParallelAnalysisInterface):
     num_vals = -1
+    # Set by DerivedQuantityCollection.many, which processes the chunks of
+    # several quantities in one pass.
+    _planning = False
+    _storage = None
 
     def __init__(self, data_source):
         self.data_source = data_source
@@ -47,10 +59,14 @@ class DerivedQuantity(ParallelAnalysisInterface):
         # create the index if it doesn't exist yet
         self.data_source.ds.index
         self.count_values(*args, **kwargs)
-        chunks = self.data_source.chunks([], chunking_style="io")
-        storage = {}
-        for sto, ds in parallel_objects(chunks, -1, storage=storage):
-            sto.result = self.process_chunk(ds, *args, **kwargs)
+        if self._planning:
+            raise _PlannedQuantity(args, kwargs)
+        storage, self._storage = self._storage, None
+        if storage is None:
+            chunks = self.data_source.chunks([], chunking_style="io")
+            storage = {}
+            for sto, ds in parallel_objects(chunks, -1, storage=storage):
+                sto.result = self.process_chunk(ds, *args, **kwargs)
         # Now storage will have everything, and will be done via pickling, so
         # the units will be preserved.  (Credit to Nathan for this
         # idea/implementation.)
@@ -88,6 +104,79 @@ class DerivedQuantityCollection:
     def keys(self):
         return derived_quantity_registry.keys()
 
+    def many(self, quantities):
+        r"""
+        Calculates several derived quantities with a single pass over the
+        data.
+
+        Every quantity called on its own reads the data of the data object
+        again.  Here each chunk of data is read once and handed to all of
+        the quantities in turn, and the results of all of them are
+        communicated between processors together.
+
+        Parameters
+        ----------
+        quantities : list
+            The quantities to calculate.  Each is either the name of a
+            quantity (such as "center_of_mass" or "CenterOfMass"), or a tuple
+            of a name, a tuple of positional arguments and, optionally, a
+            dict of keyword arguments.
+
+        Returns a list with the result of each quantity, in order.
+
+        Examples
+        --------
+
+        >>> ds = load("IsolatedGalaxy/galaxy0030/galaxy0030")
+        >>> sp = ds.sphere("max", (10, "kpc"))
+        >>> rho_ext, com, bv = sp.quantities.many([
+        ...     ("extrema", (("gas", "density"),)),
+        ...     "center_of_mass",
+        ...     ("bulk_velocity", (), {"use_particles": True})])
+
+        """
+        names = {camelcase_to_underscore(key): key for key in self.keys()}
+        calls = []
+        for quantity in quantities:
+            if isinstance(quantity, str):
+                quantity = (quantity,)
+            name, args, kwargs = tuple(quantity) + ((), {})[len(quantity) - 1 :]
+            dq = self[names.get(name, name)]
+            calls.append((dq, tuple(args), dict(kwargs)))
+
+        # Find out what every quantity processes its chunks with, by running
+        # it up to the point where it would start reading data.  Quantities
+        # that never get there are done already.
+        results = [None] * len(calls)
+        planned = []
+        for i, (dq, args, kwargs) in enumerate(calls):
+            dq._planning = True
+            try:
+                results[i] = dq(*args, **kwargs)
+            except _PlannedQuantity as plan:
+                planned.append((i, dq, plan.args, plan.kwargs))
+            finally:
+                dq._planning = False
+        if not planned:
+            return results
+
+        chunks = self.data_source.chunks([], chunking_style="io")
+        storage = {}
+        for sto, ds in parallel_objects(chunks, -1, storage=storage):
+            sto.result = [
+                dq.process_chunk(ds, *args, **kwargs) for _, dq, args, kwargs in planned
+            ]
+
+        # Finish each quantity from the chunk results it would have computed.
+        for j, (i, dq, _args, _kwargs) in enumerate(planned):
+            dq._storage = {key: storage[key][j] for key in storage}
+            _, args, kwargs = calls[i]
+            try:
+                results[i] = dq(*args, **kwargs)
+            finally:
+                dq._storage = None
+        return results
+
 
 class WeightedAverageQuantity(DerivedQuantity):
     r"""
@@ -195,14 +284,14 @@ class TotalMass(TotalQuantity):
     def __call__(self):
         self.data_source.ds.index
         fi = self.data_source.ds.field_info
-        if ("gas", "mass") in fi:
-            gas = super(TotalMass, self).__call__([("gas", "mass")])
-        else:
-            gas = self.data_source.ds.arr([0], "g")
-        if ("nbody", "particle_mass") in fi:
-            part = super(TotalMass, self).__call__([("nbody", "particle_mass")])
-        else:
-            part = self.data_source.ds.arr([0], "g")
+        fields = [f for f in [("gas", "mass"), ("nbody", "particle_mass")] if f in fi]
+        # Both masses are summed in the same pass over the data.
+        totals = {}
+        if fields:
+            totals = dict(zip(fields, DerivedQuantity.__call__(self, fields)))
+        zero = self.data_source.ds.arr([0], "g")
+        gas = totals.get(("gas", "mass"), zero)
+        part = totals.get(("nbody", "particle_mass"), zero)
         return self.data_source.ds.arr([gas, part])
 
 
@@ -4,7 +4,11 @@ from yt.data_objects.selection_objects.data_selection_objects import (
     YTSelectionContainer,
 )
 from yt.funcs import mylog
-from yt.utilities.lib.mesh_utilities import fill_fcoords, fill_fwidths
+from yt.utilities.lib.mesh_utilities import (
+    element_block_bounds,
+    fill_fcoords,
+    fill_fwidths,
+)
 
 
 class UnstructuredMesh(YTSelectionContainer):
@@ -14,6 +18,9 @@ class UnstructuredMesh(YTSelectionContainer):
     _type_name = "unstructured_mesh"
     _skip_add = True
     _index_offset = 0
+    # Selectors skip the runs of this many consecutive elements whose bounding
+    # box they do not touch.
+    _element_block_size = 1024
     _con_args = ("mesh_id", "filename", "connectivity_indices", "connectivity_coords")
 
     def __init__(
@@ -35,6 +42,7 @@ class UnstructuredMesh(YTSelectionContainer):
         self._last_mask = None
         self._last_count = -1
         self._last_selector_id = None
+        self._element_block_bounds = None
 
     def _check_consistency(self):
         if self.connectivity_indices.shape[1] != self._connectivity_length:
@@ -50,6 +58,26 @@ class UnstructuredMesh(YTSelectionContainer):
     def __repr__(self):
         return "UnstructuredMesh_%04i" % (self.mesh_id)
 
+    @property
+    def element_block_bounds(self):
+        """
+        The left and right edges of the bounding boxes of the runs of
+        consecutive elements of the mesh.
+
+        """
+        if self._element_block_bounds is None:
+            # The selectors test the coordinates in code units.
+            coords = self.connectivity_coords
+            if hasattr(coords, "units"):
+                coords = coords.to("code_length")
+            self._element_block_bounds = element_block_bounds(
+                np.asarray(coords, dtype="float64"),
+                self.connectivity_indices,
+                self._index_offset,
+                self._element_block_size,
+            )
+        return self._element_block_bounds
+
     def get_global_startindex(self):
         """
         Return the integer starting index for each dimension at the current
@@ -9,3 +9,4 @@ from .clump_tools import (
 )
 from .clump_validators import add_validator
 from .contour_finder import identify_contours
+from .merge_tree import ClumpMergeTree
@@ -412,18 +412,46 @@ class Clump(TreeContainer):
 
 def find_clumps(clump, min_val, max_val, d_clump):
     mylog.info("Finding clumps: min: %e, max: %e, step: %f", min_val, max_val, d_clump)
-    if min_val >= max_val:
+    # The contours of every level are found at once, rather than level by
+    # level within each clump.
+    from .merge_tree import ClumpMergeTree
+
+    tree = ClumpMergeTree(clump.data, clump.field, min_val, max_val, d_clump)
+    _find_clumps(clump, tree, 0, None)
+
+
+def _find_children(clump, tree, level, contour):
+    if clump.children:
+        mylog.info("Wiping out existing children clumps: %d.", len(clump.children))
+    clump.children = []
+    for cid in tree.contours(level, contour):
+        clump.children.append(
+            Clump(
+                tree.contour_data(level, cid),
+                clump.field,
+                parent=clump,
+                validators=clump.validators,
+                base=clump.base,
+                clump_info=clump.clump_info,
+                contour_key=tree.contour_keys[level],
+                contour_id=cid,
+            )
+        )
+
+
+def _find_clumps(clump, tree, level, contour):
+    if level >= len(tree.levels):
         return
-    clump.find_children(min_val, max_val=max_val)
+    _find_children(clump, tree, level, contour)
 
     if len(clump.children) == 1:
-        find_clumps(clump, min_val * d_clump, max_val, d_clump)
+        _find_clumps(clump, tree, level + 1, contour)
 
     elif len(clump.children) > 0:
         these_children = []
         mylog.info("Investigating %d children.", len(clump.children))
         for child in clump.children:
-            find_clumps(child, min_val * d_clump, max_val, d_clump)
+            _find_clumps(child, tree, level + 1, child.contour_id)
             if len(child.children) > 0:
                 these_children.append(child)
             elif child._validate():
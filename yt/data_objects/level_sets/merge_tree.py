@@ -0,0 +1,296 @@
+import itertools
+import uuid
+
+import numpy as np
+
+from yt.data_objects.selection_objects.cut_region import YTCutRegion
+from yt.data_objects.selection_objects.cut_region_expression import CutRegionExpression
+from yt.funcs import mylog
+from yt.utilities.lib.contour_finding import merge_tree_sweep
+
+from .clump_handling import add_contour_field
+
+# Offsets to the 26 cells around a cell, and the 13 of them that come after
+# it, so that each pair of cells on the same level is only linked once.
+_offsets = np.array(
+    [o for o in itertools.product((-1, 0, 1), repeat=3) if o != (0, 0, 0)],
+    dtype="int64",
+)
+_forward_offsets = _offsets[13:]
+
+
+class _ContourSlices:
+    # Stands in for the contour slices of a contour field, and labels the
+    # cells of a grid with their clump on one level only when it is read.
+    def __init__(self, tree, level):
+        self.tree = tree
+        self.level = level
+
+    def get(self, grid_id, default=None):
+        if grid_id not in self.tree.blocks:
+            return default
+        return [self.tree.grid_contours(grid_id, self.level)]
+
+
+class _ContourExpression:
+    # Stands in for the parsed conditionals of the cut region of a contour,
+    # and selects its cells from the labels stored in the merge tree rather
+    # than by evaluating the contour field.  Chunks of anything but grids
+    # fall back on the conditionals.
+    def __init__(self, tree, level, contour, conditionals):
+        self.tree = tree
+        self.level = level
+        self.contour = contour
+        self.conditionals = conditionals
+        self.fields = []
+        self._fallback = CutRegionExpression(conditionals)
+
+    def _grid_mask(self, grid):
+        if grid.id not in self.tree.blocks:
+            return None
+        return self.tree.grid_contours(grid.id, self.level)[1] == self.contour
+
+    def evaluate(self, obj, locals=None):
+        grids = obj._current_chunk.objs
+        if not all(hasattr(grid, "_get_selector_mask") for grid in grids):
+            return self._fallback.evaluate(obj, locals)
+        masks = []
+        for grid in grids:
+            selected = grid._get_selector_mask(obj.selector)
+            if selected is None:
+                continue
+            mask = self._grid_mask(grid)
+            if mask is None:
+                masks.append(np.zeros(int(selected.sum()), dtype="bool"))
+            else:
+                masks.append(mask[selected])
+        if len(masks) == 0:
+            return np.zeros(0, dtype="bool")
+        return np.concatenate(masks)
+
+    def apply(self, obj, mask, locals=None):
+        if not hasattr(obj, "_get_selector_mask"):
+            return self._fallback.apply(obj, mask, locals)
+        contour_mask = self._grid_mask(obj)
+        if contour_mask is None:
+            mask[:] = False
+        else:
+            mask &= contour_mask
+        return mask
+
+
+class _ContourRegion(YTCutRegion):
+    # The cut region of a contour.  Its conditional on the contour field is
+    # kept for cut regions made from it and for saving clumps, but its cells
+    # are found from the cells of the contour stored in the merge tree.
+    _skip_add = True
+
+    def __init__(
+        self, data_source, conditionals, field_parameters, tree, level, contour
+    ):
+        super(_ContourRegion, self).__init__(
+            data_source,
+            conditionals,
+            ds=data_source.ds,
+            field_parameters=field_parameters,
+        )
+        self._contour_expression = _ContourExpression(
+            tree, level, contour, self.conditionals
+        )
+
+    @property
+    def expression(self):
+        if self._contour_expression.conditionals != self.conditionals:
+            return super(_ContourRegion, self).expression
+        return self._contour_expression
+
+
+class ClumpMergeTree:
+    r"""
+    The contours of a field at every level of a clump finding, found in a
+    single pass over the data.
+
+    The levels are ``min_val``, ``min_val * step``, ``min_val * step**2``
+    and so on below ``max_val``.  On each, the contours are the connected
+    sets of cells with values between that level and ``max_val``, where
+    cells touching by a face, an edge or a corner are connected.  Each cell
+    is labeled with the highest level it is above, and the links between
+    neighboring cells are added to a union-find structure from the highest
+    level down, which records how the contours of each level merge into
+    those of the level below.  The cells of a contour are only selected when
+    its data is requested.
+
+    Parameters
+    ----------
+    data_source : YTSelectionContainer3D
+        The data in which to find contours.
+    field : string or tuple of strings
+        The field whose contours are found.
+    min_val : float
+        The lowest level.
+    max_val : float
+        The highest value of the field in a contour.
+    step : float
+        The ratio of consecutive levels.
+
+    Examples
+    --------
+
+    >>> sp = ds.sphere("max", (1.0, "kpc"))
+    >>> tree = ClumpMergeTree(sp, ("gas", "density"), 1e-26, 1e-20, 2.0)
+    >>> for cid in tree.contours(2):
+    ...     print(tree.contour_data(2, cid)["gas", "cell_mass"].sum())
+    """
+
+    def __init__(self, data_source, field, min_val, max_val, step):
+        self.data_source = data_source
+        self.field = field
+        self.base_object = getattr(data_source, "base_object", data_source)
+        self.ds = data_source.ds
+        levels = []
+        while min_val < max_val:
+            levels.append(float(min_val))
+            min_val *= step
+        self.levels = np.array(levels, dtype="float64")
+        self.max_val = float(max_val)
+        self.contour_keys = [uuid.uuid4().hex for level in levels]
+        self._contour_fields = set()
+        self.blocks = {}
+        if len(levels) == 0:
+            self.cell_contour = np.zeros(0, dtype="int64")
+            self.contour_level = np.zeros(0, dtype="int64")
+            self.contour_parent = np.zeros(0, dtype="int64")
+            return
+        cell_levels, icoords, ires = self._read_cells()
+        edges = self._find_edges(icoords, ires)
+        mylog.info(
+            "Building the merge tree of %s cells over %s levels.",
+            cell_levels.size,
+            len(levels),
+        )
+        self.cell_contour, self.contour_level, self.contour_parent = merge_tree_sweep(
+            cell_levels, edges, len(levels)
+        )
+
+    def _read_cells(self):
+        # Only the cells above the lowest level ever belong to a contour.
+        cell_levels, icoords, ires = [], [], []
+        offset = 0
+        for g, mask in self.data_source.blocks:
+            g.field_parameters.update(self.data_source.field_parameters)
+            values = g[self.field][mask].d
+            select = (values >= self.levels[0]) & (values <= self.max_val)
+            mask = mask.copy()
+            mask[mask] = select
+            n = int(select.sum())
+            if n == 0:
+                continue
+            self.blocks[g.id] = (g.ActiveDimensions.copy(), mask, offset)
+            offset += n
+            values = values[select]
+            cell_levels.append(np.searchsorted(self.levels, values, "right") - 1)
+            icoords.append(g.get_global_startindex() + np.argwhere(mask))
+            ires.append(np.full(n, g.Level, dtype="int64"))
+        if offset == 0:
+            return np.zeros(0, "int64"), np.zeros((0, 3), "int64"), np.zeros(0, "int64")
+        return (
+            np.concatenate(cell_levels).astype("int64"),
+            np.concatenate(icoords).astype("int64"),
+            np.concatenate(ires),
+        )
+
+    def _find_edges(self, icoords, ires):
+        # Each cell is linked to the cells around it on its own level and on
+        # coarser ones.  Cells on finer levels link to it in turn.
+        r = int(self.ds.refine_by)
+        dims = np.asarray(self.ds.domain_dimensions, dtype="int64")
+        levels = np.unique(ires)
+        keys = {}
+        for level in levels:
+            cells = np.where(ires == level)[0]
+            ld = dims * r ** int(level)
+            k = (icoords[cells, 0] * ld[1] + icoords[cells, 1]) * ld[2]
+            k += icoords[cells, 2]
+            order = np.argsort(k)
+            keys[level] = (k[order], cells[order], ld)
+        edges = []
+        for level in levels:
+            cells = np.where(ires == level)[0]
+            ic = icoords[cells]
+            for target in levels[levels <= level]:
+                tkeys, tcells, ld = keys[target]
+                factor = r ** int(level - target)
+                offsets = _forward_offsets if target == level else _offsets
+                for offset in offsets:
+                    nic = ic + offset
+                    inside = np.all(nic >= 0, axis=1) & np.all(
+                        nic < (dims * r ** int(level)), axis=1
+                    )
+                    nic = nic[inside] // factor
+                    k = (nic[:, 0] * ld[1] + nic[:, 1]) * ld[2] + nic[:, 2]
+                    pos = np.searchsorted(tkeys, k)
+                    pos[pos == tkeys.size] = 0
+                    found = tkeys[pos] == k
+                    if not found.any():
+                        continue
+                    edges.append(
+                        np.stack([cells[inside][found], tcells[pos[found]]], axis=1)
+                    )
+        if len(edges) == 0:
+            return np.zeros((0, 2), dtype="int64")
+        return np.concatenate(edges).astype("int64")
+
+    def contours(self, level, parent=None):
+        """
+        The contours of a level, or those in the contour *parent* of a lower
+        level.
+        """
+        contours = np.where(self.contour_level == level)[0]
+        if parent is None:
+            return contours
+        ancestors = self._ancestors(contours, self.contour_level[parent])
+        return contours[ancestors == parent]
+
+    def _ancestors(self, contours, level):
+        # The contours of a level that the given contours lie in, or -1.
+        a = np.array(contours, dtype="int64")
+        a[self.contour_level[a] < level] = -1
+        while True:
+            up = a > -1
+            up[up] = self.contour_level[a[up]] > level
+            if not up.any():
+                return a
+            a[up] = self.contour_parent[a[up]]
+
+    def grid_contours(self, grid_id, level):
+        """The slice of a grid and the contour on a level of each of its cells."""
+        dims, mask, offset = self.blocks[grid_id]
+        vals = np.full(dims, -1, dtype="int64")
+        n = int(mask.sum())
+        cells = self.cell_contour[offset : offset + n]
+        vals[mask] = self._ancestors(cells, level)
+        return (slice(None), slice(None), slice(None)), vals
+
+    def contour_field(self, level):
+        """The field holding the contour on a level of each cell."""
+        key = self.contour_keys[level]
+        if key not in self._contour_fields:
+            add_contour_field(self.ds, key)
+            self._contour_fields.add(key)
+        return ("index", f"contours_{key}")
+
+    def contour_data(self, level, contour):
+        """
+        A data object holding the cells of a contour, which are selected
+        from those stored in the tree.
+        """
+        key = self.contour_keys[level]
+        self.contour_field(level)
+        return _ContourRegion(
+            self.base_object,
+            [f"obj['contours_{key}'] == {contour}"],
+            {f"contour_slices_{key}": _ContourSlices(self, level)},
+            self,
+            level,
+            contour,
+        )
@@ -4,7 +4,12 @@ import tempfile
 
 import numpy as np
 
-from yt.data_objects.level_sets.api import Clump, add_clump_info, find_clumps
+from yt.data_objects.level_sets.api import (
+    Clump,
+    ClumpMergeTree,
+    add_clump_info,
+    find_clumps,
+)
 from yt.data_objects.level_sets.clump_info_items import clump_info_registry
 from yt.fields.derived_field import ValidateParameter
 from yt.loaders import load, load_uniform_grid
@@ -178,3 +183,50 @@ def test_clump_field_parameters():
 
     for c1, c2 in zip(leaf_clumps_1, leaf_clumps_2):
         assert_array_equal(c1["gas", "density"], c2["gas", "density"])
+
+
+def test_clump_merge_tree():
+    dims = (16, 16, 16)
+    x, y, z = np.mgrid[0:1:16j, 0:1:16j, 0:1:16j]
+    rs = np.random.RandomState(0x4D3D3D3)
+    density = np.ones(dims)
+    for c, a in zip(rs.uniform(0.2, 0.8, (6, 3)), rs.uniform(1, 3, 6)):
+        r2 = (x - c[0]) ** 2 + (y - c[1]) ** 2 + (z - c[2]) ** 2
+        density += np.exp(3 * a - r2 / 0.004)
+    ds = load_uniform_grid({"density": density}, dims, nprocs=8)
+    ad = ds.all_data()
+    field = ("gas", "density")
+    max_val = 2.0 * ad[field].max()
+
+    tree = ClumpMergeTree(ad, field, 2.0, max_val, 2.0)
+    for level, min_val in enumerate(tree.levels):
+        # The contours on each level are those found on their own.
+        clump = Clump(ad, field)
+        clump.find_children(min_val, max_val)
+        expected = sorted(child["index", "ones"].size for child in clump.children)
+        contours = tree.contours(level)
+        sizes = [tree.contour_data(level, c)["index", "ones"].size for c in contours]
+        assert_equal(sorted(sizes), expected)
+        # And each lies in exactly one contour of the level below.
+        if level > 0:
+            parents = tree.contours(level - 1)
+            children = [tree.contours(level, parent=p) for p in parents]
+            assert_equal(sorted(np.concatenate(children)), sorted(contours))
+
+    # The cells of a contour, found from those stored in the tree, are those
+    # whose contour field holds its id.
+    contour = tree.contours(1)[0]
+    data = tree.contour_data(1, contour)
+    cut = ad.cut_region(
+        [f"obj['contours_{tree.contour_keys[1]}'] == {contour}"],
+        data.field_parameters,
+    )
+    assert_array_equal(data[field], cut[field])
+    assert_equal(sum(mask.sum() for g, mask in data.blocks), cut[field].size)
+
+    # Cells touching only at a corner are in the same contour.
+    density = np.ones(dims)
+    density[4, 4, 4] = density[5, 5, 5] = density[10, 10, 10] = 10.0
+    ds = load_uniform_grid({"density": density}, dims, nprocs=8)
+    tree = ClumpMergeTree(ds.all_data(), field, 5.0, 20.0, 2.0)
+    assert_equal(len(tree.contours(0)), 2)
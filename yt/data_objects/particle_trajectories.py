@@ -1,16 +1,139 @@
+import os
 from collections import OrderedDict
 
 import numpy as np
 
 from yt.config import ytcfg
 from yt.data_objects.field_data import YTFieldData
-from yt.funcs import get_pbar, mylog
+from yt.funcs import get_pbar, mylog, save_npz_cache
 from yt.units.yt_array import array_like_field
 from yt.utilities.exceptions import YTIllDefinedParticleData
 from yt.utilities.lib.particle_mesh_operations import CICSample_3
 from yt.utilities.on_demand_imports import _h5py as h5py
 from yt.utilities.parallel_tools.parallel_analysis_interface import parallel_root_only
 
+_ID_INDEX_VERSION = 1
+
+
+class ParticleIDIndex:
+    r"""The location of every particle of a dataset, sorted by particle ID.
+
+    For each particle, the index records the IO chunk of the dataset holding
+    it (a data file or a set of grids) and its position in that chunk, so
+    that the particles with given IDs can be read from the chunks holding
+    them alone.  If the ``particle_id_index_cache`` configuration option is
+    on, the index is stored next to the dataset in a file ending in
+    ``.<ptype>_ids.npz`` and read back by later calls.
+
+    Parameters
+    ----------
+    ds : ~yt.data_objects.static_output.Dataset
+        The dataset to index.
+    ptype : str, optional
+        The particle type to index. Default: "all".
+    """
+
+    def __init__(self, ds, ptype="all"):
+        self.ds = ds
+        self.field = ds.all_data()._determine_fields((ptype, "particle_index"))[0]
+        self.num_chunks = sum(1 for _ in ds.all_data().chunks([], "io"))
+        use_cache = ytcfg.getboolean("yt", "particle_id_index_cache")
+        if not (use_cache and self._load()):
+            self._build()
+            if use_cache:
+                self._save()
+
+    @property
+    def filename(self):
+        return f"{self.ds.parameter_filename}.{self.field[0]}_ids.npz"
+
+    def _header(self):
+        st = os.stat(self.ds.parameter_filename)
+        return np.array(
+            [
+                _ID_INDEX_VERSION,
+                st.st_size,
+                st.st_mtime_ns,
+                getattr(self.ds, "_file_hash", 0),
+                self.num_chunks,
+            ],
+            dtype="int64",
+        )
+
+    def _build(self):
+        ids = []
+        for chunk in self.ds.all_data().chunks([], "io"):
+            ids.append(chunk[self.field].d.astype("int64"))
+        sizes = np.array([chunk_ids.size for chunk_ids in ids], dtype="int64")
+        ids = np.concatenate(ids) if ids else np.zeros(0, dtype="int64")
+        order = np.argsort(ids, kind="stable")
+        self.ids = ids[order]
+        self.chunks = np.repeat(np.arange(sizes.size, dtype="int64"), sizes)[order]
+        starts = np.repeat(np.cumsum(sizes) - sizes, sizes)
+        self.offsets = (np.arange(ids.size, dtype="int64") - starts)[order]
+
+    def _load(self):
+        fn = self.filename
+        if not os.path.isfile(fn):
+            return False
+        try:
+            with np.load(fn) as data:
+                if not np.array_equal(data["header"], self._header()):
+                    return False
+                self.ids = data["ids"]
+                self.chunks = data["chunks"]
+                self.offsets = data["offsets"]
+        except (OSError, KeyError, ValueError):
+            mylog.debug("Could not read the particle ID index %s", fn)
+            return False
+        return True
+
+    def _save(self):
+        if not os.path.isfile(self.ds.parameter_filename):
+            # In-memory datasets have nowhere to store the index.
+            return
+        save_npz_cache(
+            self.filename,
+            header=self._header(),
+            ids=self.ids,
+            chunks=self.chunks,
+            offsets=self.offsets,
+        )
+
+    def locate(self, indices):
+        """Find the particles with the sorted IDs *indices*.
+
+        Returns the positions in *indices* of the IDs that were found, and
+        the chunk holding each of them and their offset in that chunk.
+        """
+        indices = np.asarray(indices, dtype="int64")
+        start = np.searchsorted(self.ids, indices, side="left")
+        count = np.searchsorted(self.ids, indices, side="right") - start
+        # An ID may only be repeated as many times as it is in the dataset.
+        first = np.searchsorted(indices, indices, side="left")
+        repeats = np.searchsorted(indices, indices, side="right") - first
+        found = count > 0
+        if np.any(count[found] != repeats[found]):
+            raise YTIllDefinedParticleData(
+                "This dataset contains duplicate particle indices!"
+            )
+        pos = (start + np.arange(indices.size) - first)[found]
+        return np.flatnonzero(found), self.chunks[pos], self.offsets[pos]
+
+
+def _read_located_particles(ds, fields, chunks, offsets):
+    # Read fields for the particles at the given chunks and offsets, only
+    # touching the chunks that hold them.
+    values = {field: np.empty(offsets.size) for field in fields}
+    needed = set(np.unique(chunks).tolist())
+    for i, chunk in enumerate(ds.all_data().chunks([], "io")):
+        if i not in needed:
+            continue
+        in_chunk = chunks == i
+        for field in fields:
+            values[field][in_chunk] = chunk[field].d[offsets[in_chunk]]
+    return values
+
 
 class ParticleTrajectories:
     r"""A collection of particle trajectories in time over a series of
@@ -57,8 +180,7 @@ class ParticleTrajectories:
         indices.sort()  # Just in case the caller wasn't careful
         self.field_data = YTFieldData()
         self.data_series = outputs
-        self.masks = []
-        self.sorts = []
+        self.locations = []
         self.array_indices = []
         self.indices = indices
         self.num_indices = len(indices)
@@ -89,18 +211,16 @@ class ParticleTrajectories:
         my_storage = {}
         pbar = get_pbar("Constructing trajectory information", len(self.data_series))
         for i, (sto, ds) in enumerate(self.data_series.piter(storage=my_storage)):
-            dd = ds.all_data()
-            newtags = dd[fds["particle_index"]].d.astype("int64")
-            mask = np.in1d(newtags, indices, assume_unique=True)
-            sort = np.argsort(newtags[mask])
-            array_indices = np.where(np.in1d(indices, newtags, assume_unique=True))[0]
+            id_index = ParticleIDIndex(ds, fds["particle_index"][0])
+            array_indices, chunks, offsets = id_index.locate(indices)
             self.array_indices.append(array_indices)
-            self.masks.append(mask)
-            self.sorts.append(sort)
+            self.locations.append((chunks, offsets))
 
-            pfields = {}
-            for field in (f"particle_position_{ax}" for ax in "xyz"):
-                pfields[field] = dd[fds[field]].ndarray_view()[mask][sort]
+            pos_fields = [f"particle_position_{ax}" for ax in "xyz"]
+            pfields = _read_located_particles(
+                ds, [fds[field] for field in pos_fields], chunks, offsets
+            )
+            pfields = {field: pfields[fds[field]] for field in pos_fields}
 
             sto.result_id = ds.parameter_filename
             sto.result = (ds.current_time, array_indices, pfields)
@@ -244,15 +364,17 @@ class ParticleTrajectories:
         my_storage = {}
 
         for i, (sto, ds) in enumerate(self.data_series.piter(storage=my_storage)):
-            mask = self.masks[i]
-            sort = self.sorts[i]
             pfield = {}
 
             if new_particle_fields:  # there's at least one particle field
-                dd = ds.all_data()
+                # This is easy... just get the particle fields
+                values = _read_located_particles(
+                    ds,
+                    [fds[field] for field in new_particle_fields],
+                    *self.locations[i],
+                )
                 for field in new_particle_fields:
-                    # This is easy... just get the particle fields
-                    pfield[field] = dd[fds[field]].d[mask][sort]
+                    pfield[field] = values[fds[field]]
 
             if grid_fields:
                 # This is hard... must loop over grids
@@ -6,6 +6,7 @@ from yt.frontends.ytdata.utilities import save_as_dataset
 from yt.funcs import (
     ensure_list,
     get_output_filename,
+    get_thread_count,
     issue_deprecation_warning,
     iterable,
     mylog,
@@ -17,11 +18,7 @@ from yt.utilities.exceptions import (
     YTIllDefinedProfile,
     YTProfileDataShape,
 )
-from yt.utilities.lib.misc_utilities import (
-    new_bin_profile1d,
-    new_bin_profile2d,
-    new_bin_profile3d,
-)
+from yt.utilities.lib.misc_utilities import bin_profile
 from yt.utilities.lib.particle_mesh_operations import CICDeposit_2, NGPDeposit_2
 from yt.utilities.parallel_tools.parallel_analysis_interface import (
     ParallelAnalysisInterface,
@@ -46,6 +43,16 @@ def _sanitize_min_max_units(amin, amax, finfo, registry):
     return rmin, rmax
 
 
+def _field_buffer(data, units):
+    # Returns the values of data as a float64 array and the factor that
+    # converts them to units, copying them only if that takes an offset.
+    units = Unit(units, registry=data.units.registry)
+    factor, offset = data.units.get_conversion_factor(units)
+    if offset:
+        return data.in_units(units).d.ravel(), 1.0
+    return data.d.ravel(), factor
+
+
 def preserve_source_parameters(func):
     def save_state(*args, **kwargs):
         # Temporarily replace the 'field_parameters' for a
@@ -225,7 +232,54 @@ been deprecated, use profile.standard_deviation instead."""
                 self.field_map[field] = field
 
     def _bin_chunk(self, chunk, fields, storage):
-        raise NotImplementedError
+        # The bin fields, profiled fields and weights are handed to the
+        # binning kernel as they come out of the chunk, without filtering or
+        # converting them first.
+        bin_fields = [chunk[bf] for bf in self.bin_fields]
+        shape = bin_fields[0].shape
+        for bf, data in zip(self.bin_fields, bin_fields):
+            if data.shape != shape:
+                raise YTProfileDataShape(self.bin_fields[0], shape, bf, data.shape)
+        axes = "xyz"[: len(self.bin_fields)]
+        bin_edges = [getattr(self, f"{ax}_bins") for ax in axes]
+        bin_data = [
+            _field_buffer(data, edges.units)
+            for data, edges in zip(bin_fields, bin_edges)
+        ]
+        field_data = []
+        for field in fields:
+            data = chunk[field]
+            if data.shape != shape:
+                raise YTProfileDataShape(self.bin_fields[0], shape, field, data.shape)
+            field_data.append(
+                _field_buffer(data, chunk.ds.field_info[field].output_units)
+            )
+        weight_data, weight_scale = None, 1.0
+        if self.weight_field is not None:
+            data = chunk[self.weight_field]
+            if data.shape != shape:
+                raise YTProfileDataShape(
+                    self.bin_fields[0], shape, self.weight_field, data.shape
+                )
+            units = chunk.ds.field_info[self.weight_field].output_units
+            weight_data, weight_scale = _field_buffer(data, units)
+        nf = len(fields)
+        bin_profile(
+            [data for data, _ in bin_data],
+            [scale for _, scale in bin_data],
+            [edges.d for edges in bin_edges],
+            [getattr(self, f"{ax}_log") for ax in axes],
+            [data for data, _ in field_data],
+            [scale for _, scale in field_data],
+            weight_data,
+            weight_scale,
+            storage.weight_values.reshape(-1),
+            storage.values.reshape(-1, nf),
+            storage.mvalues.reshape(-1, nf),
+            storage.qvalues.reshape(-1, nf),
+            storage.used.reshape(-1).view("uint8"),
+            num_threads=get_thread_count(),
+        )
 
     def _filter(self, bin_fields):
         # cut_points is set to be everything initially, but
@@ -510,26 +564,6 @@ class Profile1D(ProfileND):
         self.bin_fields = (self.x_field,)
         self.x = 0.5 * (self.x_bins[1:] + self.x_bins[:-1])
 
-    def _bin_chunk(self, chunk, fields, storage):
-        rv = self._get_data(chunk, fields)
-        if rv is None:
-            return
-        fdata, wdata, (bf_x,) = rv
-        bf_x.convert_to_units(self.field_info[self.x_field].output_units)
-        bin_ind = np.digitize(bf_x, self.x_bins) - 1
-        new_bin_profile1d(
-            bin_ind,
-            wdata,
-            fdata,
-            storage.weight_values,
-            storage.values,
-            storage.mvalues,
-            storage.qvalues,
-            storage.used,
-        )
-
-        # We've binned it!
-
     def set_x_unit(self, new_unit):
         """Sets a new unit for the x field
 
@@ -764,28 +798,6 @@ class Profile2D(ProfileND):
         self.x = 0.5 * (self.x_bins[1:] + self.x_bins[:-1])
         self.y = 0.5 * (self.y_bins[1:] + self.y_bins[:-1])
 
-    def _bin_chunk(self, chunk, fields, storage):
-        rv = self._get_data(chunk, fields)
-        if rv is None:
-            return
-        fdata, wdata, (bf_x, bf_y) = rv
-        bf_x.convert_to_units(self.field_info[self.x_field].output_units)
-        bin_ind_x = np.digitize(bf_x, self.x_bins) - 1
-        bf_y.convert_to_units(self.field_info[self.y_field].output_units)
-        bin_ind_y = np.digitize(bf_y, self.y_bins) - 1
-        new_bin_profile2d(
-            bin_ind_x,
-            bin_ind_y,
-            wdata,
-            fdata,
-            storage.weight_values,
-            storage.values,
-            storage.mvalues,
-            storage.qvalues,
-            storage.used,
-        )
-        # We've binned it!
-
     def set_x_unit(self, new_unit):
         """Sets a new unit for the x field
 
@@ -1101,31 +1113,6 @@ class Profile3D(ProfileND):
         self.y = 0.5 * (self.y_bins[1:] + self.y_bins[:-1])
         self.z = 0.5 * (self.z_bins[1:] + self.z_bins[:-1])
 
-    def _bin_chunk(self, chunk, fields, storage):
-        rv = self._get_data(chunk, fields)
-        if rv is None:
-            return
-        fdata, wdata, (bf_x, bf_y, bf_z) = rv
-        bf_x.convert_to_units(self.field_info[self.x_field].output_units)
-        bin_ind_x = np.digitize(bf_x, self.x_bins) - 1
-        bf_y.convert_to_units(self.field_info[self.y_field].output_units)
-        bin_ind_y = np.digitize(bf_y, self.y_bins) - 1
-        bf_z.convert_to_units(self.field_info[self.z_field].output_units)
-        bin_ind_z = np.digitize(bf_z, self.z_bins) - 1
-        new_bin_profile3d(
-            bin_ind_x,
-            bin_ind_y,
-            bin_ind_z,
-            wdata,
-            fdata,
-            storage.weight_values,
-            storage.values,
-            storage.mvalues,
-            storage.qvalues,
-            storage.used,
-        )
-        # We've binned it!
-
     @property
     def bounds(self):
         return (
@@ -1,5 +1,6 @@
 import numpy as np
 
+from yt.data_objects.selection_objects.cut_region_expression import CutRegionExpression
 from yt.data_objects.selection_objects.data_selection_objects import (
     YTSelectionContainer,
     YTSelectionContainer3D,
@@ -7,7 +8,6 @@ from yt.data_objects.selection_objects.data_selection_objects import (
 from yt.data_objects.static_output import Dataset
 from yt.funcs import ensure_list, validate_iterable, validate_object
 from yt.geometry.selection_routines import points_in_cells
-from yt.utilities.exceptions import YTIllDefinedCutRegion
 from yt.utilities.on_demand_imports import _scipy
 
 
@@ -77,6 +77,7 @@ class YTCutRegion(YTSelectionContainer3D):
         self.base_object = data_source
         self.locals = locals
         self._selector = None
+        self._expression = None
         # Need to interpose for __getitem__, fwidth, fcoords, icoords, iwidth,
         # ires and get_data
 
@@ -89,9 +90,23 @@ class YTCutRegion(YTSelectionContainer3D):
                     self.get_data(fields)
                     yield self
 
+    @property
+    def expression(self):
+        """The conditionals, parsed into a :class:`CutRegionExpression`."""
+        if (
+            self._expression is None
+            or self._expression.conditionals != self.conditionals
+        ):
+            self._expression = CutRegionExpression(self.conditionals)
+        return self._expression
+
     def get_data(self, fields=None):
         fields = ensure_list(fields)
         self.base_object.get_data(fields)
+        # Read all the fields used by the conditionals together, rather than
+        # one at a time as the conditionals need them.
+        with self.base_object._field_parameter_state(self.field_parameters):
+            self.base_object.get_data(self.expression.fields)
         ind = self._cond_ind
         for field in fields:
             f = self.base_object[field]
@@ -108,33 +123,21 @@ class YTCutRegion(YTSelectionContainer3D):
         for obj, m in self.base_object.blocks:
             m = m.copy()
             with obj._field_parameter_state(self.field_parameters):
-                for cond in self.conditionals:
-                    ss = eval(cond)
-                    m = np.logical_and(m, ss, m)
+                self.expression.apply(obj, m, self.locals)
             if not np.any(m):
                 continue
             yield obj, m
 
     @property
     def _cond_ind(self):
-        ind = None
         obj = self.base_object
-        locals = self.locals.copy()
-        if "obj" in locals:
+        if "obj" in self.locals:
             raise RuntimeError(
                 '"obj" has been defined in the "locals" ; '
                 "this is not supported, please rename the variable."
             )
-        locals["obj"] = obj
         with obj._field_parameter_state(self.field_parameters):
-            for cond in self.conditionals:
-                res = eval(cond, locals)
-                if ind is None:
-                    ind = res
-                if ind.shape != res.shape:
-                    raise YTIllDefinedCutRegion(self.conditionals)
-                np.logical_and(res, ind, ind)
-        return ind
+            return self.expression.evaluate(obj, self.locals)
 
     def _part_ind_KDTree(self, ptype):
         """Find the particles in cells using a KDTree approach."""
@@ -0,0 +1,398 @@
+import ast
+import builtins
+import operator
+
+import numpy as np
+
+from yt.utilities.exceptions import YTIllDefinedCutRegion
+
+_comparisons = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+_arithmetic = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+# Unit conversions and views of unit-ful arrays that operands may use.
+_methods = ("in_units", "to", "in_cgs", "in_mks", "in_base")
+_attributes = ("d", "v", "value", "ndview")
+
+# Before Python 3.9, subscripts wrap their index in an ast.Index node.
+_index_types = (ast.Index,) if hasattr(ast, "Index") else ()
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _globals():
+    # Conditionals used to be evaluated in the namespace of the cut_region
+    # module, so names such as ``np`` are looked up there too.
+    from yt.data_objects.selection_objects import cut_region
+
+    return vars(cut_region)
+
+
+class _Context:
+    def __init__(self, obj, namespace, conditionals):
+        self.obj = obj
+        self.namespace = namespace
+        self.conditionals = conditionals
+        # The fields and names that have been evaluated.
+        self.evaluated = set()
+        self._scratch = None
+
+    def scratch(self, shape):
+        # A single buffer holds the result of every comparison in turn, so
+        # that a conditional does not allocate one array per comparison.
+        if self._scratch is None or self._scratch.shape != shape:
+            self._scratch = np.empty(shape, dtype="bool")
+        return self._scratch
+
+
+class _Field:
+    def __init__(self, key):
+        self.key = key
+        self.fields = (key,)
+        self.leaves = (self,)
+
+    def value(self, ctx):
+        ctx.evaluated.add(self)
+        return ctx.obj[self.key]
+
+
+class _Constant:
+    fields = ()
+    leaves = ()
+
+    def __init__(self, value):
+        self._value = value
+
+    def value(self, ctx):
+        return self._value
+
+
+class _Name:
+    fields = ()
+
+    def __init__(self, name):
+        self.name = name
+        self.leaves = (self,)
+
+    def value(self, ctx):
+        ctx.evaluated.add(self)
+        if self.name in ctx.namespace:
+            return ctx.namespace[self.name]
+        module_globals = _globals()
+        if self.name in module_globals:
+            return module_globals[self.name]
+        try:
+            return getattr(builtins, self.name)
+        except AttributeError:
+            raise NameError(f"name '{self.name}' is not defined") from None
+
+
+class _Arithmetic:
+    def __init__(self, op, operands):
+        self.op = op
+        self.operands = operands
+        self.fields = sum((o.fields for o in operands), ())
+        self.leaves = sum((o.leaves for o in operands), ())
+
+    def value(self, ctx):
+        return self.op(*(o.value(ctx) for o in self.operands))
+
+
+class _Attribute:
+    def __init__(self, operand, name, args=None):
+        self.operand = operand
+        self.name = name
+        self.args = args
+        self.fields = operand.fields
+        self.leaves = operand.leaves
+
+    def value(self, ctx):
+        v = getattr(self.operand.value(ctx), self.name)
+        if self.args is not None:
+            v = v(*self.args)
+        return v
+
+
+class _Compare:
+    def __init__(self, ops, operands):
+        self.ops = ops
+        self.operands = operands
+        self.fields = sum((o.fields for o in operands), ())
+        self.leaves = sum((o.leaves for o in operands), ())
+
+    def _compare(self, ctx, op, left, right, out):
+        if np.broadcast(left, right).shape != out.shape:
+            raise YTIllDefinedCutRegion(ctx.conditionals)
+        op(left, right, out=out)
+
+    def mask(self, ctx):
+        left = self.operands[0].value(ctx)
+        right = self.operands[1].value(ctx)
+        m = np.empty(np.broadcast(left, right).shape, dtype="bool")
+        self._compare(ctx, self.ops[0], left, right, m)
+        self._apply(ctx, m, right, 1)
+        return m
+
+    def apply(self, ctx, mask):
+        self._apply(ctx, mask, self.operands[0].value(ctx), 0)
+
+    def _apply(self, ctx, mask, left, start):
+        scratch = ctx.scratch(mask.shape)
+        for op, operand in zip(self.ops[start:], self.operands[start + 1 :]):
+            if not mask.any():
+                return
+            right = operand.value(ctx)
+            self._compare(ctx, op, left, right, scratch)
+            np.logical_and(mask, scratch, out=mask)
+            left = right
+
+
+class _And:
+    def __init__(self, terms):
+        self.terms = terms
+        self.fields = sum((t.fields for t in terms), ())
+        self.leaves = sum((t.leaves for t in terms), ())
+
+    def mask(self, ctx):
+        m = self.terms[0].mask(ctx)
+        for term in self.terms[1:]:
+            term.apply(ctx, m)
+        return m
+
+    def apply(self, ctx, mask):
+        # Every term only narrows the mask, so once it is empty the
+        # remaining terms, and the fields they use, are never evaluated.
+        for term in self.terms:
+            if not mask.any():
+                return
+            term.apply(ctx, mask)
+
+
+class _Or:
+    def __init__(self, terms):
+        self.terms = terms
+        self.fields = sum((t.fields for t in terms), ())
+        self.leaves = sum((t.leaves for t in terms), ())
+
+    def mask(self, ctx):
+        m = self.terms[0].mask(ctx)
+        for term in self.terms[1:]:
+            if m.all():
+                break
+            np.logical_or(m, term.mask(ctx), out=m)
+        return m
+
+    def apply(self, ctx, mask):
+        if not mask.any():
+            return
+        m = self.mask(ctx)
+        if m.shape != mask.shape:
+            raise YTIllDefinedCutRegion(ctx.conditionals)
+        np.logical_and(mask, m, out=mask)
+
+
+class _Not:
+    def __init__(self, term):
+        self.term = term
+        self.fields = term.fields
+        self.leaves = term.leaves
+
+    def mask(self, ctx):
+        m = self.term.mask(ctx)
+        return np.logical_not(m, out=m)
+
+    def apply(self, ctx, mask):
+        if not mask.any():
+            return
+        # Within the mask, "not term" is the mask less the part of it where
+        # the term holds.
+        m = mask.copy()
+        self.term.apply(ctx, m)
+        np.logical_and(mask, np.logical_not(m, out=m), out=mask)
+
+
+class _Eval:
+    # Conditionals that cannot be compiled are evaluated as before.
+    fields = ()
+    leaves = ()
+
+    def __init__(self, conditional):
+        self.code = compile(conditional, "<cut_region>", "eval")
+
+    def mask(self, ctx):
+        namespace = dict(_globals())
+        namespace.update(ctx.namespace)
+        namespace["obj"] = ctx.obj
+        return np.array(eval(self.code, namespace), dtype="bool")
+
+    def apply(self, ctx, mask):
+        res = self.mask(ctx)
+        if res.shape != mask.shape:
+            raise YTIllDefinedCutRegion(ctx.conditionals)
+        np.logical_and(mask, res, out=mask)
+
+
+def _field_key(node):
+    if isinstance(node, _index_types):
+        node = node.value
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.Tuple) and all(
+        isinstance(e, ast.Constant) and isinstance(e.value, str) for e in node.elts
+    ):
+        return tuple(e.value for e in node.elts)
+    raise _Unsupported
+
+
+def _compile_operand(node):
+    if isinstance(node, ast.Subscript):
+        if not (isinstance(node.value, ast.Name) and node.value.id == "obj"):
+            raise _Unsupported
+        return _Field(_field_key(node.slice))
+    elif isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return _Constant(node.value)
+    elif isinstance(node, ast.Name) and node.id != "obj":
+        return _Name(node.id)
+    elif isinstance(node, ast.BinOp) and type(node.op) in _arithmetic:
+        operands = [_compile_operand(node.left), _compile_operand(node.right)]
+        return _Arithmetic(_arithmetic[type(node.op)], operands)
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return _Arithmetic(operator.neg, [_compile_operand(node.operand)])
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+        return _compile_operand(node.operand)
+    elif isinstance(node, ast.Attribute) and node.attr in _attributes:
+        return _Attribute(_compile_operand(node.value), node.attr)
+    elif (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr in _methods
+        and not node.keywords
+        and all(isinstance(a, ast.Constant) for a in node.args)
+    ):
+        args = [a.value for a in node.args]
+        return _Attribute(_compile_operand(node.func.value), node.func.attr, args)
+    raise _Unsupported
+
+
+def _compile_condition(node):
+    if isinstance(node, ast.Compare):
+        if not all(type(op) in _comparisons for op in node.ops):
+            raise _Unsupported
+        ops = [_comparisons[type(op)] for op in node.ops]
+        operands = [_compile_operand(n) for n in [node.left] + node.comparators]
+        return _Compare(ops, operands)
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+        # Flatten chains such as "a & b & c" into a single node.
+        cls = _And if isinstance(node.op, ast.BitAnd) else _Or
+        terms = []
+        for child in (node.left, node.right):
+            term = _compile_condition(child)
+            if type(term) is cls:
+                terms.extend(term.terms)
+            else:
+                terms.append(term)
+        return cls(terms)
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Invert):
+        return _Not(_compile_condition(node.operand))
+    raise _Unsupported
+
+
+class CutRegionExpression:
+    r"""
+    The conditionals of a cut region, parsed once into a tree of comparisons.
+
+    Comparisons between fields of ``obj``, numbers, names defined in
+    ``locals``, unit conversions of these and arithmetic on them, combined
+    with ``&``, ``|`` and ``~``, are evaluated in place into a single boolean
+    mask.  Terms that can no longer change the mask are skipped, though the
+    fields and names they use are still checked, so that they raise the same
+    errors.  Any other conditional is evaluated with ``eval``, as written, in
+    the namespace of :mod:`~yt.data_objects.selection_objects.cut_region`.
+
+    Parameters
+    ----------
+    conditionals : list of strings
+        The conditionals, all of which must hold for an element to be
+        selected.
+
+    Examples
+    --------
+
+    >>> expr = CutRegionExpression(["obj['temperature'] > 1e4"])
+    >>> expr.fields
+    ['temperature']
+    >>> mask = expr.evaluate(ds.all_data())
+    """
+
+    def __init__(self, conditionals):
+        self.conditionals = list(conditionals)
+        self.terms = []
+        for conditional in self.conditionals:
+            try:
+                tree = ast.parse(conditional.strip(), mode="eval")
+                term = _compile_condition(tree.body)
+            except _Unsupported:
+                term = _Eval(conditional)
+            self.terms.append(term)
+        self.fields = []
+        for term in self.terms:
+            for field in term.fields:
+                if field not in self.fields:
+                    self.fields.append(field)
+        self._leaves = sum((term.leaves for term in self.terms), ())
+
+    def _check(self, ctx, shape):
+        # Every field and name must exist and match the shape of the mask,
+        # even if the terms that use them were skipped.  Those that were
+        # evaluated have been checked by their comparison already.
+        target = np.broadcast_to(False, shape)
+        for leaf in self._leaves:
+            if leaf in ctx.evaluated:
+                continue
+            try:
+                valid = np.broadcast(target, leaf.value(ctx)).shape
+            except ValueError:
+                valid = None
+            if valid != shape:
+                raise YTIllDefinedCutRegion(ctx.conditionals)
+
+    def _apply_terms(self, ctx, terms, mask):
+        for term in terms:
+            # Conditionals evaluated as written are never skipped, as their
+            # errors cannot be checked for beforehand.
+            if mask.any() or isinstance(term, _Eval):
+                term.apply(ctx, mask)
+        return mask
+
+    def evaluate(self, obj, locals=None):
+        """Return the boolean mask of the elements of *obj* selected."""
+        if len(self.terms) == 0:
+            return None
+        ctx = _Context(obj, locals or {}, self.conditionals)
+        mask = self._apply_terms(ctx, self.terms[1:], self.terms[0].mask(ctx))
+        self._check(ctx, mask.shape)
+        return mask
+
+    def apply(self, obj, mask, locals=None):
+        """Narrow *mask*, in place, to the elements of *obj* selected."""
+        ctx = _Context(obj, locals or {}, self.conditionals)
+        self._apply_terms(ctx, self.terms, mask)
+        self._check(ctx, mask.shape)
+        return mask
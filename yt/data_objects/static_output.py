@@ -154,6 +154,13 @@ class Dataset(abc.ABC):
     _proj_type = "quad_proj"
     _ionization_label_format = "roman_numeral"
 
+    # Cheap hints about the paths of this format, used by yt.load to avoid
+    # calling _is_valid on formats that cannot match.  See
+    # yt.utilities.format_detection.
+    _file_extensions = None
+    _file_signatures = None
+    _dir_signature = None
+
     # these are set in self._parse_parameter_file()
     domain_left_edge = MutableAttribute()
     domain_right_edge = MutableAttribute()
@@ -517,6 +524,21 @@ class Dataset(abc.ABC):
             np.seterr(**oldsettings)
         return self._instantiated_index
 
+    @property
+    def io_cache(self):
+        """
+        The :class:`~yt.utilities.io_handler.IOCache` holding raw field data
+        this dataset has read from disk.  It is empty and disabled unless its
+        ``max_bytes`` is set, or the ``io_cache_size`` configuration option is.
+
+        Examples
+        --------
+
+        >>> ds.io_cache.max_bytes = 2 * 1024 ** 3
+        >>> ds.io_cache.clear()
+        """
+        return self.index.io.field_cache
+
     _index_proxy = None
 
     @property
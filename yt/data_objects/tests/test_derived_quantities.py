@@ -264,3 +264,63 @@ def test_derived_quantities_with_particle_types():
         ),
         1309.164886405665,
     )
+
+
+def test_many():
+    for nprocs in [1, 4]:
+        ds = fake_random_ds(
+            16,
+            nprocs=nprocs,
+            particles=16 ** 3,
+            fields=("density", "velocity_x", "velocity_y", "velocity_z"),
+            units=("g/cm**3", "cm/s", "cm/s", "cm/s"),
+        )
+        sp = ds.sphere("c", (0.25, "unitary"))
+        requests = [
+            ("extrema", (["density", "velocity_x"],)),
+            ("Extrema", ("density",), {"non_zero": True}),
+            ("weighted_average_quantity", ("density", "cell_mass")),
+            ("weighted_variance", (["velocity_x", "density"], "cell_mass")),
+            "total_mass",
+            "center_of_mass",
+            ("bulk_velocity", (), {"use_particles": True, "particle_type": "all"}),
+            ("angular_momentum_vector", (), {"use_particles": False}),
+            ("max_location", ("density",)),
+            ("sample_at_min_field_values", ("density", ["velocity_x"])),
+        ]
+        num_chunks = len(list(sp.chunks([], "io")))
+        chunks = sp.chunks
+        read = []
+
+        def counted_chunks(*args, **kwargs):
+            for chunk in chunks(*args, **kwargs):
+                read.append(chunk)
+                yield chunk
+
+        sp.chunks = counted_chunks
+        try:
+            results = sp.quantities.many(requests)
+        finally:
+            del sp.chunks
+        # All of the quantities are computed from one pass over the data.
+        assert_equal(len(read), num_chunks)
+
+        expected = [
+            sp.quantities.extrema(["density", "velocity_x"]),
+            sp.quantities["Extrema"]("density", non_zero=True),
+            sp.quantities.weighted_average_quantity("density", "cell_mass"),
+            sp.quantities.weighted_variance(["velocity_x", "density"], "cell_mass"),
+            sp.quantities.total_mass(),
+            sp.quantities.center_of_mass(),
+            sp.quantities.bulk_velocity(use_particles=True, particle_type="all"),
+            sp.quantities.angular_momentum_vector(use_particles=False),
+            sp.quantities.max_location("density"),
+            sp.quantities.sample_at_min_field_values("density", ["velocity_x"]),
+        ]
+        assert_equal(len(results), len(expected))
+        for result, ref in zip(results, expected):
+            if isinstance(ref, list):
+                for r, e in zip(result, ref):
+                    assert_rel_equal(r, e, 12)
+            else:
+                assert_rel_equal(result, ref, 12)
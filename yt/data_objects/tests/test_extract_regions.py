@@ -1,13 +1,16 @@
 import numpy as np
 
+from yt.data_objects.selection_objects.cut_region_expression import CutRegionExpression
 from yt.loaders import load
 from yt.testing import (
     assert_almost_equal,
     assert_equal,
+    assert_raises,
     fake_amr_ds,
     fake_random_ds,
     requires_file,
 )
+from yt.utilities.exceptions import YTFieldNotFound, YTIllDefinedCutRegion
 
 
 def setup():
@@ -61,6 +64,69 @@ def test_cut_region():
         assert_equal(p2["density"].max() > 0.25, True)
 
 
+def test_cut_region_expression():
+    ds = fake_random_ds(
+        16,
+        nprocs=4,
+        fields=("density", "temperature", "velocity_x"),
+        units=("g/cm**3", "K", "cm/s"),
+    )
+    dd = ds.all_data()
+    rho = dd["density"]
+    T = dd["temperature"]
+    vx = dd["velocity_x"]
+    tmin = ds.quan(0.2, "K")
+    rho0 = ds.quan(1.0, "g/cm**3")
+    conditions = [
+        ("0.25 < obj['density'] <= 0.75", (0.25 < rho) & (rho <= 0.75)),
+        (
+            "(obj['gas', 'temperature'] > 0.5) | ~(obj['velocity_x'] < 0.5)",
+            (T > 0.5) | ~(vx < 0.5),
+        ),
+        (
+            "(obj['temperature'] - tmin) * rho0 > obj['temperature'] * obj['density']",
+            (T - tmin) * rho0 > T * rho,
+        ),
+        ("obj['density'].to('kg/m**3') > 500", rho.to("kg/m**3") > 500),
+        # Not compiled, and evaluated as written
+        ("np.abs(obj['velocity_x']) > 0.5", np.abs(vx) > 0.5),
+    ]
+    locals = {"tmin": tmin, "rho0": rho0, "np": np}
+    for condition, expected in conditions:
+        expr = CutRegionExpression([condition])
+        assert_equal(expr.evaluate(dd, locals), expected)
+        cr = dd.cut_region([condition], locals=locals)
+        assert_equal(np.sort(cr["density"]), np.sort(rho[expected]))
+    expr = CutRegionExpression([c for c, _ in conditions])
+    assert_equal(
+        expr.fields,
+        ["density", ("gas", "temperature"), "velocity_x", "temperature"],
+    )
+    expected = np.logical_and.reduce([e for _, e in conditions])
+    assert_equal(expr.evaluate(dd, locals), expected)
+
+    # Conditionals evaluated as written see the names the cut_region module
+    # does, such as np.
+    expr = CutRegionExpression(["np.abs(obj['velocity_x']) > 0.5"])
+    assert_equal(expr.evaluate(dd), np.abs(vx) > 0.5)
+    cr = dd.cut_region(["np.abs(obj['velocity_x']) > 0.5"])
+    assert_equal(np.sort(cr["density"]), np.sort(rho[np.abs(vx) > 0.5]))
+
+    # Once nothing is selected, the remaining conditionals are skipped, but
+    # they still have to be valid.
+    expr = CutRegionExpression(["obj['density'] < 0", "obj['temperature'] > 0"])
+    assert_equal(expr.evaluate(dd).any(), False)
+    mask = np.zeros(rho.shape, dtype="bool")
+    for conditional, error in [
+        ("obj['not_a_field'] > 0", YTFieldNotFound),
+        ("obj['density'] > short", YTIllDefinedCutRegion),
+    ]:
+        expr = CutRegionExpression(["obj['density'] < 0", conditional])
+        locals = {"short": np.ones(3)}
+        assert_raises(error, expr.evaluate, dd, locals)
+        assert_raises(error, expr.apply, dd, mask, locals)
+
+
 def test_region_and_particles():
     ds = fake_amr_ds(particles=10000)
 
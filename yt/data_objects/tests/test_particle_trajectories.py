@@ -6,8 +6,9 @@ from numpy.testing import assert_raises
 
 from yt.config import ytcfg
 from yt.data_objects.particle_filters import particle_filter
+from yt.data_objects.particle_trajectories import ParticleIDIndex
 from yt.data_objects.time_series import DatasetSeries
-from yt.testing import fake_particle_ds
+from yt.testing import assert_array_equal, assert_equal, fake_particle_ds
 from yt.utilities.answer_testing.framework import GenericArrayTest, requires_ds
 from yt.utilities.exceptions import YTIllDefinedParticleData
 
@@ -127,3 +128,43 @@ def test_ptype():
 
     # Build trajectories
     ts.particle_trajectories(ids, ptype="dummy")
+
+
+def test_particle_id_index():
+    n_particles = 1000
+    fields = pfields + ["particle_index"]
+    negative = [False] * 4
+    units = ["cm", "cm", "cm", "1"]
+    prng = np.random.RandomState(0x4D3D3D3)
+    all_ds = []
+    # The particles are stored in a different order in every output.
+    for i in range(3):
+        ids = prng.permutation(n_particles)
+        data = {"particle_index": ids}
+        for ax, field in zip("xyz", pfields):
+            data[field] = (ids / n_particles + 0.1 * i) % 1.0
+        ds = fake_particle_ds(
+            fields=fields,
+            negative=negative,
+            units=units,
+            npart=n_particles,
+            data=data,
+        )
+        # Trajectories are collected by output name.
+        ds.parameter_filename = f"fake_particles_{i:04d}"
+        all_ds.append(ds)
+    ts = DatasetSeries(all_ds)
+
+    indices = np.array([3, 100, 512, 999, 1500])
+    found, chunks, offsets = ParticleIDIndex(all_ds[0]).locate(indices)
+    assert_equal(found, [0, 1, 2, 3])
+    assert_equal(chunks, 0)
+    stored_ids = all_ds[0].all_data()["all", "particle_index"]
+    assert_array_equal(stored_ids[offsets], indices[:4])
+
+    traj = ts.particle_trajectories(indices, suppress_logging=True)
+    for i in range(3):
+        expected = (indices[:4] / n_particles + 0.1 * i) % 1.0
+        assert_array_equal(traj["particle_position_x"][:4, i].d, expected)
+    # Particles missing from the outputs have no trajectory.
+    assert np.all(np.isnan(traj["particle_position_x"][4].d))
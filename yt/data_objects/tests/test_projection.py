@@ -124,3 +124,22 @@ def test_max_level():
 
     proj = ds.proj("Density", 2, method="mip")
     assert proj["grid_level"].max() == ds.index.max_level
+
+
+def test_projection_threads():
+    from yt.config import ytcfg
+
+    ds = fake_amr_ds(fields=("Density", "Temperature"))
+    fields = [("stream", "Density"), ("stream", "Temperature")]
+    old_value = ytcfg.get("yt", "projection_threads")
+    try:
+        for kwargs in [{}, {"weight_field": "Density"}, {"method": "mip"}]:
+            projs = []
+            for nthreads in ["1", "3"]:
+                ytcfg["yt", "projection_threads"] = nthreads
+                projs.append(ds.proj(fields, 2, **kwargs))
+            p1, p2 = projs
+            for f in ["px", "py", "pdx", "pdy", "weight_field"] + fields:
+                assert_rel_equal(p1[f], p2[f], 12)
+    finally:
+        ytcfg["yt", "projection_threads"] = old_value
@@ -1,4 +1,11 @@
-from yt.testing import assert_array_equal, assert_raises, fake_amr_ds, fake_random_ds
+from yt.testing import (
+    assert_almost_equal,
+    assert_array_equal,
+    assert_raises,
+    fake_amr_ds,
+    fake_hexahedral_ds,
+    fake_random_ds,
+)
 from yt.units import cm
 
 
@@ -49,3 +56,33 @@ def test_ellipsis_selection():
     assert_array_equal(reg.fwidth, ereg.fwidth)
 
     assert_raises(IndexError, ds.r.__getitem__, (..., (0.5, "cm"), ...))
+
+
+def test_unstructured_mesh_element_blocks():
+    # Selecting the elements of a mesh through the bounding boxes of runs of
+    # its elements gives the same elements as testing every one of them.
+    ds = fake_hexahedral_ds()
+    mesh = ds.index.meshes[0]
+    for reg in [ds.box([-1.0, -1.0, -0.5], [-0.2, 0.1, 0.0]), ds.r[0.3:, :, :]]:
+        mesh._element_block_size = mesh.connectivity_indices.shape[0]
+        mesh._element_block_bounds = None
+        mesh._last_selector_id = None
+        expected = reg["connect1", "elem"]
+        mesh._element_block_size = 64
+        mesh._element_block_bounds = None
+        mesh._last_selector_id = None
+        reg.field_data.clear()
+        assert_array_equal(reg["connect1", "elem"], expected)
+        assert expected.size > 0
+        assert expected.size < mesh.connectivity_indices.shape[0]
+
+    # The bounding boxes are in code units, like the coordinates the
+    # selectors test, whatever the units the coordinates are given in.
+    mesh._element_block_bounds = None
+    expected = mesh.element_block_bounds
+    coords = mesh.connectivity_coords
+    mesh.connectivity_coords = ds.arr(coords, "code_length").to("mm")
+    mesh._element_block_bounds = None
+    for bounds, expected_bounds in zip(mesh.element_block_bounds, expected):
+        assert_almost_equal(bounds, expected_bounds, 15)
+    mesh.connectivity_coords = coords
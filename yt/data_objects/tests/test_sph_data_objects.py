@@ -1,7 +1,14 @@
 import numpy as np
 
 from yt import SlicePlot
-from yt.testing import assert_equal, fake_sph_grid_ds, fake_sph_orientation_ds
+from yt.testing import (
+    assert_allclose,
+    assert_almost_equal,
+    assert_equal,
+    fake_particle_ds,
+    fake_sph_grid_ds,
+    fake_sph_orientation_ds,
+)
 
 
 def test_point():
@@ -176,6 +183,47 @@ def test_cutting():
             assert_equal(cut["gas", "density"].shape[0], answer)
 
 
+def test_particle_projection():
+    ds = fake_sph_grid_ds()
+    proj = ds.proj(("gas", "density"), 2, buff_size=(128, 128))
+    assert_equal(proj["px"].shape, proj["gas", "density"].shape)
+    # The projected density integrates back to the total mass.
+    area = (2 * proj["pdx"] * 2 * proj["pdy"]).to("cm**2")
+    mass = (proj["gas", "density"] * area).sum().to("g")
+    assert_almost_equal(mass.d, ds.all_data()["gas", "mass"].sum().to("g").d, 3)
+
+    field = ("gas", "temperature")
+    weighted = ds.proj(field, 2, weight_field=("gas", "density"), buff_size=(128, 128))
+    mip = ds.proj(field, 2, method="mip", buff_size=(128, 128))
+    for proj in (weighted, mip):
+        covered = ~np.isnan(proj[field])
+        assert covered.any()
+        assert_almost_equal(proj[field][covered].to("K").d, 1.0, 10)
+    assert_equal(covered, ~np.isnan(weighted[field]))
+
+
+def test_particle_projection_deposit():
+    ds = fake_particle_ds()
+    field = ("io", "particle_mass")
+    total = ds.all_data()[field].sum().to("g")
+    proj = ds.proj(field, 2, buff_size=(64, 64))
+    # The particles are deposited in their pixel, per unit area.
+    area = (2 * proj["pdx"] * 2 * proj["pdy"]).to("cm**2")
+    assert_almost_equal((proj[field] * area).sum().to("g").d, total.d, 10)
+    summed = ds.proj(field, 2, method="sum", buff_size=(64, 64))
+    assert_equal(str(summed[field].units), "g")
+    assert_almost_equal(summed[field].sum().to("g").d, total.d, 10)
+    mip = ds.proj(field, 2, method="mip", buff_size=(64, 64))
+    covered = summed[field] > 0
+    assert_equal(covered, ~np.isnan(mip[field]))
+    largest = ds.all_data()[field].max().to("g")
+    assert_almost_equal(np.nanmax(mip[field].to("g").d), largest.d, 10)
+
+    ds = fake_sph_grid_ds()
+    summed = ds.proj(("gas", "mass"), 2, method="sum", buff_size=(32, 32))
+    assert_almost_equal(summed["gas", "mass"].sum().to("g").d, 27.0, 10)
+
+
 def test_chained_selection():
     ds = fake_sph_orientation_ds()
 
@@ -304,6 +352,20 @@ def test_gather_grid():
     assert_equal(gather, scatter)
 
 
+def test_gather_grid_local():
+    # A small grid only reads the particles around it, and finds the same
+    # neighbors as a grid over the whole domain.
+    ds = fake_sph_grid_ds()
+    ds.num_neighbors = 5
+    ds.sph_smoothing_style = "gather"
+    field = ("gas", "density")
+
+    full = ds.arbitrary_grid([0, 0, 0], [3, 3, 3], dims=[12, 12, 12])[field]
+    ag = ds.arbitrary_grid([0.75, 0.75, 0.75], [1.25, 1.25, 1.25], dims=[2, 2, 2])
+
+    assert_allclose(ag[field].d, full[3:5, 3:5, 3:5].d, rtol=1e-12)
+
+
 def test_covering_grid_scatter():
     ds = fake_sph_grid_ds()
     field = ("gas", "density")
@@ -332,3 +394,29 @@ def test_covering_grid_gather():
     cg_dens = cg[field].to("g*cm**-3").d
 
     assert_equal(ag_dens, cg_dens)
+
+
+def test_arbitrary_grid_fields():
+    from yt.config import ytcfg
+
+    fields = [("io", "density"), ("io", "temperature"), ("io", "particle_mass")]
+    old_value = ytcfg.get("yt", "numthreads")
+    try:
+        for style in ("scatter", "gather"):
+            ds = fake_sph_orientation_ds()
+            ds.sph_smoothing_style = style
+            ds.num_neighbors = 5
+            args = ([-0.5, -0.5, -0.5], [1.5, 1.5, 1.5], [9, 7, 5])
+            separate = {}
+            for field in fields:
+                separate[field] = ds.arbitrary_grid(*args)[field]
+
+            # All the fields are smoothed together, on any number of threads.
+            for nthreads in ["1", "3"]:
+                ytcfg["yt", "numthreads"] = nthreads
+                ag = ds.arbitrary_grid(*args)
+                ag.get_data(fields)
+                for field in fields:
+                    assert_equal(ag[field], separate[field])
+    finally:
+        ytcfg["yt", "numthreads"] = old_value
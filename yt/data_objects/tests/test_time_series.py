@@ -1,9 +1,17 @@
+import os
 import tempfile
+import threading
 from pathlib import Path
 
+from yt.config import ytcfg
 from yt.data_objects.time_series import DatasetSeries
-from yt.testing import assert_raises
+from yt.loaders import load
+from yt.testing import assert_equal, assert_raises, fake_random_ds, requires_module
 from yt.utilities.exceptions import YTUnidentifiedDataType
+from yt.utilities.parallel_tools.parallel_analysis_interface import (
+    enable_parallelism,
+    parallel_objects,
+)
 
 
 def test_pattern_expansion():
@@ -63,3 +71,99 @@ def test_init_fake_dataseries():
 
         # finally, check that ts[0] fails to actually load
         assert_raises(YTUnidentifiedDataType, ts.__getitem__, 0)
+
+
+def test_piter_processes():
+    datasets = [fake_random_ds(8, nprocs=1) for i in range(7)]
+    ts = DatasetSeries(datasets)
+    expected = {i: ds.r[:].quantities.total_mass()[0] for i, ds in enumerate(ts)}
+    try:
+        enable_parallelism(backend="processes", nprocs=3)
+        for dynamic in (False, True):
+            storage = {}
+            for sto, ds in ts.piter(storage=storage, dynamic=dynamic):
+                sto.result = ds.r[:].quantities.total_mass()[0]
+            assert_equal(storage, expected)
+
+        # A loop stopped by an error in any worker fails as a whole, with the
+        # traceback of that error.
+        with assert_raises(RuntimeError) as ex:
+            for sto, i in parallel_objects(range(6), storage={}):
+                if i == 4:
+                    raise ValueError("Object 4 cannot be processed.")
+                sto.result = i
+        assert "Worker process 1 failed" in str(ex.exception)
+        assert "ValueError: Object 4 cannot be processed." in str(ex.exception)
+    finally:
+        ytcfg["yt", "__parallel_processes"] = "1"
+
+
+@requires_module("h5py")
+def test_processes_internal_loops():
+    # Loops over the chunks of a dataset run serially, as worker processes
+    # would not send back what they find.
+    from yt.data_objects.profiles import create_profile
+    from yt.frontends.gadget.testing import fake_gadget_hdf5
+
+    def run(fn):
+        ds = load(fn)
+        ad = ds.all_data()
+        prof = create_profile(
+            ad,
+            ("all", "particle_position_x"),
+            ("all", "particle_mass"),
+            weight_field=None,
+        )
+        proj = ds.proj(("gas", "density"), 2)
+        return prof["all", "particle_mass"], proj["gas", "density"]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fn = fake_gadget_hdf5(
+            os.path.join(tmpdir, "fake_gadget_hdf5"), npart=(500, 500), nfiles=4
+        )
+        expected = run(fn)
+        try:
+            enable_parallelism(backend="processes", nprocs=2)
+            for a, b in zip(run(fn), expected):
+                assert_equal(a, b)
+        finally:
+            ytcfg["yt", "__parallel_processes"] = "1"
+
+
+def test_prefetch_datasets():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fns = []
+        for i in range(5):
+            ds = fake_random_ds(8, nprocs=1)
+            ds.current_time = ds.quan(i, "s")
+            fn = os.path.join(tmpdir, f"data_{i}.h5")
+            fns.append(ds.r[:].save_as_dataset(fn, fields=[("gas", "density")]))
+
+        main_thread = threading.get_ident()
+        setup_threads = []
+
+        def setup(ds):
+            setup_threads.append(threading.get_ident())
+
+        try:
+            ytcfg["yt", "prefetch_datasets"] = "2"
+            ytcfg["yt", "prefetch_dataset_index"] = "True"
+            ts = DatasetSeries(fns, setup_function=setup)
+            times = []
+            for ds in ts:
+                assert ds._instantiated_index is not None
+                times.append(float(ds.current_time))
+            assert_equal(times, list(range(5)))
+            assert_equal(setup_threads, [main_thread] * 5)
+
+            # Loops stopped early do not wait for the datasets after them.
+            for ds in ts:
+                break
+
+            storage = {}
+            for sto, ds in ts.piter(storage=storage):
+                sto.result = float(ds.current_time)
+            assert_equal(storage, dict(enumerate(times)))
+        finally:
+            ytcfg["yt", "prefetch_datasets"] = "0"
+            ytcfg["yt", "prefetch_dataset_index"] = "False"
@@ -3,6 +3,8 @@ import glob
 import inspect
 import os
 import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
 import numpy as np
@@ -10,7 +12,13 @@ import numpy as np
 from yt.config import ytcfg
 from yt.data_objects.analyzer_objects import AnalysisTask, create_quantity_proxy
 from yt.data_objects.particle_trajectories import ParticleTrajectories
-from yt.funcs import ensure_list, issue_deprecation_warning, iterable, mylog
+from yt.funcs import (
+    ensure_list,
+    get_memory_usage,
+    issue_deprecation_warning,
+    iterable,
+    mylog,
+)
 from yt.units.yt_array import YTArray, YTQuantity
 from yt.utilities.exceptions import YTException
 from yt.utilities.object_registries import (
@@ -200,6 +208,10 @@ class DatasetSeries:
         return sorted(file_list)
 
     def __iter__(self):
+        if ytcfg.getint("yt", "prefetch_datasets") > 0:
+            for _, ds in self._prefetch(enumerate(self._pre_outputs)):
+                yield ds
+            return
         # We can make this fancier, but this works
         for o in self._pre_outputs:
             try:
@@ -209,6 +221,63 @@ class DatasetSeries:
             except TypeError:
                 yield o
 
+    def _load_output(self, output):
+        # Returns the dataset of an output and whether it was loaded from it.
+        try:
+            ds = self._load(output, **self.kwargs)
+        except TypeError:
+            return output, False
+        if ytcfg.getboolean("yt", "prefetch_dataset_index"):
+            ds.index
+        return ds, True
+
+    def _prefetch(self, outputs):
+        """
+        Yield ``(i, ds)`` for every pair ``(i, output)`` in ``outputs``, where
+        ``ds`` is the dataset loaded from ``output``.
+
+        The datasets of up to ``prefetch_datasets`` outputs past the one being
+        yielded are loaded on a background thread, along with their index if
+        ``prefetch_dataset_index`` is set, so that loading overlaps with
+        whatever the caller does with the current dataset.  No more datasets
+        are loaded ahead of time while the memory used by the process exceeds
+        ``prefetch_datasets_memory`` megabytes, if that is positive.
+        """
+        depth = ytcfg.getint("yt", "prefetch_datasets")
+        max_memory = ytcfg.getint("yt", "prefetch_datasets_memory")
+        outputs = iter(outputs)
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            while True:
+                # Keep the datasets after this one loading, while there is
+                # room for them.
+                while len(pending) <= depth:
+                    if (
+                        len(pending) > 0
+                        and max_memory > 0
+                        and get_memory_usage() > max_memory
+                    ):
+                        break
+                    item = next(outputs, None)
+                    if item is None:
+                        break
+                    i, output = item
+                    pending.append((i, executor.submit(self._load_output, output)))
+                if len(pending) == 0:
+                    break
+                i, future = pending.popleft()
+                ds, loaded = future.result()
+                if loaded:
+                    self._setup_function(ds)
+                yield i, ds
+        finally:
+            # If we have been stopped early, do not bother loading datasets
+            # nobody is going to look at.
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
     def __getitem__(self, key):
         if isinstance(key, slice):
             if isinstance(key.start, float):
@@ -314,15 +383,23 @@ class DatasetSeries:
         else:
             my_communicator = communication_system.communicators[-1]
             nsize = my_communicator.size
-            if nsize == 1:
+            if nsize == 1 and ytcfg.getint("yt", "__parallel_processes") == 1:
                 self.parallel = False
                 dynamic = False
                 njobs = 1
             else:
                 njobs = nsize - 1
 
+        preload = None
+        if ytcfg.getint("yt", "prefetch_datasets") > 0:
+            preload = self._prefetch
         for output in parallel_objects(
-            self._pre_outputs, njobs=njobs, storage=storage, dynamic=dynamic
+            self._pre_outputs,
+            njobs=njobs,
+            storage=storage,
+            dynamic=dynamic,
+            preload=preload,
+            processes=True,
         ):
             if storage is not None:
                 sto, output = output
@@ -0,0 +1,271 @@
+"""
+An on-disk cache of the results of derived field detection.
+
+Detecting which derived fields a dataset can provide, and which fields each
+of them depends on, means running every derived field against a
+FieldDetector.  Datasets written by the same simulation almost always give
+the same answer, so the answer is stored in ``field_dependency_cache_dir``
+(see :ref:`configuration-file`) and reused by later loads.
+
+The key of each entry covers the frontend, the geometry, the on-disk field
+list, the particle types, the yt version and a fingerprint of every field in
+the registry (its name, function, sampling type, units and validators).  Any
+change to the registry, such as a plugin field or an ``add_field`` call,
+therefore makes a new entry rather than reusing a stale one.  The key also
+covers the names of the dataset parameters, and the values of the boolean
+ones, which are the switches that decide whether a field can be made.  Other
+values, such as the time, cycle number or identifier of an output, are left
+out so that the outputs of a simulation share their entries.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import types
+
+import numpy as np
+
+from yt.config import ytcfg
+from yt.funcs import mylog
+
+from .derived_field import DerivedField, FieldValidator
+
+# Bump this when the format of the entries changes.
+_CACHE_VERSION = 3
+
+
+class CachedFieldDependencies:
+    """
+    The part of a FieldDetector that is kept once detection is over: the
+    fields and field parameters a derived field asked for.
+    """
+
+    def __init__(self, requested, requested_parameters):
+        self.requested = set(requested)
+        self.requested_parameters = list(requested_parameters)
+
+    def __repr__(self):
+        return f"CachedFieldDependencies({sorted(self.requested, key=str)})"
+
+
+def _token(obj, _seen=None):
+    # A description of obj that does not change from one session to the
+    # next, unlike the default reprs, which include memory addresses.
+    # Objects other than containers, arrays, code, functions, callables and
+    # validators are only described by their type, which keeps closures over
+    # datasets cheap.
+    if _seen is None:
+        _seen = set()
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return repr(obj)
+    if isinstance(obj, np.generic):
+        return repr(obj.item())
+    if isinstance(obj, np.ndarray):
+        return "ndarray(%s, %s, %s)" % (
+            obj.dtype.str,
+            obj.shape,
+            hashlib.sha1(np.ascontiguousarray(obj).view("uint8")).hexdigest(),
+        )
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        items = [_token(o, _seen) for o in obj]
+        if isinstance(obj, (set, frozenset)):
+            items.sort()
+        return f"{type(obj).__name__}({', '.join(items)})"
+    if isinstance(obj, dict):
+        items = sorted(
+            f"{_token(k, _seen)}: {_token(v, _seen)}" for k, v in obj.items()
+        )
+        return "{" + ", ".join(items) + "}"
+    if isinstance(obj, types.CodeType):
+        return "code(%s, %s, %s, %s)" % (
+            obj.co_name,
+            hashlib.sha1(obj.co_code).hexdigest(),
+            _token(obj.co_consts, _seen),
+            _token(obj.co_names, _seen),
+        )
+    if isinstance(obj, types.FunctionType):
+        name = f"{obj.__module__}.{obj.__qualname__}"
+        if id(obj) in _seen:
+            return f"function({name})"
+        _seen.add(id(obj))
+        cells = [c.cell_contents for c in (obj.__closure__ or ())]
+        # The attributes of the function include, for instance, the field
+        # that a TranslationFunc is an alias of.
+        return "function(%s, %s, %s, %s)" % (
+            name,
+            _token(obj.__code__, _seen),
+            _token(cells, _seen),
+            _token(vars(obj), _seen),
+        )
+    if isinstance(obj, types.MethodType):
+        return "method(%s, %s)" % (
+            _token(obj.__func__, _seen),
+            _token(obj.__self__, _seen),
+        )
+    if isinstance(obj, functools.partial):
+        return "partial(%s, %s, %s)" % (
+            _token(obj.func, _seen),
+            _token(obj.args, _seen),
+            _token(obj.keywords, _seen),
+        )
+    if isinstance(obj, DerivedField):
+        # Fields are described on their own, see _field_token.
+        return f"DerivedField({_token(obj.name, _seen)})"
+    if isinstance(obj, FieldValidator) or (
+        callable(obj) and not isinstance(obj, type) and hasattr(obj, "__dict__")
+    ):
+        name = type(obj).__qualname__
+        if id(obj) in _seen:
+            return f"{name}(...)"
+        _seen.add(id(obj))
+        call = getattr(type(obj), "__call__", None)
+        return "%s(%s, %s)" % (name, _token(vars(obj), _seen), _token(call, _seen))
+    return type(obj).__qualname__
+
+
+def _field_token(field):
+    return _token(
+        (
+            field.name,
+            field._function,
+            field.sampling_type,
+            str(field.units),
+            field.validators,
+        )
+    )
+
+
+def _parameters_token(parameters):
+    # The dataset inputs that the key covers: the names of the parameters,
+    # and the values of the boolean ones.
+    tokens = []
+    for k, v in parameters.items():
+        if isinstance(v, (bool, np.bool_)):
+            tokens.append(f"{_token(k)}: {_token(v)}")
+        else:
+            tokens.append(_token(k))
+    return sorted(tokens)
+
+
+def _to_field(name):
+    # JSON turns the field tuples into lists.
+    return tuple(name) if isinstance(name, list) else name
+
+
+class FieldDependencyCache:
+    """
+    A directory of field detection results, one JSON file per key.
+
+    Parameters
+    ----------
+    path : str
+        The directory in which the results are stored.  It is created if it
+        does not exist.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+
+    @classmethod
+    def from_config(cls):
+        """
+        Return the cache set up by the ``field_dependency_cache_dir``
+        configuration option, or None if it is not set.
+        """
+        path = ytcfg.get("yt", "field_dependency_cache_dir")
+        if not path:
+            return None
+        return cls(path)
+
+    def key(self, field_info, fields_to_check=None):
+        """
+        The key under which the result of checking ``fields_to_check`` in
+        ``field_info`` is stored.  This must be computed before the check,
+        since the check removes the fields that are not available.
+        """
+        import yt
+
+        ds = field_info.ds
+        h = hashlib.sha256()
+        header = (
+            _CACHE_VERSION,
+            yt.__version__,
+            f"{type(ds).__module__}.{type(ds).__qualname__}",
+            f"{type(field_info).__module__}.{type(field_info).__qualname__}",
+            str(getattr(ds, "geometry", None)),
+            int(getattr(ds, "dimensionality", 3)),
+            bool(getattr(ds, "cosmological_simulation", False)),
+            getattr(getattr(ds, "unit_system", None), "name", None),
+            sorted(field_info.field_list, key=str),
+            sorted(getattr(ds, "particle_types", ())),
+            sorted(getattr(ds, "particle_types_raw", ())),
+            list(getattr(ds, "_sph_ptypes", ())),
+            None if fields_to_check is None else sorted(fields_to_check, key=str),
+            _parameters_token(getattr(ds, "parameters", None) or {}),
+        )
+        h.update(_token(header).encode())
+        for name in sorted(field_info.keys(), key=str):
+            h.update(_field_token(field_info[name]).encode())
+        return h.hexdigest()
+
+    def _filename(self, key):
+        return os.path.join(self.path, f"{key}.json")
+
+    def load(self, key):
+        """
+        Return the result stored under ``key`` as a tuple of (deps, failed,
+        unavailable), or None if there is no usable entry.
+        """
+        fn = self._filename(key)
+        if not os.path.exists(fn):
+            return None
+        try:
+            with open(fn) as f:
+                entry = json.load(f)
+            if entry["version"] != _CACHE_VERSION:
+                return None
+            deps = {
+                _to_field(name): CachedFieldDependencies(
+                    [_to_field(r) for r in requested], parameters
+                )
+                for name, requested, parameters in entry["deps"]
+            }
+            failed = [_to_field(name) for name in entry["failed"]]
+            unavailable = [_to_field(name) for name in entry["unavailable"]]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            mylog.debug("Ignoring unreadable field dependency cache %s: %s", fn, e)
+            return None
+        mylog.debug("Loaded field dependencies from %s", fn)
+        return deps, failed, unavailable
+
+    def save(self, key, deps, failed, unavailable):
+        """
+        Store the result of a field check under ``key``.  Failing to write
+        the cache is not an error.
+        """
+        entry = {
+            "version": _CACHE_VERSION,
+            "deps": [
+                [name, sorted(fd.requested, key=str), list(fd.requested_parameters)]
+                for name, fd in deps.items()
+            ],
+            "failed": list(failed),
+            "unavailable": list(unavailable),
+        }
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            # Write to a temporary file and move it into place, so that other
+            # processes loading datasets at the same time never see a partial
+            # entry.
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entry, f)
+                os.replace(tmp, self._filename(key))
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        except (OSError, TypeError, ValueError) as e:
+            mylog.debug("Could not write field dependency cache: %s", e)
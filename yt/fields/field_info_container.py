@@ -9,6 +9,7 @@ from yt.units.unit_object import Unit
 from yt.utilities.exceptions import YTFieldNotFound
 
 from .derived_field import DerivedField, NullFunc, TranslationFunc
+from .field_dependency_cache import FieldDependencyCache
 from .field_plugin_registry import field_plugins
 from .particle_fields import (
     add_union_field,
@@ -463,7 +464,22 @@ class FieldInfoContainer(dict):
         return keys
 
     def check_derived_fields(self, fields_to_check=None):
+        cache = key = None
+        if not self._show_field_errors and not hasattr(self.ds, "_field_test_dataset"):
+            cache = FieldDependencyCache.from_config()
+        if cache is not None:
+            # The key has to be computed before any field is removed.
+            key = cache.key(self, fields_to_check)
+            cached = cache.load(key)
+            if cached is not None:
+                deps, failed, unavailable = cached
+                for field in failed + unavailable:
+                    self.pop(field, None)
+                dfl = set(self.ds.derived_field_list).union(deps.keys())
+                self.ds.derived_field_list = list(sorted(dfl, key=tupleize))
+                return deps, unavailable
         deps = {}
+        failed = []
         unavailable = []
         fields_to_check = fields_to_check or list(self.keys())
         for field in fields_to_check:
@@ -482,6 +498,7 @@ class FieldInfoContainer(dict):
                         "Raises %s during field %s detection.", str(type(e)), field
                     )
                 self.pop(field)
+                failed.append(field)
                 continue
             # This next bit checks that we can't somehow generate everything.
             # We also manually update the 'requested' attribute
@@ -493,6 +510,8 @@ class FieldInfoContainer(dict):
             fd.requested = set(fd.requested)
             deps[field] = fd
             mylog.debug("Succeeded with %s (needs %s)", field, fd.requested)
+        if key is not None:
+            cache.save(key, deps, failed, unavailable)
         dfl = set(self.ds.derived_field_list).union(deps.keys())
         self.ds.derived_field_list = list(sorted(dfl, key=tupleize))
         return deps, unavailable
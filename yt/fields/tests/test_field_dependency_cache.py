@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+
+from yt.config import ytcfg
+from yt.fields.field_dependency_cache import (
+    CachedFieldDependencies,
+    FieldDependencyCache,
+)
+from yt.testing import assert_equal, fake_random_ds
+from yt.utilities.exceptions import YTFieldNotFound
+
+fields = ("density", "velocity_x", "velocity_y", "velocity_z")
+units = ("g/cm**3", "cm/s", "cm/s", "cm/s")
+
+
+def setup():
+    ytcfg["yt", "__withintesting"] = "True"
+
+
+def _load():
+    ds = fake_random_ds(16, fields=fields, units=units, particles=16)
+    ds.index
+    return ds
+
+
+def test_field_dependency_cache():
+    tmpdir = tempfile.mkdtemp()
+    old_value = ytcfg.get("yt", "field_dependency_cache_dir")
+    ytcfg["yt", "field_dependency_cache_dir"] = tmpdir
+    try:
+        ds1 = _load()
+        entries = sorted(os.listdir(tmpdir))
+        assert len(entries) > 0
+        ds2 = _load()
+        # The second dataset found everything it needed in the cache.
+        assert_equal(sorted(os.listdir(tmpdir)), entries)
+        assert_equal(ds1.derived_field_list, ds2.derived_field_list)
+        assert_equal(sorted(ds1.field_info, key=str), sorted(ds2.field_info, key=str))
+        for field, fd in ds1.field_dependencies.items():
+            cached = ds2.field_dependencies[field]
+            assert isinstance(cached, CachedFieldDependencies)
+            assert_equal(set(fd.requested), cached.requested)
+        ad = ds2.all_data()
+        assert_equal(ad["gas", "cell_mass"], ds1.all_data()["gas", "cell_mass"])
+    finally:
+        ytcfg["yt", "field_dependency_cache_dir"] = old_value
+        shutil.rmtree(tmpdir)
+
+
+def test_field_dependency_cache_key():
+    cache = FieldDependencyCache(tempfile.gettempdir())
+    ds = _load()
+    key = cache.key(ds.field_info)
+    assert_equal(cache.key(ds.field_info), key)
+    assert_equal(cache.key(_load().field_info), key)
+
+    def _double_density(field, data):
+        return 2 * data["gas", "density"]
+
+    ds.field_info.add_field(
+        ("gas", "double_density"),
+        function=_double_density,
+        sampling_type="local",
+        units="g/cm**3",
+    )
+    assert key != cache.key(ds.field_info)
+    assert cache.key(ds.field_info, [("gas", "double_density")]) != cache.key(
+        ds.field_info
+    )
+
+    # Aliases and callable objects are told apart by their state too.
+    def _alias(field, data):
+        return data[_alias.alias_name]
+
+    class _Scaled:
+        def __init__(self, factor):
+            self.factor = factor
+
+        def __call__(self, field, data):
+            return self.factor * data["gas", "density"]
+
+    keys = set()
+    for function in (_alias, _Scaled(2), _Scaled(3)):
+        for alias_name in (("gas", "density"), ("gas", "velocity_x")):
+            function.alias_name = alias_name
+            ds.field_info.add_field(
+                ("gas", "other_density"),
+                function=function,
+                sampling_type="local",
+                units="g/cm**3",
+                force_override=True,
+            )
+            keys.add(cache.key(ds.field_info))
+    assert_equal(len(keys), 6)
+
+
+def test_field_dependency_cache_parameters():
+    # An entry is only used for datasets that have the same boolean
+    # parameters, but not necessarily the same numerical ones.
+    def _flagged_density(field, data):
+        if not data.ds.parameters.get("flag"):
+            raise YTFieldNotFound(field.name)
+        return data["gas", "density"]
+
+    tmpdir = tempfile.mkdtemp()
+    old_value = ytcfg.get("yt", "field_dependency_cache_dir")
+    ytcfg["yt", "field_dependency_cache_dir"] = tmpdir
+    try:
+        entries = None
+        for flag, time in ((True, 1.0), (False, 1.0), (True, 2.0), (False, 2.0)):
+            if time == 2.0 and entries is None:
+                entries = sorted(os.listdir(tmpdir))
+            ds = _load()
+            ds.parameters["flag"] = flag
+            ds.parameters["time"] = time
+            ds.field_info.add_field(
+                ("gas", "flagged_density"),
+                function=_flagged_density,
+                sampling_type="local",
+                units="g/cm**3",
+            )
+            deps, _ = ds.field_info.check_derived_fields([("gas", "flagged_density")])
+            assert_equal(("gas", "flagged_density") in deps, bool(flag))
+        # The datasets of different times shared their entries.
+        assert_equal(sorted(os.listdir(tmpdir)), entries)
+    finally:
+        ytcfg["yt", "field_dependency_cache_dir"] = old_value
+        shutil.rmtree(tmpdir)
@@ -53,6 +53,7 @@ class AHFHalosDataset(Dataset):
     _index_class = ParticleIndex
     _file_class = AHFHalosFile
     _field_info_class = AHFHalosFieldInfo
+    _file_extensions = (".parameter",)
 
     def __init__(
         self,
@@ -135,6 +135,7 @@ class AMRVACHierarchy(GridIndex):
 class AMRVACDataset(Dataset):
     _index_class = AMRVACHierarchy
     _field_info_class = AMRVACFieldInfo
+    _file_extensions = (".dat",)
 
     def __init__(
         self,
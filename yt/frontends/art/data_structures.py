@@ -134,6 +134,7 @@ class ARTIndex(OctreeIndex):
 class ARTDataset(Dataset):
     _index_class = ARTIndex
     _field_info_class = ARTFieldInfo
+    _file_extensions = (filename_pattern["amr"][1],)
 
     def __init__(
         self,
@@ -420,6 +421,7 @@ class DarkMatterARTDataset(ARTDataset):
     _index_class = ARTParticleIndex
     _file_class = ARTParticleFile
     filter_bbox = False
+    _file_extensions = (filename_pattern["particle_data"][1],)
 
     def __init__(
         self,
@@ -338,6 +338,7 @@ class ARTIODataset(Dataset):
     _handle = None
     _index_class = ARTIOIndex
     _field_info_class = ARTIOFieldInfo
+    _file_extensions = (".art",)
 
     def __init__(
         self,
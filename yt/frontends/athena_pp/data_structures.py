@@ -238,6 +238,7 @@ class AthenaPPHierarchy(GridIndex):
 class AthenaPPDataset(Dataset):
     _field_info_class = AthenaPPFieldInfo
     _dataset_type = "athena_pp"
+    _file_extensions = ("athdf",)
 
     def __init__(
         self,
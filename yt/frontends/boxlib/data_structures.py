@@ -627,6 +627,7 @@ class BoxlibDataset(Dataset):
     _index_class = BoxlibHierarchy
     _field_info_class = BoxlibFieldInfo
     _output_prefix = None
+    _dir_signature = ("Header",)
 
     # THIS SHOULD BE FIXED:
     periodicity = (True, True, True)
@@ -46,8 +46,11 @@ class IOHandlerBoxlib(BaseIOHandler):
             ng,
         )
         ind = 0
-        for chunk in chunks:
-            data = self._read_chunk_data(chunk, centered_fields)
+
+        def read_chunk(chunk):
+            return self._read_chunk_data(chunk, centered_fields)
+
+        for chunk, data in self._prefetch(chunks, read_chunk):
             for g in chunk.objs:
                 for field in fields:
                     if field in centered_fields:
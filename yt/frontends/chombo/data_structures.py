@@ -9,6 +9,7 @@ from yt.data_objects.static_output import Dataset
 from yt.funcs import mylog, setdefaultattr
 from yt.geometry.grid_geometry_handler import GridIndex
 from yt.utilities.file_handler import HDF5FileHandler, warn_h5py
+from yt.utilities.format_detection import HDF5_SIGNATURE
 from yt.utilities.lib.misc_utilities import get_box_grids_level
 from yt.utilities.on_demand_imports import _h5py as h5py
 from yt.utilities.parallel_tools.parallel_analysis_interface import parallel_root_only
@@ -237,6 +238,7 @@ class ChomboHierarchy(GridIndex):
 class ChomboDataset(Dataset):
     _index_class = ChomboHierarchy
     _field_info_class = ChomboFieldInfo
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def __init__(
         self,
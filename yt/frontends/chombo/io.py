@@ -128,16 +128,16 @@ class IOHandlerChomboHDF5(BaseIOHandler):
             ng,
         )
 
-        ind = 0
+        ind = {field: 0 for field in fields}
+        for field, g, data in self._prefetched_io_iter(chunks, fields):
+            ind[field] += g.select(selector, data, rv[field], ind[field])  # caches
+        return rv
+
+    def io_iter(self, chunks, fields):
         for chunk in chunks:
             for g in chunk.objs:
-                nd = 0
                 for field in fields:
-                    ftype, fname = field
-                    data = self._read_data(g, fname)
-                    nd = g.select(selector, data, rv[field], ind)  # caches
-                ind += nd
-        return rv
+                    yield field, g, self._read_data(g, field[1])
 
     def _read_particle_selection(self, chunks, selector, fields):
         rv = {}
@@ -1,6 +1,5 @@
 import io
 import os
-import re
 import string
 import time
 import weakref
@@ -8,17 +7,22 @@ from collections import defaultdict
 
 import numpy as np
 
+from yt.config import ytcfg
 from yt.data_objects.index_subobjects.grid_patch import AMRGridPatch
 from yt.data_objects.static_output import Dataset
 from yt.fields.field_info_container import NullFunc
 from yt.frontends.enzo.misc import cosmology_get_units
-from yt.funcs import ensure_list, ensure_tuple, get_pbar, setdefaultattr
+from yt.funcs import ensure_list, ensure_tuple, save_npz_cache, setdefaultattr
 from yt.geometry.geometry_handler import YTDataChunk
 from yt.geometry.grid_geometry_handler import GridIndex
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py, _libconf as libconf
 
 from .fields import EnzoFieldInfo
+from .io_utils import parse_hierarchy
+
+# Bump this whenever the layout of the hierarchy cache changes.
+_HIERARCHY_CACHE_VERSION = 1
 
 
 class EnzoGrid(AMRGridPatch):
@@ -216,77 +220,106 @@ class EnzoHierarchy(GridIndex):
         else:
             raise NotImplementedError
 
-    # Sets are sorted, so that won't work!
+    @property
+    def index_cache_filename(self):
+        return self.index_filename + ".npz"
+
+    def _index_cache_header(self):
+        st = os.stat(self.index_filename)
+        return np.array(
+            [_HIERARCHY_CACHE_VERSION, st.st_size, st.st_mtime_ns], dtype="int64"
+        )
+
+    def _load_index_cache(self, active_particle_types):
+        fn = self.index_cache_filename
+        if not os.path.exists(fn):
+            return None
+        try:
+            with np.load(fn) as data:
+                if not np.array_equal(data["header"], self._index_cache_header()):
+                    return None
+                if list(data["active_particle_types"]) != active_particle_types:
+                    return None
+                return {key: data[key] for key in data.files}
+        except (OSError, KeyError, ValueError):
+            mylog.debug("Could not read the hierarchy cache %s", fn)
+            return None
+
+    def _save_index_cache(self, hierarchy, active_particle_types):
+        data = dict(hierarchy)
+        data["header"] = self._index_cache_header()
+        data["active_particle_types"] = np.array(active_particle_types, dtype="str")
+        save_npz_cache(self.index_cache_filename, **data)
+
+    def _read_hierarchy(self, active_particle_types):
+        use_cache = ytcfg.getboolean("yt", "enzo_index_cache")
+        hierarchy = None
+        if use_cache:
+            hierarchy = self._load_index_cache(active_particle_types)
+        if hierarchy is None:
+            mylog.debug("Parsing %s", self.index_filename)
+            hierarchy = parse_hierarchy(self.index_filename, active_particle_types)
+            if use_cache:
+                self._save_index_cache(hierarchy, active_particle_types)
+        return hierarchy
+
     def _parse_index(self):
-        def _next_token_line(token, f):
-            for line in f:
-                if line.startswith(token):
-                    return line.split()[2:]
-
-        pattern = r"Pointer: Grid\[(\d*)\]->NextGrid(Next|This)Level = (\d*)\s+$"
-        patt = re.compile(pattern)
-        f = open(self.index_filename, "rt")
-        self.grids = [self.grid(1, self)]
-        self.grids[0].Level = 0
-        si, ei, LE, RE, fn, npart = [], [], [], [], [], []
-        pbar = get_pbar("Parsing Hierarchy ", self.num_grids)
         version = self.dataset.parameters.get("VersionNumber", None)
         params = self.dataset.parameters
         if version is None and "Internal" in params:
             version = float(params["Internal"]["Provenance"]["VersionNumber"])
         if version >= 3.0:
-            active_particles = True
             nap = dict(
                 (ap_type, [])
                 for ap_type in params["Physics"]["ActiveParticles"][
                     "ActiveParticlesEnabled"
                 ]
             )
+        elif "AppendActiveParticleType" in self.parameters:
+            nap = {}
+            for type in self.parameters.get("AppendActiveParticleType", []):
+                nap[type] = []
         else:
-            if "AppendActiveParticleType" in self.parameters:
-                nap = {}
-                active_particles = True
-                for type in self.parameters.get("AppendActiveParticleType", []):
-                    nap[type] = []
-            else:
-                nap = None
-                active_particles = False
-        for grid_id in range(self.num_grids):
-            pbar.update(grid_id)
-            # We will unroll this list
-            si.append(_next_token_line("GridStartIndex", f))
-            ei.append(_next_token_line("GridEndIndex", f))
-            LE.append(_next_token_line("GridLeftEdge", f))
-            RE.append(_next_token_line("GridRightEdge", f))
-            nb = int(_next_token_line("NumberOfBaryonFields", f)[0])
-            fn.append([None])
-            if nb > 0:
-                fn[-1] = _next_token_line("BaryonFileName", f)
-            npart.append(int(_next_token_line("NumberOfParticles", f)[0]))
-            # Below we find out what active particles exist in this grid,
-            # and add their counts individually.
-            if active_particles:
-                ptypes = _next_token_line("PresentParticleTypes", f)
-                counts = [int(c) for c in _next_token_line("ParticleTypeCounts", f)]
-                for ptype in self.parameters.get("AppendActiveParticleType", []):
-                    if ptype in ptypes:
-                        nap[ptype].append(counts[ptypes.index(ptype)])
-                    else:
-                        nap[ptype].append(0)
-            if nb == 0 and npart[-1] > 0:
-                fn[-1] = _next_token_line("ParticleFileName", f)
-            for line in f:
-                if len(line) < 2:
-                    break
-                if line.startswith("Pointer:"):
-                    vv = patt.findall(line)[0]
-                    self.__pointer_handler(vv)
-        pbar.finish()
-        self._fill_arrays(ei, si, LE, RE, npart, nap)
-        temp_grids = np.empty(self.num_grids, dtype="object")
-        temp_grids[:] = self.grids
-        self.grids = temp_grids
-        self.filenames = fn
+            nap = None
+        ap_types = []
+        if nap is not None:
+            ap_types = list(self.parameters.get("AppendActiveParticleType", []))
+
+        hierarchy = self._read_hierarchy(ap_types)
+        if nap is not None:
+            for i, ptype in enumerate(ap_types):
+                nap[ptype] = hierarchy["active_particle_count"][:, i]
+        self._fill_arrays(
+            hierarchy["end_index"],
+            hierarchy["start_index"],
+            hierarchy["left_edge"],
+            hierarchy["right_edge"],
+            hierarchy["particle_count"],
+            nap,
+        )
+        self.grid_levels.flat[:] = hierarchy["level"]
+
+        # Grid ids start at 1, and grids without a parent have -1.
+        self._grid_parent_ind = np.where(
+            hierarchy["parent_id"] > 0, hierarchy["parent_id"] - 1, -1
+        )
+        parents = hierarchy["parent_id"].tolist()
+        levels = hierarchy["level"].tolist()
+        # Children are listed in increasing id, which is also the order in
+        # which their pointers appear in the hierarchy file.
+        children = [[] for i in range(self.num_grids)]
+        for grid_id, parent_id in enumerate(parents, 1):
+            if parent_id != -1:
+                children[parent_id - 1].append(grid_id)
+        self.grids = np.empty(self.num_grids, dtype="object")
+        for i in range(self.num_grids):
+            grid = self.grid(i + 1, self)
+            grid.Level = levels[i]
+            grid._parent_id = parents[i]
+            grid._children_ids = children[i]
+            self.grids[i] = grid
+        filenames = hierarchy["filenames"].tolist() + [None]
+        self.filenames = [[filenames[i]] for i in hierarchy["file_index"].tolist()]
 
     def _initialize_grid_arrays(self):
         super(EnzoHierarchy, self)._initialize_grid_arrays()
@@ -310,27 +343,6 @@ class EnzoHierarchy(GridIndex):
             for ptype in nap:
                 self.grid_active_particle_count[ptype].flat[:] = nap[ptype]
 
-    def __pointer_handler(self, m):
-        sgi = int(m[2]) - 1
-        if sgi == -1:
-            return  # if it's 0, then we're done with that lineage
-        # Okay, so, we have a pointer.  We make a new grid, with an id of the length+1
-        # (recall, Enzo grids are 1-indexed)
-        self.grids.append(self.grid(len(self.grids) + 1, self))
-        # We'll just go ahead and make a weakref to cache
-        second_grid = self.grids[sgi]  # zero-indexed already
-        first_grid = self.grids[int(m[0]) - 1]
-        if m[1] == "Next":
-            first_grid._children_ids.append(second_grid.id)
-            second_grid._parent_id = first_grid.id
-            second_grid.Level = first_grid.Level + 1
-        elif m[1] == "This":
-            if first_grid.Parent is not None:
-                first_grid.Parent._children_ids.append(second_grid.id)
-                second_grid._parent_id = first_grid._parent_id
-            second_grid.Level = first_grid.Level
-        self.grid_levels[sgi] = second_grid.Level
-
     def _rebuild_top_grids(self, level=0):
         mylog.info("Rebuilding grids on level %s", level)
         cmask = self.grid_levels.flat == (level + 1)
@@ -348,6 +360,11 @@ class EnzoHierarchy(GridIndex):
             for cgrid in cgrids:
                 grid._children_ids.append(cgrid.id)
                 cgrid._parent_id = grid.id
+                if self._grid_parent_ind is not None:
+                    self._grid_parent_ind[cgrid.id - cgrid._id_offset] = (
+                        grid.id - grid._id_offset
+                    )
+        self._grid_tree = None
         mylog.info("Finished rebuilding")
 
     def _populate_grid_objects(self):
@@ -561,7 +578,9 @@ class EnzoHierarchyInMemory(EnzoHierarchy):
     def _parse_index(self):
         self._copy_index_structure()
         mylog.debug("Copying reverse tree")
-        reverse_tree = self.enzo.hierarchy_information["GridParentIDs"].ravel().tolist()
+        parent_ids = self.enzo.hierarchy_information["GridParentIDs"].ravel()
+        self._grid_parent_ind = np.where(parent_ids > 0, parent_ids - 1, -1)
+        reverse_tree = parent_ids.tolist()
         # Initial setup:
         mylog.debug("Reconstructing parent-child relationships")
         grids = []
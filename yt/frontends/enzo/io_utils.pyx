@@ -0,0 +1,202 @@
+# distutils: libraries = STD_LIBS
+"""
+Compiled helpers for reading Enzo outputs.
+
+"""
+
+cimport cython
+cimport numpy as np
+from libc.stdlib cimport strtod, strtol
+from libc.string cimport memchr, strncmp
+
+import numpy as np
+
+ctypedef np.int64_t INT64_t
+ctypedef np.float64_t DOUBLE_t
+
+
+cdef inline bint _is_key(const char *line, Py_ssize_t length,
+                         const char *key, Py_ssize_t klen):
+    # The line sets ``key``, and not another parameter starting with it.
+    if length < klen or strncmp(line, key, klen) != 0:
+        return False
+    return length == klen or line[klen] in b" \t="
+
+
+cdef inline const char *_value_start(const char *line, const char *end):
+    # Skip to the first character after the "=" of a line.
+    cdef const char *eq = <const char *> memchr(line, c'=', end - line)
+    if eq == NULL:
+        return end
+    return eq + 1
+
+
+cdef inline Py_ssize_t _read_ints(const char *p, const char *end,
+                                  INT64_t *out, Py_ssize_t nmax):
+    cdef Py_ssize_t n = 0
+    cdef char *stop
+    cdef INT64_t v
+    while n < nmax:
+        while p < end and (p[0] == b" " or p[0] == b"\t"):
+            p += 1
+        if p >= end:
+            break
+        v = strtol(p, &stop, 10)
+        if stop == p:
+            break
+        out[n] = v
+        n += 1
+        p = stop
+    return n
+
+
+cdef inline Py_ssize_t _read_doubles(const char *p, const char *end,
+                                     DOUBLE_t *out, Py_ssize_t nmax):
+    cdef Py_ssize_t n = 0
+    cdef char *stop
+    cdef DOUBLE_t v
+    while n < nmax:
+        while p < end and (p[0] == b" " or p[0] == b"\t"):
+            p += 1
+        if p >= end:
+            break
+        v = strtod(p, &stop)
+        if stop == p:
+            break
+        out[n] = v
+        n += 1
+        p = stop
+    return n
+
+
+cdef inline str _read_word(const char *p, const char *end):
+    cdef const char *stop
+    while p < end and (p[0] == b" " or p[0] == b"\t"):
+        p += 1
+    stop = p
+    while stop < end and stop[0] not in b" \t\r":
+        stop += 1
+    return p[:stop - p].decode("utf-8")
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def parse_hierarchy(filename, active_particle_types=()):
+    """
+    Read the grids of an Enzo ``.hierarchy`` file into arrays.
+
+    The file is read at once and scanned a single time.  Returns a
+    dictionary of arrays with one row per grid: ``start_index``,
+    ``end_index``, ``left_edge``, ``right_edge``, ``particle_count``,
+    ``active_particle_count`` (one column per entry of
+    *active_particle_types*), ``file_index`` (the position of the grid's file
+    in ``filenames``, or -1 if the grid has no data), ``parent_id`` (-1 for
+    grids without a parent) and ``level``.
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    cdef const char *buf = data
+    cdef const char *end = buf + len(data)
+    cdef Py_ssize_t num_grids = data.count(b"\nGrid = ")
+    if data.startswith(b"Grid = "):
+        num_grids += 1
+
+    cdef np.ndarray[INT64_t, ndim=2] si = np.zeros((num_grids, 3), "int64")
+    cdef np.ndarray[INT64_t, ndim=2] ei = np.zeros((num_grids, 3), "int64")
+    cdef np.ndarray[DOUBLE_t, ndim=2] le = np.zeros((num_grids, 3), "float64")
+    cdef np.ndarray[DOUBLE_t, ndim=2] re = np.zeros((num_grids, 3), "float64")
+    cdef np.ndarray[INT64_t, ndim=1] nb = np.zeros(num_grids, "int64")
+    cdef np.ndarray[INT64_t, ndim=1] npart = np.zeros(num_grids, "int64")
+    cdef np.ndarray[INT64_t, ndim=1] parents = np.full(num_grids, -1, "int64")
+    cdef np.ndarray[INT64_t, ndim=1] levels = np.zeros(num_grids, "int64")
+    cdef np.ndarray[INT64_t, ndim=1] file_index = np.full(num_grids, -1, "int64")
+    filenames = {}
+    present_types = {}
+    type_counts = {}
+
+    cdef Py_ssize_t g = -1, rank = 0, length, n
+    cdef INT64_t first, second
+    cdef bint next_level
+    cdef const char *line = buf
+    cdef const char *line_end
+    cdef const char *p
+    cdef char *stop
+    while line < end:
+        line_end = <const char *> memchr(line, c'\n', end - line)
+        if line_end == NULL:
+            line_end = end
+        length = line_end - line
+        if g < 0 or length < 2:
+            pass
+        elif line[0] == b"P" and _is_key(line, length, b"Pointer:", 8):
+            # Pointer: Grid[first]->NextGrid(This|Next)Level = second
+            p = <const char *> memchr(line, c'[', length)
+            if p == NULL:
+                raise RuntimeError("Could not parse the hierarchy line: %s"
+                                   % line[:length].decode())
+            first = strtol(p + 1, &stop, 10) - 1
+            p = stop
+            next_level = (line_end - p > 14 and
+                          strncmp(p, b"]->NextGridNext", 15) == 0)
+            second = strtol(_value_start(p, line_end), NULL, 10) - 1
+            # Enzo grids are 1-indexed, and 0 ends the lineage.
+            if second >= 0:
+                if second >= num_grids or first < 0 or first >= num_grids:
+                    raise RuntimeError("Could not parse the hierarchy line: %s"
+                                       % line[:length].decode())
+                if next_level:
+                    parents[second] = first + 1
+                    levels[second] = levels[first] + 1
+                else:
+                    parents[second] = parents[first]
+                    levels[second] = levels[first]
+        elif _is_key(line, length, b"GridStartIndex", 14):
+            n = _read_ints(_value_start(line, line_end), line_end, &si[g, 0], 3)
+            rank = max(rank, n)
+        elif _is_key(line, length, b"GridEndIndex", 12):
+            _read_ints(_value_start(line, line_end), line_end, &ei[g, 0], 3)
+        elif _is_key(line, length, b"GridLeftEdge", 12):
+            _read_doubles(_value_start(line, line_end), line_end, &le[g, 0], 3)
+        elif _is_key(line, length, b"GridRightEdge", 13):
+            _read_doubles(_value_start(line, line_end), line_end, &re[g, 0], 3)
+        elif _is_key(line, length, b"NumberOfBaryonFields", 20):
+            _read_ints(_value_start(line, line_end), line_end, &nb[g], 1)
+        elif _is_key(line, length, b"NumberOfParticles", 17):
+            _read_ints(_value_start(line, line_end), line_end, &npart[g], 1)
+        elif _is_key(line, length, b"BaryonFileName", 14):
+            if nb[g] > 0:
+                name = _read_word(_value_start(line, line_end), line_end)
+                file_index[g] = filenames.setdefault(name, len(filenames))
+        elif _is_key(line, length, b"ParticleFileName", 16):
+            # Grids with baryon fields read particles from the same file.
+            if nb[g] == 0 and npart[g] > 0:
+                name = _read_word(_value_start(line, line_end), line_end)
+                file_index[g] = filenames.setdefault(name, len(filenames))
+        elif _is_key(line, length, b"PresentParticleTypes", 20):
+            present_types[g] = line[:length].decode().split()[2:]
+        elif _is_key(line, length, b"ParticleTypeCounts", 18):
+            type_counts[g] = line[:length].decode().split()[2:]
+        if length > 6 and strncmp(line, b"Grid = ", 7) == 0:
+            g += 1
+        line = line_end + 1
+
+    nap = np.zeros((num_grids, len(active_particle_types)), dtype="int64")
+    for grid, counts in type_counts.items():
+        ptypes = present_types.get(grid, [])
+        for i, ptype in enumerate(active_particle_types):
+            if ptype in ptypes:
+                nap[grid, i] = int(counts[ptypes.index(ptype)])
+
+    return {
+        "start_index": si[:, :rank],
+        "end_index": ei[:, :rank],
+        "left_edge": le[:, :rank],
+        "right_edge": re[:, :rank],
+        "particle_count": npart,
+        "active_particle_count": nap,
+        "filenames": np.array(list(filenames), dtype="str"),
+        "file_index": file_index,
+        "parent_id": parents,
+        "level": levels,
+    }
@@ -1,5 +1,9 @@
+import os
+import re
+
 import numpy as np
 
+from yt.config import ytcfg
 from yt.frontends.enzo.api import EnzoDataset
 from yt.frontends.enzo.fields import NODAL_FLAGS
 from yt.testing import (
@@ -284,3 +288,141 @@ def test_nonzero_omega_radiation():
         4,
         err_msg="Simulation time not consistent with cosmology calculator.",
     )
+
+
+@requires_file(enzotiny)
+def test_io_prefetch():
+    ds = data_dir_load(enzotiny)
+    sp = ds.sphere("c", (10, "Mpc"))
+    dens = sp["gas", "density"].copy()
+    old_depth = ytcfg.get("yt", "io_prefetch_depth")
+    ytcfg["yt", "io_prefetch_depth"] = "2"
+    try:
+        ds.index.clear_all_data()
+        sp = ds.sphere("c", (10, "Mpc"))
+        assert_array_equal(sp["gas", "density"], dens)
+    finally:
+        ytcfg["yt", "io_prefetch_depth"] = old_depth
+
+
+@requires_file(enzotiny)
+def test_io_cache():
+    ds = data_dir_load(enzotiny)
+    assert not ds.io_cache.enabled
+    ds.io_cache.max_bytes = 1024 ** 3
+    dens = ds.all_data()["gas", "density"]
+    misses = ds.io_cache.misses
+    assert_equal(ds.io_cache.hits, 0)
+    assert_equal(len(ds.io_cache), ds.index.num_grids)
+    sp = ds.sphere("c", (10, "Mpc"))
+    sp["gas", "density"]
+    assert_equal(ds.io_cache.misses, misses)
+    assert ds.io_cache.hits > 0
+    assert_array_equal(ds.all_data()["gas", "density"], dens)
+    ds.index.clear_all_data()
+    assert_equal(len(ds.io_cache), 0)
+
+
+def _parse_hierarchy_reference(filename, num_grids):
+    # The pure Python parser the Enzo frontend used before parse_hierarchy.
+    pattern = r"Pointer: Grid\[(\d*)\]->NextGrid(Next|This)Level = (\d*)\s+$"
+    patt = re.compile(pattern)
+
+    def _next_token_line(token, f):
+        for line in f:
+            if line.startswith(token):
+                return line.split()[2:]
+
+    si, ei, LE, RE, fn, npart = [], [], [], [], [], []
+    parents, levels, children = [-1], [0], [[]]
+    with open(filename) as f:
+        for _ in range(num_grids):
+            si.append(_next_token_line("GridStartIndex", f))
+            ei.append(_next_token_line("GridEndIndex", f))
+            LE.append(_next_token_line("GridLeftEdge", f))
+            RE.append(_next_token_line("GridRightEdge", f))
+            nb = int(_next_token_line("NumberOfBaryonFields", f)[0])
+            fn.append(None)
+            if nb > 0:
+                fn[-1] = os.path.basename(_next_token_line("BaryonFileName", f)[0])
+            npart.append(int(_next_token_line("NumberOfParticles", f)[0]))
+            if nb == 0 and npart[-1] > 0:
+                fn[-1] = os.path.basename(_next_token_line("ParticleFileName", f)[0])
+            for line in f:
+                if len(line) < 2:
+                    break
+                if not line.startswith("Pointer:"):
+                    continue
+                first, kind, second = patt.findall(line)[0]
+                first, second = int(first) - 1, int(second) - 1
+                if second == -1:
+                    continue
+                parents.append(-1)
+                levels.append(0)
+                children.append([])
+                if kind == "Next":
+                    children[first].append(second + 1)
+                    parents[second] = first + 1
+                    levels[second] = levels[first] + 1
+                else:
+                    if parents[first] != -1:
+                        children[parents[first] - 1].append(second + 1)
+                        parents[second] = parents[first]
+                    levels[second] = levels[first]
+    return {
+        "start_index": np.array(si, dtype="int64"),
+        "end_index": np.array(ei, dtype="int64"),
+        "left_edge": np.array(LE, dtype="float64"),
+        "right_edge": np.array(RE, dtype="float64"),
+        "particle_count": np.array(npart),
+        "filenames": fn,
+        "parent_id": parents,
+        "level": levels,
+        "children": children,
+    }
+
+
+@requires_file(m7)
+def test_hierarchy_cache():
+    options = ("enzo_index_cache", "skip_dataset_cache")
+    old_values = {option: ytcfg.get("yt", option) for option in options}
+    ytcfg["yt", "skip_dataset_cache"] = "True"
+    cache_fn = None
+    try:
+        ytcfg["yt", "enzo_index_cache"] = "False"
+        ds = data_dir_load(m7)
+        ref = _parse_hierarchy_reference(ds.index.index_filename, ds.index.num_grids)
+        cache_fn = ds.index.index_cache_filename
+        if os.path.exists(cache_fn):
+            os.remove(cache_fn)
+
+        ytcfg["yt", "enzo_index_cache"] = "True"
+        ds_parsed = data_dir_load(m7)
+        ds_parsed.index
+        assert os.path.exists(cache_fn)
+        ds_cached = data_dir_load(m7)
+        for new_ds in (ds, ds_parsed, ds_cached):
+            index = new_ds.index
+            assert_equal(index.num_grids, len(ref["level"]))
+            assert_array_equal(
+                index.grid_dimensions, ref["end_index"] - ref["start_index"] + 1
+            )
+            assert_array_equal(index.grid_left_edge.d, ref["left_edge"])
+            assert_array_equal(index.grid_right_edge.d, ref["right_edge"])
+            assert_array_equal(index.grid_particle_count.flat, ref["particle_count"])
+            assert_array_equal(index.grid_levels.flat, ref["level"])
+            for i, g in enumerate(index.grids):
+                filename = g.filename
+                if filename is not None:
+                    filename = os.path.basename(filename)
+                assert_equal(filename, ref["filenames"][i])
+                assert_equal(g._parent_id, ref["parent_id"][i])
+                assert_equal(g._children_ids, ref["children"][i])
+        assert_array_equal(
+            ds_cached.all_data()["gas", "density"], ds.all_data()["gas", "density"]
+        )
+    finally:
+        for option, value in old_values.items():
+            ytcfg["yt", option] = value
+        if cache_fn is not None and os.path.exists(cache_fn):
+            os.remove(cache_fn)
@@ -293,6 +293,7 @@ class EnzoPDataset(Dataset):
     _index_class = EnzoPHierarchy
     _field_info_class = EnzoPFieldInfo
     _suffix = ".block_list"
+    _file_extensions = (_suffix,)
     particle_types = None
     particle_types_raw = None
 
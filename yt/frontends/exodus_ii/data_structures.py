@@ -1,3 +1,6 @@
+import os
+import weakref
+
 import numpy as np
 
 from yt.data_objects.index_subobjects.unstructured_mesh import UnstructuredMesh
@@ -5,18 +8,64 @@ from yt.data_objects.static_output import Dataset
 from yt.data_objects.unions import MeshUnion
 from yt.funcs import setdefaultattr
 from yt.geometry.unstructured_mesh_handler import UnstructuredIndex
-from yt.utilities.file_handler import NetCDF4FileHandler, warn_netcdf
+from yt.utilities.file_handler import NetCDF4FileHandler, netcdf4_lock, warn_netcdf
+from yt.utilities.format_detection import NETCDF_SIGNATURES
 from yt.utilities.logger import ytLogger as mylog
 
 from .fields import ExodusIIFieldInfo
 from .util import get_num_pseudo_dims, load_info_records, sanitize_string
 
 
+class ExodusIIMeshData:
+    """
+    The coordinates and connectivity of the mesh blocks of an ExodusII file,
+    which are the same at every step, along with the bounding boxes of their
+    elements.  The datasets of all the steps of a file share a single
+    instance, for as long as any of them holds it.
+
+    """
+
+    def __init__(self, coords, separate_axes, connectivity):
+        self.coords = coords
+        self.separate_axes = separate_axes
+        self.connectivity = connectivity
+        self.element_block_bounds = {}
+        self._coords = {}
+
+    def coordinates(self, dimensionality):
+        # Coordinates stored one axis per variable are only read for the
+        # dimensions of the dataset.
+        if not self.separate_axes or dimensionality == self.coords.shape[1]:
+            return self.coords
+        if dimensionality not in self._coords:
+            self._coords[dimensionality] = np.ascontiguousarray(
+                self.coords[:, :dimensionality]
+            )
+        return self._coords[dimensionality]
+
+
+_mesh_data_cache = weakref.WeakValueDictionary()
+
+
 class ExodusIIUnstructuredMesh(UnstructuredMesh):
     _index_offset = 1
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, mesh_data=None, **kwargs):
         super(ExodusIIUnstructuredMesh, self).__init__(*args, **kwargs)
+        # The mesh data of the file, if the coordinates of this mesh are not
+        # displaced, so that its bounding boxes are shared by all the steps.
+        self._mesh_data = mesh_data
+
+    @property
+    def element_block_bounds(self):
+        if self._mesh_data is None:
+            return super(ExodusIIUnstructuredMesh, self).element_block_bounds
+        bounds = self._mesh_data.element_block_bounds
+        if self.mesh_id not in bounds:
+            bounds[self.mesh_id] = super(
+                ExodusIIUnstructuredMesh, self
+            ).element_block_bounds
+        return bounds[self.mesh_id]
 
 
 class ExodusIIUnstructuredIndex(UnstructuredIndex):
@@ -29,8 +78,16 @@ class ExodusIIUnstructuredIndex(UnstructuredIndex):
         self.meshes = []
         for mesh_id, conn_ind in enumerate(connectivity):
             displaced_coords = self.ds._apply_displacement(coords, mesh_id)
+            mesh_data = None
+            if displaced_coords is coords:
+                mesh_data = self.ds._mesh_data
             mesh = ExodusIIUnstructuredMesh(
-                mesh_id, self.index_filename, conn_ind, displaced_coords, self
+                mesh_id,
+                self.index_filename,
+                conn_ind,
+                displaced_coords,
+                self,
+                mesh_data=mesh_data,
             )
             self.meshes.append(mesh)
         self.mesh_union = MeshUnion("mesh_union", self.meshes)
@@ -48,6 +105,7 @@ class ExodusIIUnstructuredIndex(UnstructuredIndex):
 class ExodusIIDataset(Dataset):
     _index_class = ExodusIIUnstructuredIndex
     _field_info_class = ExodusIIFieldInfo
+    _file_signatures = NETCDF_SIGNATURES
 
     def __init__(
         self,
@@ -129,6 +187,7 @@ class ExodusIIDataset(Dataset):
 
         """
         self.parameter_filename = filename
+        self._mesh_data = None
         self.fluid_types += self._get_fluid_types()
         self.step = step
         if displacements is None:
@@ -282,37 +341,68 @@ class ExodusIIDataset(Dataset):
                     sanitize_string(v.tostring()) for v in ds.variables["name_nod_var"]
                 ]
 
-    def _read_coordinates(self):
+    def _get_mesh_data(self):
         """
 
-        Loads the coordinates for the mesh
+        Returns the coordinates and connectivity of the mesh, which are
+        only read once for all the datasets of a file.
 
         """
 
+        if self._mesh_data is not None:
+            return self._mesh_data
+        filename = os.path.abspath(self.parameter_filename)
+        key = (filename, os.path.getmtime(filename))
+        mesh_data = _mesh_data_cache.get(key)
+        if mesh_data is None:
+            mesh_data = ExodusIIMeshData(
+                *self._load_coordinates(), self._load_connectivity()
+            )
+            _mesh_data_cache[key] = mesh_data
+        self._mesh_data = mesh_data
+        return mesh_data
+
+    def _load_coordinates(self):
         coord_axes = "xyz"[: self.dimensionality]
 
         mylog.info("Loading coordinates")
         with self._handle.open_ds() as ds:
+            # The axes are copied straight into a single array, laid out the
+            # way the selectors read it.
             if "coord" not in ds.variables:
-                coords = (
-                    np.array([ds.variables[f"coord{ax}"][:] for ax in coord_axes])
-                    .transpose()
-                    .astype("f8")
-                )
+                variables = [ds.variables[f"coord{ax}"] for ax in coord_axes]
+                coords = np.empty((variables[0].shape[0], len(variables)), "f8")
+                for i, variable in enumerate(variables):
+                    coords[:, i] = variable[:]
+                return coords, True
             else:
-                coords = (
-                    np.array([coord for coord in ds.variables["coord"][:]])
-                    .transpose()
-                    .astype("f8")
-                )
-            return coords
+                coords = np.ascontiguousarray(ds.variables["coord"][:].T, "f8")
+                return coords, False
+
+    def _load_connectivity(self):
+        mylog.info("Loading connectivity")
+        connectivity = []
+        with self._handle.open_ds() as ds:
+            for i in range(self.parameters["num_meshes"]):
+                connectivity.append(ds.variables["connect%d" % (i + 1)][:].astype("i8"))
+            return connectivity
+
+    def _read_coordinates(self):
+        """
+
+        Loads the coordinates for the mesh
+
+        """
+
+        return self._get_mesh_data().coordinates(self.dimensionality)
 
     def _apply_displacement(self, coords, mesh_id):
 
         mesh_name = "connect%d" % (mesh_id + 1)
         if mesh_name not in self.displacements:
-            new_coords = coords.copy()
-            return new_coords
+            # The coordinates are shared with the other meshes, and with the
+            # datasets of the other steps of the file.
+            return coords
 
         new_coords = np.zeros_like(coords)
         fac = self.displacements[mesh_name][0]
@@ -332,12 +422,7 @@ class ExodusIIDataset(Dataset):
         """
         Loads the connectivity data for the mesh
         """
-        mylog.info("Loading connectivity")
-        connectivity = []
-        with self._handle.open_ds() as ds:
-            for i in range(self.parameters["num_meshes"]):
-                connectivity.append(ds.variables["connect%d" % (i + 1)][:].astype("i8"))
-            return connectivity
+        return self._get_mesh_data().connectivity
 
     def _load_domain_edge(self):
         """
@@ -382,7 +467,7 @@ class ExodusIIDataset(Dataset):
             filename = args[0]
             # We use keepweakref here to avoid holding onto the file handle
             # which can interfere with other is_valid calls.
-            with Dataset(filename, keepweakref=True) as f:
+            with netcdf4_lock, Dataset(filename, keepweakref=True) as f:
                 f.variables["connect1"]
             return True
         except Exception:
@@ -14,8 +14,8 @@ class IOHandlerExodusII(BaseIOHandler):
         exodus_ii_handler = NetCDF4FileHandler(self.filename)
         self.handler = exodus_ii_handler
         super(IOHandlerExodusII, self).__init__(ds)
-        self.node_fields = ds._get_nod_names()
-        self.elem_fields = ds._get_elem_names()
+        self.node_fields = ds.parameters["nod_names"]
+        self.elem_fields = ds.parameters["elem_names"]
 
     def _read_particle_coords(self, chunks, ptf):
         pass
@@ -30,52 +30,45 @@ class IOHandlerExodusII(BaseIOHandler):
         # dict gets returned at the end and it should be flat, with selected
         # data.  Note that if you're reading grid data, you might need to
         # special-case a grid selector object.
+        #
+        # The connectivity of the meshes is that held by the index, and only
+        # the values at the current step are read, for the meshes that the
+        # selector touches.
+        chunks = list(chunks)
+        rv = {}
         with self.handler.open_ds() as ds:
-            chunks = list(chunks)
-            rv = {}
             for field in fields:
                 ftype, fname = field
                 if ftype == "all":
-                    ci = np.concatenate(
-                        [
-                            mesh.connectivity_indices - self._INDEX_OFFSET
-                            for mesh in self.ds.index.mesh_union
-                        ]
-                    )
-                else:
-                    ci = ds.variables[ftype][:] - self._INDEX_OFFSET
-                num_elem = ci.shape[0]
-                if fname in self.node_fields:
-                    nodes_per_element = ci.shape[1]
-                    rv[field] = np.zeros((num_elem, nodes_per_element), dtype="float64")
-                elif fname in self.elem_fields:
-                    rv[field] = np.zeros(num_elem, dtype="float64")
-            for field in fields:
-                ind = 0
-                ftype, fname = field
-                if ftype == "all":
-                    mesh_ids = [mesh.mesh_id + 1 for mesh in self.ds.index.mesh_union]
-                    objs = [mesh for mesh in self.ds.index.mesh_union]
+                    objs = list(self.ds.index.mesh_union)
                 else:
-                    mesh_ids = [int(ftype.replace("connect", ""))]
-                    chunk = chunks[mesh_ids[0] - 1]
+                    chunk = chunks[int(ftype.replace("connect", "")) - 1]
                     objs = chunk.objs
+                nodes_per_element = objs[0].connectivity_indices.shape[1]
+                objs = [g for g in objs if g.count(selector) > 0]
+                count = sum(g.count(selector) for g in objs)
                 if fname in self.node_fields:
+                    rv[field] = np.zeros((count, nodes_per_element), dtype="float64")
+                    if len(objs) == 0:
+                        continue
                     field_ind = self.node_fields.index(fname)
                     fdata = ds.variables["vals_nod_var%d" % (field_ind + 1)]
+                    fdata = fdata[self.ds.step]
+                    ind = 0
                     for g in objs:
                         ci = g.connectivity_indices - self._INDEX_OFFSET
-                        data = fdata[self.ds.step][ci]
+                        data = fdata[ci]
                         ind += g.select(selector, data, rv[field], ind)  # caches
-                if fname in self.elem_fields:
+                elif fname in self.elem_fields:
+                    rv[field] = np.zeros(count, dtype="float64")
                     field_ind = self.elem_fields.index(fname)
-                    for g, mesh_id in zip(objs, mesh_ids):
+                    ind = 0
+                    for g in objs:
                         fdata = ds.variables[
-                            "vals_elem_var%deb%s" % (field_ind + 1, mesh_id)
-                        ][:]
+                            "vals_elem_var%deb%s" % (field_ind + 1, g.mesh_id + 1)
+                        ]
                         data = fdata[self.ds.step, :]
                         ind += g.select(selector, data, rv[field], ind)  # caches
-                rv[field] = rv[field][:ind]
             return rv
 
     def _read_chunk_data(self, chunk, fields):
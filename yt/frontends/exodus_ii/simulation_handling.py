@@ -1,5 +1,6 @@
 import glob
 
+from yt.config import ytcfg
 from yt.data_objects.time_series import DatasetSeries
 from yt.funcs import only_on_root
 from yt.loaders import load
@@ -34,23 +35,35 @@ class ExodusIISimulation(DatasetSeries):
         potential_outputs = glob.glob(fn_pattern)
         self.all_outputs = self._check_for_outputs(potential_outputs)
         self.all_outputs.sort(key=lambda obj: obj["filename"])
+        self._mesh_data = None
 
     def __iter__(self):
+        if ytcfg.getint("yt", "prefetch_datasets") > 0:
+            for _, ds in self._prefetch(enumerate(self._pre_outputs)):
+                yield ds
+            return
         for o in self._pre_outputs:
-            fn, step = o
-            ds = load(fn, step=step)
+            ds, _ = self._load_output(o)
             self._setup_function(ds)
             yield ds
 
+    def _load_output(self, output):
+        fn, step = output
+        ds = load(fn, step=step)
+        # The mesh of the last file loaded is kept, so that it is shared by
+        # the datasets of all of its steps rather than read for each one.
+        self._mesh_data = ds._mesh_data
+        if ytcfg.getboolean("yt", "prefetch_dataset_index"):
+            ds.index
+        return ds, True
+
     def __getitem__(self, key):
         if isinstance(key, slice):
             if isinstance(key.start, float):
                 return self.get_range(key.start, key.stop)
             # This will return a sliced up object!
             return DatasetSeries(self._pre_outputs[key], self.parallel)
-        o = self._pre_outputs[key]
-        fn, step = o
-        o = load(fn, step=step)
+        o, _ = self._load_output(self._pre_outputs[key])
         self._setup_function(o)
         return o
 
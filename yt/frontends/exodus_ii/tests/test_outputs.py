@@ -87,3 +87,21 @@ def test_displacement_fields():
                 return mesh.connectivity_coords
 
             yield GenericArrayTest(ds, array_func, 12)
+
+
+@requires_file(out)
+def test_mesh_shared_between_steps():
+    ds = data_dir_load(out)
+    ds_last = data_dir_load(out, kwargs={"step": -1})
+    assert ds._mesh_data is ds_last._mesh_data
+    for mesh, mesh_last in zip(ds.index.meshes, ds_last.index.meshes):
+        assert mesh.connectivity_indices is mesh_last.connectivity_indices
+        assert mesh.connectivity_coords is mesh_last.connectivity_coords
+        assert mesh.element_block_bounds is mesh_last.element_block_bounds
+    # Each step still reads its own values.
+    ad = ds.all_data()
+    ad_last = ds_last.all_data()
+    assert_equal(
+        ad["connect1", "convected"].shape, ad_last["connect1", "convected"].shape
+    )
+    assert (ad["connect1", "convected"] != ad_last["connect1", "convected"]).any()
@@ -9,6 +9,7 @@ from yt.funcs import mylog, setdefaultattr
 from yt.geometry.grid_geometry_handler import GridIndex
 from yt.geometry.particle_geometry_handler import ParticleIndex
 from yt.utilities.file_handler import HDF5FileHandler, warn_h5py
+from yt.utilities.format_detection import HDF5_SIGNATURE
 from yt.utilities.physical_ratios import cm_per_mpc
 
 from .fields import FLASHFieldInfo
@@ -165,6 +166,7 @@ class FLASHDataset(Dataset):
     _index_class = FLASHHierarchy
     _field_info_class = FLASHFieldInfo
     _handle = None
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def __init__(
         self,
@@ -9,6 +9,7 @@ from yt.frontends.sph.data_structures import SPHDataset, SPHParticleIndex
 from yt.funcs import only_on_root
 from yt.utilities.chemical_formulas import default_mu
 from yt.utilities.cosmology import Cosmology
+from yt.utilities.format_detection import HDF5_SIGNATURE
 from yt.utilities.fortran_utils import read_record
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
@@ -554,6 +555,7 @@ class GadgetHDF5Dataset(GadgetDataset):
     _particle_mass_name = "Masses"
     _sph_ptypes = ("PartType0",)
     _suffix = ".hdf5"
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def __init__(
         self,
@@ -12,6 +12,17 @@ from yt.utilities.on_demand_imports import _h5py as h5py
 from .definitions import SNAP_FORMAT_2_OFFSET, gadget_hdf5_ptypes
 
 
+def _read_ranges(dset, si, ei, ranges, *index):
+    """Read the rows of an HDF5 dataset within *ranges*, a list of (start,
+    end) offsets from row *si*, or every row from *si* to *ei* if *ranges*
+    is None."""
+    if ranges is None:
+        return dset[(slice(si, ei),) + index]
+    return np.concatenate(
+        [dset[(slice(si + start, si + end),) + index] for start, end in ranges]
+    )
+
+
 class IOHandlerGadgetHDF5(IOHandlerSPH):
     _dataset_type = "gadget_hdf5"
     _vector_fields = ("Coordinates", "Velocity", "Velocities")
@@ -42,8 +53,21 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
     def _read_fluid_selection(self, chunks, selector, fields, size):
         raise NotImplementedError
 
-    def _read_particle_coords(self, chunks, ptf):
-        # This will read chunks and yield the results.
+    def _count_particles_chunks(self, psize, chunks, ptf, selector):
+        if getattr(selector, "is_all_data", False):
+            return super()._count_particles_chunks(psize, chunks, ptf, selector)
+        for ptype, (x, y, z), hsml in self._read_particle_coords(chunks, ptf, selector):
+            psize[ptype] += selector.count_points(x, y, z, hsml)
+        return dict(psize)
+
+    def _get_particle_ranges(self, data_file, ptype, selector):
+        if selector is None:
+            return None
+        return self.ds.index._get_particle_ranges(data_file, ptype, selector)
+
+    def _read_particle_coords(self, chunks, ptf, selector=None):
+        # This will read chunks and yield the results.  If a selector is
+        # given, only the parts of the files it may select are read.
         chunks = list(chunks)
         data_files = set([])
         for chunk in chunks:
@@ -56,12 +80,18 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
             for ptype in sorted(ptf):
                 if data_file.total_particles[ptype] == 0:
                     continue
-                c = f[f"/{ptype}/Coordinates"][si:ei, :].astype("float64")
+                ranges = self._get_particle_ranges(data_file, ptype, selector)
+                if ranges == []:
+                    continue
+                c = _read_ranges(f[f"/{ptype}/Coordinates"], si, ei, ranges)
+                c = c.astype("float64")
                 x, y, z = (np.squeeze(_) for _ in np.split(c, 3, axis=1))
                 if ptype == self.ds._sph_ptypes[0]:
                     pdtype = c.dtype
                     pshape = c.shape
-                    hsml = self._get_smoothing_length(data_file, pdtype, pshape)
+                    hsml = self._get_smoothing_length(
+                        data_file, pdtype, pshape, ranges=ranges
+                    )
                 else:
                     hsml = 0.0
                 yield ptype, (x, y, z), hsml
@@ -138,7 +168,9 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                 end = min(ei, d.size) + offsets[fn]
                 d[si:ei] = hsml[begin:end]
 
-    def _get_smoothing_length(self, data_file, position_dtype, position_shape):
+    def _get_smoothing_length(
+        self, data_file, position_dtype, position_shape, ranges=None
+    ):
         ptype = self.ds._sph_ptypes[0]
         si, ei = data_file.start, data_file.end
         if self.ds.gen_hsmls:
@@ -146,7 +178,7 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
         else:
             fn = data_file.filename
         with h5py.File(fn, mode="r") as f:
-            ds = f[ptype]["SmoothingLength"][si:ei, ...]
+            ds = _read_ranges(f[ptype]["SmoothingLength"], si, ei, ranges)
             dt = ds.dtype.newbyteorder("N")  # Native
             if position_dtype is not None and dt < position_dtype:
                 # Sometimes positions are stored in double precision
@@ -171,15 +203,22 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                 if data_file.total_particles[ptype] == 0:
                     continue
                 g = f[f"/{ptype}"]
+                ranges = self._get_particle_ranges(data_file, ptype, selector)
+                if ranges == []:
+                    continue
                 if getattr(selector, "is_all_data", False):
                     mask = slice(None, None, None)
                     mask_sum = data_file.total_particles[ptype]
                     hsmls = None
                 else:
-                    coords = g["Coordinates"][si:ei].astype("float64")
+                    coords = _read_ranges(g["Coordinates"], si, ei, ranges)
+                    coords = coords.astype("float64")
                     if ptype == "PartType0":
                         hsmls = self._get_smoothing_length(
-                            data_file, g["Coordinates"].dtype, g["Coordinates"].shape
+                            data_file,
+                            g["Coordinates"].dtype,
+                            g["Coordinates"].shape,
+                            ranges=ranges,
                         ).astype("float64")
                     else:
                         hsmls = 0.0
@@ -199,16 +238,20 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                         data[:] = self.ds["Massarr"][ind]
                     elif field in self._element_names:
                         rfield = "ElementAbundance/" + field
-                        data = g[rfield][si:ei][mask, ...]
+                        data = _read_ranges(g[rfield], si, ei, ranges)[mask, ...]
                     elif field.startswith("Metallicity_"):
                         col = int(field.rsplit("_", 1)[-1])
-                        data = g["Metallicity"][si:ei, col][mask]
+                        data = _read_ranges(g["Metallicity"], si, ei, ranges, col)
+                        data = data[mask]
                     elif field.startswith("GFM_Metals_"):
                         col = int(field.rsplit("_", 1)[-1])
-                        data = g["GFM_Metals"][si:ei, col][mask]
+                        data = _read_ranges(g["GFM_Metals"], si, ei, ranges, col)
+                        data = data[mask]
                     elif field.startswith("Chemistry_"):
                         col = int(field.rsplit("_", 1)[-1])
-                        data = g["ChemistryAbundances"][si:ei, col][mask]
+                        data = _read_ranges(
+                            g["ChemistryAbundances"], si, ei, ranges, col
+                        )[mask]
                     elif field == "smoothing_length":
                         # This is for frontends which do not store
                         # the smoothing length on-disk, so we do not
@@ -219,10 +262,11 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                                 data_file,
                                 g["Coordinates"].dtype,
                                 g["Coordinates"].shape,
+                                ranges=ranges,
                             ).astype("float64")
                         data = hsmls[mask]
                     else:
-                        data = g[field][si:ei][mask, ...]
+                        data = _read_ranges(g[field], si, ei, ranges)[mask, ...]
 
                     yield (ptype, field), data
             f.close()
@@ -1,5 +1,7 @@
 import numpy as np
 
+from yt.utilities.on_demand_imports import _h5py as h5py
+
 from .data_structures import GadgetBinaryHeader, GadgetDataset
 from .definitions import gadget_field_specs, gadget_ptype_specs
 from .io import IOHandlerGadgetBinary
@@ -97,3 +99,46 @@ def fake_gadget_binary(
                 block_id = ""
             write_block(fp, data, endian, fmt, block_id)
     return filename
+
+
+def fake_gadget_hdf5(filename="fake_gadget_hdf5", npart=(100, 100), nfiles=1):
+    """Generate a fake Gadget HDF5 snapshot, split into *nfiles* files.
+
+    Gas particles are given smoothing lengths.  The particles of each file
+    are sorted along x, as those of real snapshots are often spatially
+    ordered.  Returns the name of the first file.
+    """
+    ptypes = [f"PartType{i}" for i in range(len(npart))]
+    npart = np.array(npart, dtype="int64")
+    if nfiles > 1:
+        filenames = [f"{filename}.{i}.hdf5" for i in range(nfiles)]
+    else:
+        filenames = [f"{filename}.hdf5"]
+    for i, fn in enumerate(filenames):
+        # Particle IDs are unique over all particle types and files.
+        first_id = np.cumsum(npart) - npart + npart * i // nfiles
+        npart_file = npart * (i + 1) // nfiles - npart * i // nfiles
+        with h5py.File(fn, mode="w") as f:
+            header = f.create_group("Header")
+            header.attrs["NumPart_ThisFile"] = npart_file.astype("int32")
+            header.attrs["NumPart_Total"] = npart.astype("uint32")
+            header.attrs["NumPart_Total_HighWord"] = np.zeros_like(npart, "uint32")
+            header.attrs["NumFilesPerSnapshot"] = nfiles
+            header.attrs["MassTable"] = np.zeros(len(npart))
+            header.attrs["BoxSize"] = 1.0
+            header.attrs["Time"] = 1.0
+            header.attrs["Redshift"] = 0.0
+            header.attrs["Omega0"] = 1.0
+            header.attrs["OmegaLambda"] = 0.0
+            header.attrs["HubbleParam"] = 1.0
+            for ptype, n, id0 in zip(ptypes, npart_file, first_id):
+                g = f.create_group(ptype)
+                pos = np.random.random((n, 3))
+                g["Coordinates"] = pos[np.argsort(pos[:, 0])]
+                g["Velocities"] = np.random.random((n, 3)).astype("float32")
+                g["Masses"] = np.random.random(n).astype("float32")
+                g["ParticleIDs"] = (id0 + np.random.permutation(n)).astype("uint32")
+                if ptype == "PartType0":
+                    g["Density"] = np.random.random(n).astype("float32")
+                    g["SmoothingLength"] = np.random.uniform(0.005, 0.02, n)
+    return filenames[0]
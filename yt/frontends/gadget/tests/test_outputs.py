@@ -1,3 +1,4 @@
+import glob
 import os
 import shutil
 import tempfile
@@ -5,9 +6,11 @@ from collections import OrderedDict
 from itertools import product
 
 import yt
+from yt.config import ytcfg
 from yt.frontends.gadget.api import GadgetDataset, GadgetHDF5Dataset
-from yt.frontends.gadget.testing import fake_gadget_binary
-from yt.testing import ParticleSelectionComparison, requires_file
+from yt.frontends.gadget.testing import fake_gadget_binary, fake_gadget_hdf5
+from yt.geometry.particle_geometry_handler import CHUNKSIZE
+from yt.testing import ParticleSelectionComparison, assert_equal, requires_file
 from yt.utilities.answer_testing.framework import data_dir_load, requires_ds, sph_answer
 
 isothermal_h5 = "IsothermalCollapse/snap_505.hdf5"
@@ -60,6 +63,58 @@ def test_gadget_binary():
     shutil.rmtree(tmpdir)
 
 
+def test_bitmap_index_processes():
+    # The index built by several processes matches the one built serially.
+    curdir = os.getcwd()
+    tmpdir = tempfile.mkdtemp()
+    os.chdir(tmpdir)
+    old_nprocs = ytcfg.get("yt", "particle_index_nprocs")
+    try:
+        fake_snap = fake_gadget_binary(npart=(0, CHUNKSIZE + 1000, 0, 0, 0, 0))
+        indices = []
+        for nprocs in ("1", "2"):
+            ytcfg["yt", "particle_index_nprocs"] = nprocs
+            index_filename = os.path.join(tmpdir, f"index_{nprocs}.ewah")
+            ds = yt.load(fake_snap, index_filename=index_filename)
+            assert_equal(len(ds.index.data_files), 2)
+            with open(index_filename, "rb") as f:
+                indices.append(f.read())
+        assert indices[0] == indices[1]
+    finally:
+        ytcfg["yt", "particle_index_nprocs"] = old_nprocs
+        os.chdir(curdir)
+        shutil.rmtree(tmpdir)
+
+
+def test_particle_block_index():
+    curdir = os.getcwd()
+    tmpdir = tempfile.mkdtemp()
+    os.chdir(tmpdir)
+    old_block_size = ytcfg.get("yt", "particle_index_block_size")
+    try:
+        fake_snap = fake_gadget_hdf5(npart=(20000, 30000), nfiles=2)
+        ytcfg["yt", "particle_index_block_size"] = "256"
+        ds = yt.load(fake_snap)
+        ds.index
+        assert_equal(len(glob.glob(os.path.join(tmpdir, "*.blocks.npz"))), 1)
+        # Selections only read the blocks of particles they may touch.
+        sp = ds.sphere([0.2, 0.5, 0.5], 0.1)
+        data_file = ds.index.data_files[0]
+        ranges = ds.index._get_particle_ranges(data_file, "PartType1", sp.selector)
+        assert 0 < sum(end - start for start, end in ranges) < 15000
+        psc = ParticleSelectionComparison(ds)
+        psc.run_defaults()
+        # The blocks are read back from the sidecar file.
+        ds = yt.load(fake_snap)
+        ds.index
+        psc = ParticleSelectionComparison(ds)
+        psc.run_defaults()
+    finally:
+        ytcfg["yt", "particle_index_block_size"] = old_block_size
+        os.chdir(curdir)
+        shutil.rmtree(tmpdir)
+
+
 @requires_file(isothermal_h5)
 def test_gadget_hdf5():
     assert isinstance(
@@ -15,6 +15,7 @@ from yt.frontends.halo_catalog.data_structures import HaloCatalogFile
 from yt.funcs import only_on_root, setdefaultattr
 from yt.geometry.particle_geometry_handler import ParticleIndex
 from yt.utilities.cosmology import Cosmology
+from yt.utilities.format_detection import HDF5_SIGNATURE
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
 
@@ -149,6 +150,7 @@ class GadgetFOFDataset(ParticleDataset):
     _index_class = GadgetFOFParticleIndex
     _file_class = GadgetFOFHDF5File
     _field_info_class = GadgetFOFFieldInfo
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def __init__(
         self,
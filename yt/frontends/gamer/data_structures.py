@@ -8,6 +8,7 @@ from yt.data_objects.static_output import Dataset
 from yt.funcs import mylog, setdefaultattr
 from yt.geometry.grid_geometry_handler import GridIndex
 from yt.utilities.file_handler import HDF5FileHandler
+from yt.utilities.format_detection import HDF5_SIGNATURE
 
 from .definitions import geometry_parameters
 from .fields import GAMERFieldInfo
@@ -203,6 +204,7 @@ class GAMERDataset(Dataset):
     _group_grid = None
     _group_particle = None
     _debug = False  # debug mode for the GAMER frontend
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def __init__(
         self,
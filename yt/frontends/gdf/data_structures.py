@@ -11,6 +11,7 @@ from yt.units.dimensions import dimensionless as sympy_one
 from yt.units.unit_object import Unit
 from yt.units.unit_systems import unit_system_registry
 from yt.utilities.exceptions import YTGDFUnknownGeometry
+from yt.utilities.format_detection import HDF5_SIGNATURE
 from yt.utilities.lib.misc_utilities import get_box_grids_level
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
@@ -154,6 +155,7 @@ class GDFHierarchy(GridIndex):
 class GDFDataset(Dataset):
     _index_class = GDFHierarchy
     _field_info_class = GDFFieldInfo
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def __init__(
         self,
@@ -16,6 +16,7 @@ from yt.data_objects.static_output import (
 from yt.frontends.ytdata.data_structures import SavedDataset
 from yt.funcs import parse_h5_attr
 from yt.geometry.particle_geometry_handler import ParticleIndex
+from yt.utilities.format_detection import HDF5_SIGNATURE
 from yt.utilities.on_demand_imports import _h5py as h5py
 
 from .fields import YTHaloCatalogFieldInfo, YTHaloCatalogHaloFieldInfo
@@ -102,6 +103,8 @@ class YTHaloCatalogDataset(SavedDataset):
 
     _index_class = ParticleIndex
     _file_class = YTHaloCatalogFile
+    _file_extensions = (".h5",)
+    _file_signatures = (HDF5_SIGNATURE,)
     _field_info_class = YTHaloCatalogFieldInfo
     _suffix = ".h5"
     _con_attrs = (
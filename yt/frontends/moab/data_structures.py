@@ -50,6 +50,7 @@ class MoabHex8Dataset(Dataset):
     _index_class = MoabHex8Hierarchy
     _field_info_class = MoabFieldInfo
     periodicity = (False, False, False)
+    _file_extensions = (".h5m",)
 
     def __init__(
         self,
@@ -14,6 +14,7 @@ from yt.frontends.open_pmd.misc import get_component, is_const_component
 from yt.funcs import setdefaultattr
 from yt.geometry.grid_geometry_handler import GridIndex
 from yt.utilities.file_handler import HDF5FileHandler, warn_h5py
+from yt.utilities.format_detection import HDF5_SIGNATURE
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
 
@@ -437,6 +438,7 @@ class OpenPMDDataset(Dataset):
 
     _index_class = OpenPMDHierarchy
     _field_info_class = OpenPMDFieldInfo
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def __init__(
         self,
@@ -668,6 +670,7 @@ class OpenPMDDatasetSeries(DatasetSeries):
 class OpenPMDGroupBasedDataset(Dataset):
     _index_class = OpenPMDHierarchy
     _field_info_class = OpenPMDFieldInfo
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def __new__(cls, *args, **kwargs):
         ret = object.__new__(OpenPMDDatasetSeries)
@@ -12,7 +12,7 @@ class IOHandlerOpenPMDHDF5(BaseIOHandler):
     _dataset_type = "openPMD"
 
     def __init__(self, ds, *args, **kwargs):
-        self.ds = ds
+        super(IOHandlerOpenPMDHDF5, self).__init__(ds)
         self._handle = ds._handle
         self.base_path = ds.base_path
         self.meshes_path = ds.meshes_path
@@ -9,6 +9,7 @@ from yt.frontends.gadget.data_structures import _fix_unit_ordering
 from yt.funcs import only_on_root, setdefaultattr
 from yt.geometry.particle_geometry_handler import ParticleIndex
 from yt.utilities.exceptions import YTException
+from yt.utilities.format_detection import HDF5_SIGNATURE
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
 
@@ -82,6 +83,7 @@ class OWLSSubfindDataset(ParticleDataset):
     _file_class = OWLSSubfindHDF5File
     _field_info_class = OWLSSubfindFieldInfo
     _suffix = ".hdf5"
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def __init__(
         self,
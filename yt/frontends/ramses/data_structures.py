@@ -1,18 +1,32 @@
+import hashlib
 import os
 import weakref
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from glob import glob
 
 import numpy as np
 
 from yt.arraytypes import blankRecordArray
+from yt.config import ytcfg
 from yt.data_objects.index_subobjects.octree_subset import OctreeSubset
 from yt.data_objects.particle_filters import add_particle_filter
 from yt.data_objects.static_output import Dataset
-from yt.funcs import mylog, setdefaultattr
+from yt.funcs import mylog, save_npz_cache, setdefaultattr
 from yt.geometry.geometry_handler import YTDataChunk
 from yt.geometry.oct_container import RAMSESOctreeContainer
 from yt.geometry.oct_geometry_handler import OctreeIndex
+from yt.geometry.selection_routines import (
+    CuttingPlaneSelector,
+    DiskSelector,
+    EllipsoidSelector,
+    OrthoRaySelector,
+    PointSelector,
+    RaySelector,
+    RegionSelector,
+    SliceSelector,
+    SphereSelector,
+)
 from yt.utilities.cython_fortran_utils import FortranFile as fpu
 from yt.utilities.lib.cosmology_time import friedman
 from yt.utilities.on_demand_imports import _f90nml as f90nml
@@ -22,9 +36,38 @@ from .definitions import field_aliases, particle_families, ramses_header
 from .field_handlers import get_field_handlers
 from .fields import _X, RAMSESFieldInfo
 from .hilbert import get_cpu_list
-from .io_utils import fill_hydro, read_amr
+from .io_utils import add_amr_octs, fill_hydro, read_amr_positions
 from .particle_handlers import get_particle_handlers
 
+# Bump this whenever the layout of the AMR index cache changes.
+_AMR_CACHE_VERSION = 1
+
+# Selectors whose bounding box test never rejects a region they select cells
+# in, so that domains can be skipped without building their octree.
+_BBOX_SELECTORS = (
+    CuttingPlaneSelector,
+    DiskSelector,
+    EllipsoidSelector,
+    OrthoRaySelector,
+    PointSelector,
+    RaySelector,
+    RegionSelector,
+    SliceSelector,
+    SphereSelector,
+)
+
+
+def _read_domain_amr(amr_fn, amr_offset, amr_header, ngridbound, min_level):
+    # This lives at module level so that it can be sent to worker processes.
+    with fpu(amr_fn) as f:
+        f.seek(amr_offset)
+        return read_amr_positions(f, amr_header, ngridbound, min_level)
+
+
+def _file_stat(fn):
+    st = os.stat(fn)
+    return st.st_size, st.st_mtime_ns
+
 
 class RAMSESDomainFile:
     _last_mask = None
@@ -74,11 +117,18 @@ class RAMSESDomainFile:
             ph.read_header()
             # self._add_ptype(ph.ptype)
 
-        # Load the AMR structure
-        self._read_amr()
+        # The AMR structure itself is only read when it is first needed,
+        # see set_amr_structure and oct_handler.
+        self._close_amr_file()
 
     _hydro_offset = None
     _level_count = None
+    _oct_handler = None
+    _amr_positions = None
+    _amr_cache_fn = None
+    amr_blocks = None
+    bbox = None
+    max_level = None
 
     def __repr__(self):
         return "RAMSESDomainFile: %i" % self.domain_id
@@ -145,40 +195,109 @@ class RAMSESDomainFile:
         ].sum()
         self.total_oct_count = hvals["numbl"][self.ds.min_level :, :].sum(axis=0)
 
-    def _read_amr(self):
-        """Open the oct file, read in octs level-by-level.
-           For each oct, only the position, index, level and domain
-           are needed - its position in the octree is found automatically.
-           The most important is finding all the information to feed
-           oct_handler.add
+    def _close_amr_file(self):
+        if hasattr(self, "_amr_file"):
+            self._amr_file.close()
+            del self._amr_file
+
+    def read_amr_positions(self):
+        """Read the blocks of octs stored in the AMR file and their positions.
+
+        See :func:`~yt.frontends.ramses.io_utils.read_amr_positions`.
         """
-        self.oct_handler = RAMSESOctreeContainer(
-            self.ds.domain_dimensions / 2,
-            self.ds.domain_left_edge,
-            self.ds.domain_right_edge,
-        )
-        root_nodes = self.amr_header["numbl"][self.ds.min_level, :].sum()
-        self.oct_handler.allocate_domains(self.total_oct_count, root_nodes)
         mylog.debug(
             "Reading domain AMR % 4i (%0.3e, %0.3e)",
             self.domain_id,
             self.total_oct_count.sum(),
             self.ngridbound.sum(),
         )
+        return _read_domain_amr(
+            self.amr_fn,
+            self.amr_offset,
+            self.amr_header,
+            self.ngridbound,
+            self.ds.min_level,
+        )
 
-        f = self.amr_file
-        f.seek(self.amr_offset)
+    def set_amr_structure(self, blocks, positions=None, max_level=None, bbox=None):
+        """Set the octs of this domain, without building its octree yet.
 
-        min_level = self.ds.min_level
-        max_level = read_amr(
-            f, self.amr_header, self.ngridbound, min_level, self.oct_handler
+        If the positions are not given, they are read back from the index
+        cache, or from the AMR file, when the octree is built.  The deepest
+        level and the bounding box of the octs this domain owns are computed
+        from the positions unless they are given.
+        """
+        self.amr_blocks = blocks
+        self._amr_positions = positions
+        if max_level is None or bbox is None:
+            max_level, bbox = self._summarize_amr(blocks, positions)
+        self.max_level = max_level
+        self.bbox = bbox
+
+    def _summarize_amr(self, blocks, positions):
+        ncpu = self.amr_header["ncpu"]
+        ds = self.ds
+        added = (blocks[:, 0] <= ncpu) & (blocks[:, 2] > 0)
+        max_level = int(blocks[added, 1].max()) if added.any() else 0
+
+        own = np.repeat(blocks[:, 0] == self.domain_id, blocks[:, 2])
+        if not own.any():
+            return max_level, None
+        levels = np.repeat(blocks[:, 1], blocks[:, 2])[own]
+        DLE = np.asarray(ds.domain_left_edge, dtype="float64")
+        DRE = np.asarray(ds.domain_right_edge, dtype="float64")
+        root_width = (DRE - DLE) / (ds.domain_dimensions / 2)
+        half_width = root_width[None, :] / 2.0 ** (levels[:, None] + 1)
+        pos = positions[own]
+        bbox = np.array(
+            [
+                np.clip((pos - half_width).min(axis=0), DLE, DRE),
+                np.clip((pos + half_width).max(axis=0), DLE, DRE),
+            ]
         )
+        return max_level, bbox
 
-        self.max_level = max_level
-        self.oct_handler.finalize()
+    @property
+    def amr_positions(self):
+        if self._amr_positions is not None:
+            return self._amr_positions
+        if self._amr_cache_fn is not None:
+            try:
+                with np.load(self._amr_cache_fn) as data:
+                    return data[f"pos_{self.domain_id}"]
+            except (OSError, KeyError, ValueError):
+                mylog.debug("Could not read the cached AMR of %s", self)
+        blocks, positions = self.read_amr_positions()
+        if self.amr_blocks is None or not np.array_equal(blocks, self.amr_blocks):
+            self.set_amr_structure(blocks, positions)
+        return positions
+
+    @property
+    def oct_handler(self):
+        if self._oct_handler is None:
+            self._read_amr()
+        return self._oct_handler
 
-        # Close AMR file
-        f.close()
+    def _read_amr(self):
+        """Build the octree of this domain.
+        For each oct, only the position, index, level and domain
+        are needed - its position in the octree is found automatically.
+        The most important is finding all the information to feed
+        oct_handler.add
+        """
+        positions = self.amr_positions
+        oct_handler = RAMSESOctreeContainer(
+            self.ds.domain_dimensions / 2,
+            self.ds.domain_left_edge,
+            self.ds.domain_right_edge,
+        )
+        root_nodes = self.amr_header["numbl"][self.ds.min_level, :].sum()
+        oct_handler.allocate_domains(self.total_oct_count, root_nodes)
+        add_amr_octs(oct_handler, self.amr_blocks, positions)
+        oct_handler.finalize()
+        self._oct_handler = oct_handler
+        # The octree holds everything we need from now on.
+        self._amr_positions = None
 
     def included(self, selector):
         if getattr(selector, "domain_id", None) is not None:
@@ -402,6 +521,7 @@ class RAMSESIndex(OctreeIndex):
             cpu_list = range(self.dataset["ncpu"])
 
         self.domains = [RAMSESDomainFile(self.dataset, i + 1) for i in cpu_list]
+        self._read_amr_structure()
         total_octs = sum(
             dom.local_oct_count for dom in self.domains  # + dom.ngridbound.sum()
         )
@@ -413,6 +533,151 @@ class RAMSESIndex(OctreeIndex):
         )
         self.num_grids = total_octs
 
+    @property
+    def amr_cache_filename(self):
+        # Loads that only read some of the domains, because of a bounding
+        # box, keep their own cache so as not to replace that of all domains.
+        domain_ids = sorted(dom.domain_id for dom in self.domains)
+        if domain_ids == list(range(1, self.dataset["ncpu"] + 1)):
+            return self.dataset.parameter_filename + ".amr_index.npz"
+        key = hashlib.md5(np.array(domain_ids, dtype="int64").tobytes()).hexdigest()
+        return f"{self.dataset.parameter_filename}.amr_index_{key[:12]}.npz"
+
+    def _amr_cache_header(self):
+        header = self.domains[0].amr_header
+        return np.array(
+            [_AMR_CACHE_VERSION, self.dataset.min_level, header["nlevelmax"]],
+            dtype="int64",
+        )
+
+    def _read_amr_structure(self):
+        use_cache = ytcfg.getboolean("yt", "ramses_index_cache")
+        missing = self.domains
+        if use_cache:
+            missing = self._load_amr_cache()
+        if len(missing) == 0:
+            return
+
+        nprocs = min(ytcfg.getint("yt", "ramses_index_nprocs"), len(missing))
+        args = (
+            [dom.amr_fn for dom in missing],
+            [dom.amr_offset for dom in missing],
+            [dom.amr_header for dom in missing],
+            [dom.ngridbound for dom in missing],
+            [self.dataset.min_level] * len(missing),
+        )
+        if nprocs > 1:
+            # The Fortran reader holds the GIL, so use processes rather than
+            # threads to read the files concurrently.
+            mylog.info(
+                "Reading the AMR of %s domains with %s processes", len(missing), nprocs
+            )
+            with ProcessPoolExecutor(max_workers=nprocs) as executor:
+                chunksize = max(1, len(missing) // (4 * nprocs))
+                amr = executor.map(_read_domain_amr, *args, chunksize=chunksize)
+                self._set_amr_structure(missing, amr, use_cache)
+        else:
+            amr = (dom.read_amr_positions() for dom in missing)
+            self._set_amr_structure(missing, amr, use_cache)
+
+        if use_cache:
+            self._save_amr_cache()
+            # The positions are read back from the cache, or from the AMR
+            # files if it could not be written, when the octrees are built.
+            for dom in missing:
+                dom._amr_positions = None
+
+    def _set_amr_structure(self, domains, amr, keep_positions):
+        # The positions of the octs are only kept to write them to the index
+        # cache, as every domain is read here but few of their octrees may
+        # be built.
+        for dom, (blocks, positions) in zip(domains, amr):
+            max_level, bbox = dom._summarize_amr(blocks, positions)
+            if not keep_positions:
+                positions = None
+            dom.set_amr_structure(blocks, positions, max_level, bbox)
+
+    def _load_amr_cache(self):
+        """Set the AMR structure of every domain found in the index cache.
+
+        Returns the domains that are missing from the cache, or whose AMR
+        file changed since it was written.
+        """
+        fn = self.amr_cache_filename
+        if not os.path.exists(fn):
+            return self.domains
+        try:
+            with np.load(fn) as data:
+                if not np.array_equal(data["header"], self._amr_cache_header()):
+                    return self.domains
+                domain_ids = data["domain_ids"]
+                if sorted(dom.domain_id for dom in self.domains) != list(domain_ids):
+                    return self.domains
+                stats = data["stats"]
+                max_levels = data["max_levels"]
+                bboxes = data["bboxes"]
+                blocks = np.split(data["blocks"], np.cumsum(data["block_counts"])[:-1])
+        except (OSError, KeyError, ValueError):
+            mylog.debug("Could not read the AMR index cache %s", fn)
+            return self.domains
+
+        cached = {did: i for i, did in enumerate(domain_ids)}
+        missing = []
+        for dom in self.domains:
+            i = cached.get(dom.domain_id)
+            if i is None or tuple(stats[i]) != _file_stat(dom.amr_fn):
+                missing.append(dom)
+                continue
+            bbox = bboxes[i] if np.isfinite(bboxes[i]).all() else None
+            dom.set_amr_structure(blocks[i], max_level=max_levels[i], bbox=bbox)
+            dom._amr_cache_fn = fn
+        mylog.debug(
+            "Found %s of %s domains in the AMR index cache",
+            len(self.domains) - len(missing),
+            len(self.domains),
+        )
+        return missing
+
+    def _save_amr_cache(self):
+        fn = self.amr_cache_filename
+        if not os.access(os.path.dirname(os.path.abspath(fn)), os.W_OK):
+            return
+        domains = sorted(self.domains, key=lambda dom: dom.domain_id)
+        data = {
+            "header": self._amr_cache_header(),
+            "domain_ids": np.array([dom.domain_id for dom in domains], "int64"),
+            "stats": np.array([_file_stat(dom.amr_fn) for dom in domains], "int64"),
+            "max_levels": np.array([dom.max_level for dom in domains], "int64"),
+            "bboxes": np.array(
+                [
+                    np.full((2, 3), np.nan) if dom.bbox is None else dom.bbox
+                    for dom in domains
+                ]
+            ),
+            "block_counts": np.array([len(dom.amr_blocks) for dom in domains], "int64"),
+            "blocks": np.concatenate([dom.amr_blocks for dom in domains]),
+        }
+        cached = None
+        try:
+            for dom in domains:
+                key = f"pos_{dom.domain_id}"
+                if dom._amr_positions is None and dom._amr_cache_fn == fn:
+                    if cached is None:
+                        cached = np.load(fn)
+                    data[key] = cached[key]
+                else:
+                    data[key] = dom.amr_positions
+        except (OSError, KeyError, ValueError):
+            mylog.debug("Could not read the AMR index cache %s", fn)
+            return
+        finally:
+            if cached is not None:
+                cached.close()
+        if not save_npz_cache(fn, **data):
+            return
+        for dom in domains:
+            dom._amr_cache_fn = fn
+
     def _detect_output_fields(self):
         dsl = set([])
 
@@ -437,7 +702,7 @@ class RAMSESIndex(OctreeIndex):
 
     def _identify_base_chunk(self, dobj):
         if getattr(dobj, "_chunk_info", None) is None:
-            domains = [dom for dom in self.domains if dom.included(dobj.selector)]
+            domains = self._select_domains(dobj.selector)
             base_region = getattr(dobj, "base_region", dobj)
             if len(domains) > 1:
                 mylog.debug("Identified %s intersecting domains", len(domains))
@@ -453,6 +718,19 @@ class RAMSESIndex(OctreeIndex):
             dobj._chunk_info = subsets
         dobj._current_chunk = list(self._chunk_all(dobj))[0]
 
+    def _select_domains(self, selector):
+        domains = self.domains
+        if isinstance(selector, _BBOX_SELECTORS):
+            # Skip the domains whose octs lie outside of the selector before
+            # building their octree.
+            domains = [dom for dom in domains if dom.bbox is not None]
+            if len(domains) > 0:
+                bboxes = np.array([dom.bbox for dom in domains])
+                levels = np.full((len(domains), 1), selector.min_level, "int32")
+                mask = selector.select_grids(bboxes[:, 0], bboxes[:, 1], levels)
+                domains = [dom for dom, m in zip(domains, mask) if m]
+        return [dom for dom in domains if dom.included(selector)]
+
     def _chunk_all(self, dobj):
         oobjs = getattr(dobj._current_chunk, "objs", dobj._chunk_info)
         yield YTDataChunk(dobj, "all", oobjs, None)
@@ -18,14 +18,20 @@ ctypedef np.float64_t DOUBLE_t
 @cython.wraparound(False)
 @cython.cdivision(True)
 @cython.nonecheck(False)
-def read_amr(FortranFile f, dict headers,
-             np.ndarray[np.int64_t, ndim=1] ngridbound, INT64_t min_level,
-             RAMSESOctreeContainer oct_handler):
+def read_amr_positions(FortranFile f, dict headers,
+                       np.ndarray[np.int64_t, ndim=1] ngridbound,
+                       INT64_t min_level):
+    """Read the position of every oct stored in an AMR file.
 
-    cdef INT64_t ncpu, nboundary, max_level, nlevelmax, ncpu_and_bound
+    Returns an (n, 3) array of (domain, level, number of octs) for each block
+    of octs at or above min_level, in file order, and the positions of all
+    these octs, one block after the other.
+    """
+
+    cdef INT64_t ncpu, nboundary, nlevelmax, ncpu_and_bound
     cdef DOUBLE_t nx, ny, nz
-    cdef INT64_t ilevel, icpu, n, ndim, skip_len
-    cdef INT32_t ng, buffer_size
+    cdef INT64_t ilevel, icpu, ndim, skip_len
+    cdef INT32_t ng
     cdef np.ndarray[np.int32_t, ndim=2] numbl
     cdef np.ndarray[np.float64_t, ndim=2] pos
 
@@ -38,8 +44,8 @@ def read_amr(FortranFile f, dict headers,
 
     ncpu_and_bound = nboundary + ncpu
 
-    pos = np.empty((0, 3), dtype=np.float64)
-    buffer_size = 0
+    blocks = []
+    positions = []
     # Compute number of fields to skip. This should be 31 in 3 dimensions
     skip_len = (1          # father index
                 + 2*ndim   # neighbor index
@@ -47,8 +53,6 @@ def read_amr(FortranFile f, dict headers,
                 + 2**ndim  # cpu map
                 + 2**ndim  # refinement map
     )
-    # Initialize values
-    max_level = 0
     for ilevel in range(nlevelmax):
         for icpu in range(ncpu_and_bound):
             if icpu < ncpu:
@@ -62,23 +66,47 @@ def read_amr(FortranFile f, dict headers,
             # to build the linked list in RAMSES)
             f.skip(3)
 
-            # Allocate more memory if required
-            if ng > buffer_size:
-                pos = np.empty((ng, 3), dtype="d")
-                buffer_size = ng
+            if ilevel < min_level:
+                f.skip(3 + skip_len)
+                continue
 
-            pos[:ng, 0] = f.read_vector("d") - nx
-            pos[:ng, 1] = f.read_vector("d") - ny
-            pos[:ng, 2] = f.read_vector("d") - nz
+            pos = np.empty((ng, 3), dtype="d")
+            pos[:, 0] = f.read_vector("d") - nx
+            pos[:, 1] = f.read_vector("d") - ny
+            pos[:, 2] = f.read_vector("d") - nz
 
             # Skip father, neighbor, son, cpu map and refinement map
             f.skip(skip_len)
-            # Note that we're adding *grids*, not individual cells.
-            if ilevel >= min_level:
-                n = oct_handler.add(icpu + 1, ilevel - min_level, pos[:ng, :],
-                                    count_boundary = 1)
-                if n > 0:
-                    max_level = max(ilevel - min_level, max_level)
+            blocks.append((icpu + 1, ilevel - min_level, ng))
+            positions.append(pos)
+
+    if len(blocks) == 0:
+        return np.empty((0, 3), dtype="int64"), np.empty((0, 3), dtype="d")
+    return np.array(blocks, dtype="int64"), np.concatenate(positions)
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+@cython.nonecheck(False)
+def add_amr_octs(RAMSESOctreeContainer oct_handler,
+                 np.ndarray[np.int64_t, ndim=2] blocks,
+                 np.ndarray[np.float64_t, ndim=2] pos):
+    """Add the octs returned by read_amr_positions to an octree.
+
+    Returns the deepest level octs were added at.
+    """
+    cdef INT64_t i, n, ng, offset, max_level
+
+    max_level = 0
+    offset = 0
+    for i in range(blocks.shape[0]):
+        ng = blocks[i, 2]
+        # Note that we're adding *grids*, not individual cells.
+        n = oct_handler.add(blocks[i, 0], blocks[i, 1],
+                            pos[offset:offset + ng, :], count_boundary = 1)
+        if n > 0:
+            max_level = max(blocks[i, 1], max_level)
+        offset += ng
 
     return max_level
 
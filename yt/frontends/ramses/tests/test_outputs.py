@@ -599,3 +599,54 @@ def test_invalid_max_level():
     for lvl, convention in invalid_type_args:
         with assert_raises(TypeError):
             yt.load(output_00080, max_level=lvl, max_level_convention=convention)
+
+
+@requires_file(output_00080)
+def test_amr_index_cache():
+    options = ("ramses_index_cache", "ramses_index_nprocs", "skip_dataset_cache")
+    old_values = {option: ytcfg.get("yt", option) for option in options}
+    ytcfg["yt", "skip_dataset_cache"] = "True"
+    try:
+        ytcfg["yt", "ramses_index_cache"] = "False"
+        ds = yt.load(output_00080)
+        cache_fn = ds.index.amr_cache_filename
+        # The positions of the octs are read again when the octrees are built.
+        assert all(dom._amr_positions is None for dom in ds.index.domains)
+        if os.path.exists(cache_fn):
+            os.remove(cache_fn)
+        sp = ds.sphere([0.25] * 3, (0.1, "unitary"))
+        ones = sp["index", "ones"].sum()
+        density = sp["gas", "density"]
+
+        ytcfg["yt", "ramses_index_cache"] = "True"
+        ytcfg["yt", "ramses_index_nprocs"] = "2"
+        ds_parsed = yt.load(output_00080)
+        ds_parsed.index
+        assert os.path.exists(cache_fn)
+        assert all(dom._amr_positions is None for dom in ds_parsed.index.domains)
+        ds_cached = yt.load(output_00080)
+        ds_cached.index
+        # The octrees are only built once a selection needs them.
+        assert all(dom._oct_handler is None for dom in ds_cached.index.domains)
+
+        for new_ds in (ds_parsed, ds_cached):
+            assert_equal(new_ds.index.max_level, ds.index.max_level)
+            sp = new_ds.sphere([0.25] * 3, (0.1, "unitary"))
+            assert_equal(sp["index", "ones"].sum(), ones)
+            assert_equal(sp["gas", "density"], density)
+
+        # Reading some of the domains keeps the cache of all of them.
+        bbox = [[0.2] * 3, [0.3] * 3]
+        ds_partial = yt.load(output_00080, bbox=bbox)
+        partial_fn = ds_partial.index.amr_cache_filename
+        assert partial_fn != cache_fn
+        with np.load(cache_fn) as data:
+            assert_equal(len(data["domain_ids"]), ds["ncpu"])
+        ds_partial_cached = yt.load(output_00080, bbox=bbox)
+        assert_equal(
+            len(ds_partial_cached.index.domains), len(ds_partial.index.domains)
+        )
+        os.remove(partial_fn)
+    finally:
+        for option, value in old_values.items():
+            ytcfg["yt", option] = value
@@ -53,6 +53,7 @@ class RockstarDataset(ParticleDataset):
     _file_class = RockstarBinaryFile
     _field_info_class = RockstarFieldInfo
     _suffix = ".bin"
+    _file_extensions = (_suffix,)
 
     def __init__(
         self,
@@ -160,6 +160,8 @@ class StreamHierarchy(GridIndex):
         else:
             mylog.debug("Reconstructing parent-child relationships")
             self._reconstruct_parent_child()
+        # Stream grid ids start at 0, and grids without a parent have -1.
+        self._grid_parent_ind = self.stream_handler.parent_ids
         self.max_level = self.grid_levels.max()
         mylog.debug("Preparing grids")
         temp_grids = np.empty(self.num_grids, dtype="object")
@@ -135,11 +135,30 @@ def assign_particle_data(ds, pdata, bbox):
         ds.stream_handler.particle_count[gi] = npart
 
 
+def _data_shape(data, grid_dims):
+    # Fields given as callables are only called when they are read, and
+    # always cover a whole grid.
+    if callable(data):
+        if grid_dims is None:
+            raise RuntimeError(
+                "Fields can only be given as callables for grid data "
+                "with known dimensions."
+            )
+        return tuple(grid_dims)
+    return data.shape
+
+
 def process_data(data, grid_dims=None):
     new_data, field_units = {}, {}
     for field, val in data.items():
+        # val is a memory-mapped array, which is read from disk when needed
+        # rather than copied into memory
+        if isinstance(val, np.memmap):
+            field_units[field] = ""
+            new_data[field] = val
+
         # val is a data array
-        if isinstance(val, np.ndarray):
+        elif isinstance(val, np.ndarray):
             # val is a YTArray
             if hasattr(val, "units"):
                 field_units[field] = val.units
@@ -149,11 +168,18 @@ def process_data(data, grid_dims=None):
                 field_units[field] = ""
                 new_data[field] = val.copy()
 
+        # val is a function of (grid index, field) returning the data of a grid
+        elif callable(val):
+            field_units[field] = ""
+            new_data[field] = val
+
         # val is a tuple of (data, units)
         elif isinstance(val, tuple) and len(val) == 2:
             try:
                 assert isinstance(field, (str, tuple)), "Field name is not a string!"
-                assert isinstance(val[0], np.ndarray), "Field data is not an ndarray!"
+                assert isinstance(val[0], np.ndarray) or callable(
+                    val[0]
+                ), "Field data is not an ndarray or a callable!"
                 assert isinstance(val[1], str), "Unit specification is not a string!"
                 field_units[field] = val[1]
                 new_data[field] = val[0]
@@ -177,7 +203,7 @@ def process_data(data, grid_dims=None):
     # At this point, we have arrays for all our fields
     new_data = {}
     for field in data:
-        n_shape = len(data[field].shape)
+        n_shape = len(_data_shape(data[field], grid_dims))
         if isinstance(field, tuple):
             new_field = field
         elif n_shape in (1, 2):
@@ -203,7 +229,7 @@ def process_data(data, grid_dims=None):
     g_shapes = []
     p_shapes = defaultdict(list)
     for field in data:
-        f_shape = data[field].shape
+        f_shape = _data_shape(data[field], grid_dims)
         n_shape = len(f_shape)
         if n_shape in (1, 2):
             p_shapes[field[0]].append((field[1], f_shape[0]))
@@ -235,7 +261,7 @@ def set_particle_types(data):
     for key in data.keys():
         if key == "number_of_particles":
             continue
-        if len(data[key].shape) == 1:
+        if not callable(data[key]) and len(data[key].shape) == 1:
             particle_types[key] = True
         else:
             particle_types[key] = False
@@ -1,6 +1,9 @@
 import numpy as np
 
-from yt.utilities.exceptions import YTDomainOverflow
+from yt.utilities.exceptions import (
+    YTDomainOverflow,
+    YTInconsistentGridFieldShapeGridDims,
+)
 from yt.utilities.io_handler import BaseIOHandler
 from yt.utilities.logger import ytLogger as mylog
 
@@ -15,9 +18,21 @@ class IOHandlerStream(BaseIOHandler):
         self.field_units = ds.stream_handler.field_units
         super(IOHandlerStream, self).__init__(ds)
 
+    def _grid_field(self, grid, field):
+        # Fields may be given as callables, which return the data of a grid
+        # only when it is read.
+        data = self.fields[grid.id][field]
+        if callable(data):
+            data = data(grid.id, field)
+            if tuple(data.shape) != tuple(grid.ActiveDimensions):
+                raise YTInconsistentGridFieldShapeGridDims(
+                    [(field, data.shape)], tuple(grid.ActiveDimensions)
+                )
+        return data
+
     def _read_data_set(self, grid, field):
         # This is where we implement processor-locking
-        tr = self.fields[grid.id][field]
+        tr = self._grid_field(grid, field)
         # If it's particles, we copy.
         if len(tr.shape) == 1:
             return tr.copy()
@@ -44,7 +59,7 @@ class IOHandlerStream(BaseIOHandler):
             ind = 0
             for chunk in chunks:
                 for g in chunk.objs:
-                    ds = self.fields[g.id][ftype, fname]
+                    ds = self._grid_field(g, (ftype, fname))
                     ind += g.select(selector, ds, rv[field], ind)  # caches
         return rv
 
@@ -73,3 +73,32 @@ def test_inconsistent_field_shape():
         load_particles(data)
 
     assert_raises(YTInconsistentParticleFieldShape, load_particle_fields_mismatch)
+
+
+def test_memmap_fields():
+    shape = (32, 32, 32)
+    rho = np.random.uniform(size=shape).astype("float32")
+    pos = np.random.uniform(size=(3, 100))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fn = os.path.join(tmpdir, "density.raw")
+        rho.tofile(fn)
+        pfn = os.path.join(tmpdir, "positions.raw")
+        pos.tofile(pfn)
+        mm = np.memmap(fn, dtype="float32", mode="r", shape=shape)
+        pmm = np.memmap(pfn, dtype="float64", mode="r", shape=pos.shape)
+
+        for data in [{"density": mm}, {"density": (mm, "g/cm**3")}]:
+            ds = load_uniform_grid(data, shape, nprocs=8)
+            # The grids are views of the memory-mapped file.
+            for fields in ds.stream_handler.fields.values():
+                assert np.shares_memory(fields["stream", "density"], mm)
+            dd = ds.all_data()
+            assert_equal(np.sort(dd["stream", "density"].d), np.sort(rho.ravel()))
+
+        data = {f"particle_position_{ax}": pmm[i] for i, ax in enumerate("xyz")}
+        ds = load_particles(data)
+        fields = ds.stream_handler.fields["stream_file"]
+        assert np.shares_memory(fields["io", "particle_position_x"], pmm)
+        dd = ds.all_data()
+        assert_equal(np.sort(dd["io", "particle_position_y"].d), np.sort(pos[1]))
+        del ds, dd, mm, pmm, fields
@@ -1,8 +1,12 @@
 import numpy as np
 
 from yt import ProjectionPlot, load_amr_grids
-from yt.testing import assert_raises
-from yt.utilities.exceptions import YTIllDefinedAMR, YTIntDomainOverflow
+from yt.testing import assert_equal, assert_raises
+from yt.utilities.exceptions import (
+    YTIllDefinedAMR,
+    YTInconsistentGridFieldShapeGridDims,
+    YTIntDomainOverflow,
+)
 
 
 def test_qt_overflow():
@@ -82,3 +86,51 @@ def test_validation():
         )
 
     assert_raises(YTIllDefinedAMR, load_grids)
+
+
+def test_callable_fields():
+    domain_dimensions = np.array([16, 16, 16])
+    edges = [([0.0] * 3, [1.0] * 3, 0), ([0.25] * 3, [0.75] * 3, 1)]
+    arrays = [np.random.random(domain_dimensions) for _ in edges]
+    calls = []
+
+    def load_density(grid_index, field):
+        calls.append((grid_index, field))
+        return arrays[grid_index]
+
+    grid_data = []
+    for left_edge, right_edge, level in edges:
+        grid_data.append(
+            dict(
+                left_edge=left_edge,
+                right_edge=right_edge,
+                level=level,
+                dimensions=domain_dimensions,
+                density=(load_density, "g/cm**3"),
+            )
+        )
+    ds = load_amr_grids(grid_data, domain_dimensions)
+    assert_equal(ds.field_list, [("stream", "density")])
+    # Nothing is loaded until the data is read.
+    assert_equal(calls, [])
+    for i, grid in enumerate(ds.index.grids):
+        assert_equal(grid["density"].d, arrays[i])
+        assert_equal(str(grid["density"].units), "g/cm**3")
+    assert_equal(calls, [(0, ("stream", "density")), (1, ("stream", "density"))])
+
+    def load_wrong_shape(grid_index, field):
+        return np.ones(4)
+
+    grid_data = [
+        dict(
+            left_edge=[0.0] * 3,
+            right_edge=[1.0] * 3,
+            level=0,
+            dimensions=domain_dimensions,
+            density=load_wrong_shape,
+        )
+    ]
+    ds = load_amr_grids(grid_data, domain_dimensions)
+    assert_raises(
+        YTInconsistentGridFieldShapeGridDims, ds.r.__getitem__, ("stream", "density")
+    )
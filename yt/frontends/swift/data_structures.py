@@ -6,6 +6,7 @@ from yt.data_objects.static_output import ParticleFile
 from yt.frontends.sph.data_structures import SPHDataset, SPHParticleIndex
 from yt.frontends.sph.fields import SPHFieldInfo
 from yt.funcs import only_on_root
+from yt.utilities.format_detection import HDF5_SIGNATURE
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
 
@@ -20,6 +21,7 @@ class SwiftDataset(SPHDataset):
     _particle_velocity_name = "Velocities"
     _sph_ptypes = ("PartType0",)
     _suffix = ".hdf5"
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def __init__(
         self, filename, dataset_type="swift", storage_filename=None, units_override=None
@@ -21,6 +21,7 @@ from yt.units import dimensions
 from yt.units.unit_registry import UnitRegistry
 from yt.units.yt_array import YTQuantity, uconcatenate
 from yt.utilities.exceptions import GenerationInProgress, YTFieldTypeNotFound
+from yt.utilities.format_detection import HDF5_SIGNATURE
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
 from yt.utilities.parallel_tools.parallel_analysis_interface import parallel_root_only
@@ -171,6 +172,8 @@ class YTDataset(SavedDataset):
         "container_type",
         "data_type",
     )
+    _file_extensions = (".h5",)
+    _file_signatures = (HDF5_SIGNATURE,)
 
     def _with_parameter_file_open(self, f):
         self.num_particles = dict(
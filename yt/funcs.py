@@ -914,6 +914,16 @@ def get_num_threads():
     return nt
 
 
+def get_thread_count():
+    """
+    The number of threads to run in parallel: that set by the ``numthreads``
+    configuration option, or ``OMP_NUM_THREADS`` if it is negative, and a
+    single thread if neither is set.  Using every core by default would
+    oversubscribe the machine when several MPI tasks share it.
+    """
+    return max(int(get_num_threads()), 1)
+
+
 def fix_axis(axis, ds):
     return ds.coordinates.axis_id.get(axis, axis)
 
@@ -998,6 +1008,49 @@ def ensure_dir(path):
     return path
 
 
+def write_file_atomically(filename, write, suffix=""):
+    r"""Write the file *filename* with *write*, called with an open binary
+    file.
+
+    The file is written to a temporary file in the same directory first, so
+    that no other thread or process ever reads a partially written file, and
+    it gets the permissions set by the umask.  Returns whether the file was
+    written; failing to write it is not an error.
+    """
+    import tempfile
+
+    wdir = os.path.dirname(os.path.abspath(filename))
+    if not os.access(wdir, os.W_OK):
+        return False
+    umask = os.umask(0)
+    os.umask(umask)
+    tmp_fn = None
+    try:
+        fd, tmp_fn = tempfile.mkstemp(dir=wdir, suffix=suffix)
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.chmod(tmp_fn, 0o666 & ~umask)
+        os.replace(tmp_fn, filename)
+    except OSError:
+        # Sometimes os mis-reports whether a directory is writable.
+        mylog.debug("Could not write %s", filename)
+        if tmp_fn is not None and os.path.exists(tmp_fn):
+            os.remove(tmp_fn)
+        return False
+    return True
+
+
+def save_npz_cache(filename, **arrays):
+    r"""Write *arrays* to the npz file *filename*, as a cache.
+
+    See :func:`write_file_atomically`.  Returns whether the cache was
+    written.
+    """
+    return write_file_atomically(
+        filename, lambda f: np.savez(f, **arrays), suffix=".npz"
+    )
+
+
 def validate_width_tuple(width):
     if not iterable(width) or len(width) != 2:
         raise YTInvalidWidthError(f"width ({width}) is not a two element tuple")
@@ -298,6 +298,10 @@ class CartesianCoordinateHandler(CoordinateHandler):
         buff = np.zeros((size[1], size[0]), dtype="f8")
         particle_datasets = (ParticleDataset, StreamParticlesDataset)
         is_sph_field = finfo.is_sph_field
+        if isinstance(data_source, YTParticleProj) and data_source._sum_only:
+            # Summed particles are deposited in the pixels of the projection,
+            # which are pixelized like the cells of a grid projection.
+            is_sph_field = False
 
         finfo = self.ds._get_field_info(field)
         if np.any(finfo.nodal_flag):
@@ -354,7 +358,27 @@ class CartesianCoordinateHandler(CoordinateHandler):
                 )
                 proj_reg.set_field_parameter("axis", data_source.axis)
                 buff = np.zeros(size, dtype="float64")
-                if weight is None:
+                if data_source.method == "mip":
+                    # Pixels keep the largest value of the particles covering
+                    # them, so weights do not apply.
+                    buff[:] = -np.inf
+                    for chunk in proj_reg.chunks([], "io"):
+                        data_source._initialize_projected_units([field], chunk)
+                        pixelize_sph_kernel_projection(
+                            buff,
+                            chunk[ptype, px_name].to("code_length"),
+                            chunk[ptype, py_name].to("code_length"),
+                            chunk[ptype, "smoothing_length"].to("code_length"),
+                            chunk[ptype, "mass"].to("code_mass"),
+                            chunk[ptype, "density"].to("code_density"),
+                            chunk[field].in_units(ounits),
+                            bnds,
+                            check_period=int(periodic),
+                            period=period,
+                            method="mip",
+                        )
+                    buff[np.isinf(buff)] = np.nan
+                elif weight is None:
                     for chunk in proj_reg.chunks([], "io"):
                         data_source._initialize_projected_units([field], chunk)
                         pixelize_sph_kernel_projection(
@@ -57,7 +57,13 @@ cdef class GridTree:
                   np.ndarray[np.int32_t, ndim=2] dimensions,
                   np.ndarray[np.int64_t, ndim=1] parent_ind,
                   np.ndarray[np.int64_t, ndim=1] level,
-                  np.ndarray[np.int64_t, ndim=1] num_children):
+                  np.ndarray[np.int64_t, ndim=1] num_children,
+                  np.ndarray[np.float64_t, ndim=2] dds = None,
+                  np.ndarray[np.int64_t, ndim=2] start_index = None):
+        # If they are supplied, dds and start_index are the cell widths and
+        # the integer positions of the grids' left edges at their own level,
+        # in the same form the grid objects use them.  Otherwise they are
+        # computed from the edges and dimensions.
 
         cdef int i, j, k
         cdef np.ndarray[np.int_t, ndim=1] child_ptr
@@ -77,7 +83,14 @@ cdef class GridTree:
                                             dimensions[i,:],
                                             num_children[i],
                                             level[i], i)
-            if level[i] == 0:
+            if dds is not None:
+                for j in range(3):
+                    self.grids[i].dds[j] = dds[i, j]
+            if start_index is not None:
+                for j in range(3):
+                    self.grids[i].start_index[j] = start_index[i, j]
+            # Any grid without a parent is a root, whatever its level.
+            if parent_ind[i] < 0:
                 self.num_root_grids += 1
             if num_children[i] == 0:
                 self.num_leaf_grids += 1
@@ -210,6 +223,19 @@ cdef class GridTree:
         self.visit_grids(&data,  grid_visitors.count_cells, selector)
         return size
 
+    def count_grids(self, SelectorObject selector):
+        """
+        Return an array with the number of cells of each grid (indexed like
+        the arrays the tree was built from) that ``selector`` selects.
+        """
+        cdef GridVisitorData data
+        self.setup_data(&data)
+        cdef np.ndarray[np.int64_t, ndim=1] counts
+        counts = np.zeros(self.num_grids, dtype="int64")
+        data.array = counts.data
+        self.visit_grids(&data, grid_visitors.count_cells_per_grid, selector)
+        return counts
+
     def select_icoords(self, SelectorObject selector, np.uint64_t size = -1):
         # Fill icoords with a selector
         cdef GridVisitorData data
@@ -103,6 +103,7 @@ class GridIndex(Index, abc.ABC):
         for g in self.grids:
             g.clear_data()
         self.io.queue.clear()
+        self.io.field_cache.clear()
 
     def get_smallest_dx(self):
         """
@@ -290,28 +291,37 @@ class GridIndex(Index, abc.ABC):
         ind = pts.find_points_in_tree()
         return self.grids[ind], ind
 
-    def _get_grid_tree(self):
-
-        left_edge = self.ds.arr(np.zeros((self.num_grids, 3)), "code_length")
-        right_edge = self.ds.arr(np.zeros((self.num_grids, 3)), "code_length")
-        level = np.zeros((self.num_grids), dtype="int64")
-        parent_ind = np.zeros((self.num_grids), dtype="int64")
-        num_children = np.zeros((self.num_grids), dtype="int64")
-        dimensions = np.zeros((self.num_grids, 3), dtype="int32")
-
-        for i, grid in enumerate(self.grids):
+    _grid_tree = None
+    _grid_tree_nested = False
+    # Frontends that read the parent of every grid into an array while
+    # parsing the index keep it here, as the position of each grid's parent
+    # in self.grids, or -1, so that the GridTree is built without going
+    # through every grid object.
+    _grid_parent_ind = None
 
-            left_edge[i, :] = grid.LeftEdge
-            right_edge[i, :] = grid.RightEdge
-            level[i] = grid.Level
-            if grid.Parent is None:
-                parent_ind[i] = -1
-            else:
-                parent_ind[i] = grid.Parent.id - grid.Parent._id_offset
-            num_children[i] = np.int64(len(grid.Children))
-            dimensions[i, :] = grid.ActiveDimensions
+    # Data objects whose selections are counted through the GridTree rather
+    # than grid by grid.  Their selectors pick cells in the tree's grid
+    # visitor exactly as their fill_mask does.
+    _fast_index_types = ("sphere", "region", "slice", "ortho_ray")
 
-        return GridTree(
+    def _get_grid_tree(self):
+        if self._grid_tree is not None:
+            return self._grid_tree
+        left_edge = np.ascontiguousarray(self.grid_left_edge.d, dtype="float64")
+        right_edge = np.ascontiguousarray(self.grid_right_edge.d, dtype="float64")
+        level = self.grid_levels.ravel().astype("int64")
+        dimensions = np.ascontiguousarray(self.grid_dimensions, dtype="int32")
+        parent_ind, multiple_parents = self._get_grid_parent_ind()
+        self._grid_tree_nested = not multiple_parents and self._grids_are_nested(
+            parent_ind, left_edge, right_edge, level
+        )
+        num_children = np.bincount(
+            parent_ind[parent_ind >= 0], minlength=self.num_grids
+        ).astype("int64")
+        dds = self._get_grid_dds(parent_ind)
+        dle = self.ds.domain_left_edge.to("code_length").d
+        start_index = np.rint((left_edge - dle) / dds).astype("int64")
+        self._grid_tree = GridTree(
             self.num_grids,
             left_edge,
             right_edge,
@@ -319,6 +329,82 @@ class GridIndex(Index, abc.ABC):
             parent_ind,
             level,
             num_children,
+            dds,
+            start_index,
+        )
+        return self._grid_tree
+
+    def _get_grid_parent_ind(self):
+        # The position of each grid's parent in self.grids, or -1, and whether
+        # any grid has more than one parent.
+        if self._grid_parent_ind is not None:
+            return np.asarray(self._grid_parent_ind, dtype="int64"), False
+        parent_ind = np.zeros(self.num_grids, dtype="int64")
+        multiple_parents = False
+        for i, grid in enumerate(self.grids):
+            parent = grid.Parent
+            # Some frontends give every grid a list of the grids it overlaps.
+            if isinstance(parent, list):
+                multiple_parents |= len(parent) > 1
+                parent = parent[0] if parent else None
+            if parent is None:
+                parent_ind[i] = -1
+            else:
+                parent_ind[i] = parent.id - parent._id_offset
+        return parent_ind, multiple_parents
+
+    @staticmethod
+    def _grids_are_nested(parent_ind, left_edge, right_edge, level):
+        # Whether every grid above the coarsest level has a parent one level
+        # coarser that it lies entirely inside of, which is what the GridTree
+        # needs for the selection of cells to be unambiguous.
+        if level.size == 0:
+            return True
+        has_parent = parent_ind >= 0
+        if not has_parent[level > level.min()].all():
+            return False
+        parent = parent_ind[has_parent]
+        if (level[parent] != level[has_parent] - 1).any():
+            return False
+        eps = 1e-8 * (right_edge[parent] - left_edge[parent])
+        return bool(
+            (left_edge[has_parent] >= left_edge[parent] - eps).all()
+            and (right_edge[has_parent] <= right_edge[parent] + eps).all()
+        )
+
+    def _get_grid_dds(self, parent_ind):
+        # The cell widths of every grid, computed the way
+        # AMRGridPatch._setup_dx does: from the edges for grids without a
+        # parent, and by dividing the parent's by refine_by otherwise.
+        # Indices whose grids compute dds differently should override this.
+        levels = self.grid_levels.ravel()
+        dds = (self.grid_right_edge.d - self.grid_left_edge.d) / self.grid_dimensions
+        for level in np.unique(levels):
+            children = (levels == level) & (parent_ind >= 0)
+            dds[children] = dds[parent_ind[children]] / self.ds.refine_by
+        if self.ds.dimensionality < 3:
+            dw = self.ds.domain_right_edge - self.ds.domain_left_edge
+            dds[:, 2] = dw.to("code_length").d[2]
+        return dds
+
+    def _use_fast_index(self, dobj):
+        from yt.data_objects.index_subobjects.grid_patch import AMRGridPatch
+
+        if dobj._type_name not in self._fast_index_types or self.num_grids == 0:
+            return False
+        # Grids of curvilinear datasets select their cells with corrections
+        # for the geometry that the tree does not apply.
+        if self.ds.geometry != "cartesian":
+            return False
+        self._get_grid_tree()
+        if not self._grid_tree_nested:
+            return False
+        # If the grids do not compute their cell widths the way
+        # _get_grid_dds does, the tree could select different cells.
+        grid_setup_dx = type(self.grids[0])._setup_dx
+        return (
+            grid_setup_dx is AMRGridPatch._setup_dx
+            or type(self)._get_grid_dds is not GridIndex._get_grid_dds
         )
 
     def convert(self, unit):
@@ -341,9 +427,6 @@ class GridIndex(Index, abc.ABC):
             dobj._chunk_info = np.empty(len(grids), dtype="object")
             for i, g in enumerate(grids):
                 dobj._chunk_info[i] = g
-        # These next two lines, when uncommented, turn "on" the fast index.
-        # if dobj._type_name != "grid":
-        #    fast_index = self._get_grid_tree()
         if getattr(dobj, "size", None) is None:
             dobj.size = self._count_selection(dobj, fast_index=fast_index)
         if getattr(dobj, "shape", None) is None:
@@ -357,9 +440,30 @@ class GridIndex(Index, abc.ABC):
             return fast_index.count(dobj.selector)
         if grids is None:
             grids = dobj._chunk_info
+        counts = self._get_selection_counts(dobj)
+        if counts is not None:
+            ind = np.fromiter(
+                (g.id - g._id_offset for g in grids), dtype="int64", count=len(grids)
+            )
+            return int(counts[ind].sum())
         count = sum((g.count(dobj.selector) for g in grids))
         return count
 
+    def _get_selection_counts(self, dobj):
+        # The number of cells dobj selects in every grid, from a single pass
+        # over the GridTree, or None if the tree cannot be used for dobj.
+        if not self._use_fast_index(dobj):
+            return None
+        tree = self._get_grid_tree()
+        selector_id = hash(dobj.selector)
+        cached = getattr(dobj, "_grid_selection_counts", None)
+        # The data object may be moved to another dataset with _ds_hold, so
+        # the counts are only reused for the same tree and selector.
+        if cached is None or cached[0] is not tree or cached[1] != selector_id:
+            counts = tree.count_grids(dobj.selector)
+            cached = dobj._grid_selection_counts = (tree, selector_id, counts)
+        return cached[2]
+
     def _chunk_all(self, dobj, cache=True, fast_index=None):
         gobjs = getattr(dobj._current_chunk, "objs", dobj._chunk_info)
         fast_index = fast_index or getattr(dobj._current_chunk, "_fast_index", None)
@@ -70,6 +70,7 @@ ctypedef void grid_visitor_function(GridVisitorData *data,
 # covered by child cells.
 
 cdef grid_visitor_function count_cells
+cdef grid_visitor_function count_cells_per_grid
 cdef grid_visitor_function mask_cells
 cdef grid_visitor_function icoords_cells
 cdef grid_visitor_function ires_cells
@@ -11,10 +11,11 @@ Grid visitor functions
 
 cimport cython
 cimport numpy as np
+from libc.math cimport rint
 from libc.stdlib cimport free, malloc
 
 from yt.utilities.lib.bitarray cimport ba_get_value, ba_set_value
-from yt.utilities.lib.fp_utils cimport iclip
+from yt.utilities.lib.fp_utils cimport i64clip, iclip
 
 
 cdef void free_tuples(GridVisitorData *data) nogil:
@@ -28,6 +29,14 @@ cdef void free_tuples(GridVisitorData *data) nogil:
     data.child_tuples = NULL
     data.n_tuples = 0
 
+@cython.cdivision(True)
+cdef inline np.int64_t _floordiv(np.int64_t a, np.int64_t b) nogil:
+    # Python-style floor division, as C truncates towards zero
+    cdef np.int64_t q = a / b
+    if (a % b != 0) and ((a < 0) != (b < 0)):
+        q -= 1
+    return q
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.cdivision(True)
@@ -38,7 +47,7 @@ cdef void setup_tuples(GridVisitorData *data) nogil:
     # memory-wise, but it is easier to keep and save when going through
     # multiple grids and selectors.
     cdef int i, j
-    cdef np.int64_t si, ei
+    cdef np.int64_t si, ei, rf
     cdef GridTreeNode *g
     cdef GridTreeNode *c
     free_tuples(data)
@@ -47,12 +56,20 @@ cdef void setup_tuples(GridVisitorData *data) nogil:
     for i in range(g.num_children):
         c = g.children[i]
         data.child_tuples[i] = <int *>malloc(sizeof(int) * 6)
-        # Now we fill them in
+        # Now we fill them in.  The refinement factor is worked out per axis
+        # from the cell widths, so that unrefined axes of 1D and 2D datasets
+        # and refinement factors other than two are handled; the bounds follow
+        # the same rounding as AMRGridPatch._fill_child_mask.
         for j in range(3):
-            si = (c.start_index[j] / data.ref_factor) - g.start_index[j]
-            ei = si + c.dims[j]/data.ref_factor - 1
-            data.child_tuples[i][j*2+0] = iclip(si, 0, g.dims[j] - 1)
-            data.child_tuples[i][j*2+1] = iclip(ei, 0, g.dims[j] - 1)
+            rf = <np.int64_t> rint(g.dds[j] / c.dds[j])
+            if rf < 1: rf = 1
+            si = _floordiv(c.start_index[j], rf) - g.start_index[j]
+            ei = _floordiv(c.start_index[j] + c.dims[j], rf) - g.start_index[j]
+            si = i64clip(si, 0, g.dims[j])
+            ei = i64clip(ei, 0, g.dims[j])
+            if ei == si: ei += 1
+            data.child_tuples[i][j*2+0] = si
+            data.child_tuples[i][j*2+1] = ei - 1
     data.n_tuples = g.num_children
 
 @cython.boundscheck(False)
@@ -86,6 +103,15 @@ cdef void count_cells(GridVisitorData *data, np.uint8_t selected) nogil:
     cdef np.uint64_t *count = <np.uint64_t*> data.array
     count[0] += 1
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void count_cells_per_grid(GridVisitorData *data, np.uint8_t selected) nogil:
+    # Increment the count of whichever grid we are in, if we've selected it.
+    if selected == 0: return
+    cdef np.int64_t *counts = <np.int64_t*> data.array
+    counts[data.grid.index] += 1
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.cdivision(True)
@@ -1,24 +1,219 @@
 import collections
 import errno
+import multiprocessing
 import os
 import struct
+import traceback
 import weakref
 
 import numpy as np
 
+from yt.config import ytcfg
 from yt.data_objects.index_subobjects.particle_container import ParticleContainer
-from yt.funcs import get_pbar, only_on_root
+from yt.funcs import DummyProgressBar, get_pbar, only_on_root, save_npz_cache
 from yt.geometry.geometry_handler import Index, YTDataChunk
 from yt.geometry.particle_oct_container import ParticleBitmap
+from yt.utilities.lib.ewah_bool_wrap import BoolArrayCollection
 from yt.utilities.lib.fnv_hash import fnv_hash
 from yt.utilities.logger import ytLogger as mylog
 
 CHUNKSIZE = 64 ** 3
+_BLOCK_INDEX_VERSION = 1
+
+
+def _particle_blocks(pos, hsml, block_size):
+    """Return the bounding boxes of consecutive blocks of *block_size*
+    particles, grown by the smoothing lengths *hsml* if they are given."""
+    if pos.shape[0] == 0:
+        return np.empty((0, 3)), np.empty((0, 3))
+    starts = np.arange(0, pos.shape[0], block_size)
+    if hsml is None:
+        left = right = pos
+    else:
+        left = pos - hsml[:, None]
+        right = pos + hsml[:, None]
+    left = np.minimum.reduceat(left, starts, axis=0).astype("float64")
+    right = np.maximum.reduceat(right, starts, axis=0).astype("float64")
+    # Grow the boxes so that particles on their faces are not missed.
+    return np.nextafter(left, -np.inf), np.nextafter(right, np.inf)
+
+
+class _DataFileIndexer:
+    """Compute the bitmap index of some of the data files of a particle index.
+
+    The coordinates read for the coarse index are kept in memory, up to
+    *max_bytes* of them, and used again for the refined index so that most
+    files are only read once.
+    """
+
+    def __init__(self, index, file_ids, max_bytes, block_size=0, progress=True):
+        ds = index.ds
+        self.index = index
+        self.file_ids = list(file_ids)
+        self.max_bytes = max_bytes
+        self.block_size = block_size
+        self.progress = progress
+        self._coordinates = {}
+        self.bitmap = ParticleBitmap(
+            ds.domain_left_edge,
+            ds.domain_right_edge,
+            ds.periodicity,
+            ds._file_hash,
+            1,
+            index_order1=index.regions.index_order1,
+            index_order2=index.regions.index_order2,
+        )
+
+    def _get_pbar(self, title):
+        if not self.progress:
+            return DummyProgressBar()
+        return get_pbar(title, len(self.file_ids))
+
+    def coarse(self):
+        """Return the coarse cells touched by each data file, the number of
+        particles in every coarse cell and, if a block size is set, the
+        bounding boxes of the blocks of particles of each data file."""
+        cells = {}
+        blocks = {}
+        mask = self.bitmap.masks
+        nbytes = 0
+        pb = self._get_pbar("Initializing coarse index ")
+        for i, file_id in enumerate(self.file_ids):
+            pb.update(i)
+            mask[:] = 0
+            coords = list(
+                self.index._yield_index_coordinates(self.index.data_files[file_id])
+            )
+            for _, pos, hsml in coords:
+                self.bitmap._coarse_index_data_file(pos, hsml, 0)
+            cells[file_id] = np.flatnonzero(mask[:, 0])
+            if self.block_size > 0:
+                blocks[file_id] = {
+                    ptype: _particle_blocks(pos, hsml, self.block_size)
+                    for ptype, pos, hsml in coords
+                }
+            size = sum(
+                pos.nbytes + getattr(hsml, "nbytes", 0) for _, pos, hsml in coords
+            )
+            if nbytes + size <= self.max_bytes:
+                self._coordinates[file_id] = coords
+                nbytes += size
+        pb.finish()
+        return [(cells, self.bitmap.particle_counts, blocks)]
+
+    def refined(self, mask, particle_counts, count_threshold, mask_threshold):
+        """Return the serialized refined bitmask of each data file."""
+        self.bitmap.particle_counts = particle_counts
+        sub_mi = np.zeros(0, "uint64")
+        bitmasks = {}
+        pb = self._get_pbar("Initializing refined index")
+        for i, file_id in enumerate(self.file_ids):
+            pb.update(i)
+            coords = self._coordinates.pop(file_id, None)
+            if coords is None:
+                data_file = self.index.data_files[file_id]
+                coords = self.index._yield_index_coordinates(data_file)
+            coll = None
+            for _, pos, hsml in coords:
+                if pos.size == 0:
+                    continue
+                _, coll = self.bitmap._refined_index_data_file(
+                    coll,
+                    pos,
+                    hsml,
+                    mask,
+                    sub_mi,
+                    sub_mi,
+                    0,
+                    0,
+                    count_threshold=count_threshold,
+                    mask_threshold=mask_threshold,
+                )
+            if coll is not None:
+                bitmasks[file_id] = coll.dumps()
+        pb.finish()
+        return [bitmasks]
+
+    def close(self):
+        self._coordinates.clear()
+
+
+def _run_data_file_indexer(indexer, conn):
+    # This runs in a forked process, which inherits the dataset and its index.
+    try:
+        conn.send(indexer.coarse())
+        conn.send(indexer.refined(*conn.recv()))
+    except Exception:
+        conn.send(RuntimeError(traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+class _ForkedDataFileIndexers:
+    """Run a :class:`_DataFileIndexer` in each of *nprocs* forked processes.
+
+    Each process keeps its share of the data files, and the coordinates it
+    read, from the coarse pass to the refined pass.
+    """
+
+    def __init__(self, index, file_ids, nprocs, max_bytes, block_size=0):
+        context = multiprocessing.get_context("fork")
+        self.connections = []
+        self.processes = []
+        for i in range(nprocs):
+            indexer = _DataFileIndexer(
+                index,
+                file_ids[i::nprocs],
+                max_bytes // nprocs,
+                block_size=block_size,
+                progress=False,
+            )
+            conn, child_conn = context.Pipe()
+            proc = context.Process(
+                target=_run_data_file_indexer, args=(indexer, child_conn), daemon=True
+            )
+            proc.start()
+            child_conn.close()
+            self.connections.append(conn)
+            self.processes.append(proc)
+
+    def _receive(self):
+        results = []
+        for conn in self.connections:
+            result = conn.recv()
+            if isinstance(result, Exception):
+                raise result
+            results.extend(result)
+        return results
+
+    def coarse(self):
+        return self._receive()
+
+    def refined(self, *args):
+        for conn in self.connections:
+            conn.send(args)
+        return self._receive()
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+        for proc in self.processes:
+            proc.join(timeout=1)
+            if proc.is_alive():
+                proc.terminate()
 
 
 class ParticleIndex(Index):
     """The Index subclass for particle datasets"""
 
+    # How many bytes of particle coordinates may be kept in memory between
+    # the coarse and refined passes over the data files when building the
+    # bitmap index.
+    _index_coordinate_buffer = 1024 ** 3
+    # The bounding boxes of blocks of particles within each data file, used
+    # to only read the parts of a file a selector may touch.
+    _particle_blocks = None
+
     def __init__(self, ds, dataset_type):
         self.dataset_type = dataset_type
         self.dataset = weakref.proxy(ds)
@@ -144,6 +339,9 @@ class ParticleIndex(Index):
         if not hasattr(self.ds, "_file_hash"):
             self.ds._file_hash = self._generate_hash()
 
+        self._index_block_size = ytcfg.getint("yt", "particle_index_block_size")
+        self._particle_blocks = None
+
         self.regions = ParticleBitmap(
             ds.domain_left_edge,
             ds.domain_right_edge,
@@ -173,10 +371,15 @@ class ParticleIndex(Index):
                 raise OSError
         except (OSError, struct.error):
             self.regions.reset_bitmasks()
-            self._initialize_coarse_index()
-            self._initialize_refined_index()
+            indexers = self._get_data_file_indexers()
+            try:
+                self._initialize_coarse_index(indexers)
+                self._initialize_refined_index(indexers)
+            finally:
+                indexers.close()
             wdir = os.path.dirname(fname)
-            if not dont_cache and os.access(wdir, os.W_OK):
+            # Every MPI rank holds the whole index, so only the root writes it.
+            if not dont_cache and self.comm.rank == 0 and os.access(wdir, os.W_OK):
                 # Sometimes os mis-reports whether a directory is writable,
                 # So pass if writing the bitmask file fails.
                 try:
@@ -185,29 +388,60 @@ class ParticleIndex(Index):
                     pass
             rflag = self.regions.check_bitmasks()
 
-    def _initialize_coarse_index(self):
-        pb = get_pbar("Initializing coarse index ", len(self.data_files))
-        for i, data_file in enumerate(self.data_files):
-            pb.update(i)
-            for ptype, pos in self.io._yield_coordinates(data_file):
-                ds = self.ds
-                if hasattr(ds, "_sph_ptypes") and ptype == ds._sph_ptypes[0]:
-                    hsml = self.io._get_smoothing_length(
-                        data_file, pos.dtype, pos.shape
-                    )
-                else:
-                    hsml = None
-                self.regions._coarse_index_data_file(pos, hsml, data_file.file_id)
-            self.regions._set_coarse_index_data_file(data_file.file_id)
-        pb.finish()
+        if self._index_block_size > 0:
+            self._initialize_particle_blocks(fname, dont_cache)
+
+    def _yield_index_coordinates(self, data_file):
+        ds = self.ds
+        for ptype, pos in self.io._yield_coordinates(data_file):
+            if hasattr(ds, "_sph_ptypes") and ptype == ds._sph_ptypes[0]:
+                hsml = self.io._get_smoothing_length(data_file, pos.dtype, pos.shape)
+            else:
+                hsml = None
+            yield ptype, pos, hsml
+
+    def _get_data_file_indexers(self):
+        # MPI ranks each take a share of the data files, which they may split
+        # again between forked processes.
+        file_ids = list(range(self.comm.rank, len(self.data_files), self.comm.size))
+        nprocs = min(ytcfg.getint("yt", "particle_index_nprocs"), len(file_ids))
+        if nprocs > 1 and "fork" in multiprocessing.get_all_start_methods():
+            mylog.info(
+                "Indexing %s data files with %s processes", len(file_ids), nprocs
+            )
+            return _ForkedDataFileIndexers(
+                self,
+                file_ids,
+                nprocs,
+                self._index_coordinate_buffer,
+                block_size=self._index_block_size,
+            )
+        return _DataFileIndexer(
+            self,
+            file_ids,
+            self._index_coordinate_buffer,
+            block_size=self._index_block_size,
+            progress=self.comm.size == 1,
+        )
+
+    def _initialize_coarse_index(self, indexers):
+        results = self.comm.par_combine_object(
+            indexers.coarse(), "cat", datatype="list"
+        )
+        file_blocks = {}
+        for cells, particle_counts, blocks in results:
+            self.regions.particle_counts += particle_counts
+            for file_id, file_cells in cells.items():
+                self.regions.masks[file_cells, file_id] = 1
+            file_blocks.update(blocks)
+        if self._index_block_size > 0:
+            self._set_particle_blocks(file_blocks)
+        for file_id in range(len(self.data_files)):
+            self.regions._set_coarse_index_data_file(file_id)
         self.regions.find_collisions_coarse()
 
-    def _initialize_refined_index(self):
+    def _initialize_refined_index(self, indexers):
         mask = self.regions.masks.sum(axis=1).astype("uint8")
-        max_npart = max(sum(d.total_particles.values()) for d in self.data_files) * 28
-        sub_mi1 = np.zeros(max_npart, "uint64")
-        sub_mi2 = np.zeros(max_npart, "uint64")
-        pb = get_pbar("Initializing refined index", len(self.data_files))
         mask_threshold = getattr(self, "_index_mask_threshold", 2)
         count_threshold = getattr(self, "_index_count_threshold", 256)
         mylog.debug(
@@ -215,7 +449,6 @@ class ParticleIndex(Index):
             mask_threshold,
             count_threshold,
         )
-        total_refined = 0
         total_coarse_refined = (
             (mask >= 2) & (self.regions.particle_counts > count_threshold)
         ).sum()
@@ -224,36 +457,120 @@ class ParticleIndex(Index):
             total_coarse_refined,
             100 * total_coarse_refined / mask.size,
         )
-        for i, data_file in enumerate(self.data_files):
-            coll = None
-            pb.update(i)
-            nsub_mi = 0
-            for ptype, pos in self.io._yield_coordinates(data_file):
-                if pos.size == 0:
-                    continue
-                if hasattr(self.ds, "_sph_ptypes") and ptype == self.ds._sph_ptypes[0]:
-                    hsml = self.io._get_smoothing_length(
-                        data_file, pos.dtype, pos.shape
-                    )
-                else:
-                    hsml = None
-                nsub_mi, coll = self.regions._refined_index_data_file(
-                    coll,
-                    pos,
-                    hsml,
-                    mask,
-                    sub_mi1,
-                    sub_mi2,
-                    data_file.file_id,
-                    nsub_mi,
-                    count_threshold=count_threshold,
-                    mask_threshold=mask_threshold,
-                )
-                total_refined += nsub_mi
-            self.regions.bitmasks.append(data_file.file_id, coll)
-        pb.finish()
+        results = indexers.refined(
+            mask, self.regions.particle_counts, count_threshold, mask_threshold
+        )
+        results = self.comm.par_combine_object(results, "cat", datatype="list")
+        for bitmasks in results:
+            for file_id, serialized in bitmasks.items():
+                coll = BoolArrayCollection()
+                coll.loads(serialized)
+                self.regions.bitmasks.append(file_id, coll)
         self.regions.find_collisions_refined()
 
+    def _particle_blocks_filename(self, fname):
+        return os.path.splitext(fname)[0] + ".blocks.npz"
+
+    def _particle_blocks_header(self):
+        return np.array(
+            [
+                _BLOCK_INDEX_VERSION,
+                self.ds._file_hash,
+                len(self.data_files),
+                self._index_block_size,
+            ],
+            dtype="int64",
+        )
+
+    def _initialize_particle_blocks(self, fname, dont_cache):
+        blocks_fn = self._particle_blocks_filename(fname)
+        if self._particle_blocks is None:
+            if not dont_cache and self._load_particle_blocks(blocks_fn):
+                return
+            file_blocks = {}
+            for data_file in self.data_files:
+                file_blocks[data_file.file_id] = {
+                    ptype: _particle_blocks(pos, hsml, self._index_block_size)
+                    for ptype, pos, hsml in self._yield_index_coordinates(data_file)
+                }
+            self._set_particle_blocks(file_blocks)
+        if not dont_cache and self.comm.rank == 0:
+            self._save_particle_blocks(blocks_fn)
+
+    def _set_particle_blocks(self, file_blocks):
+        # Concatenate the blocks of each particle type over all data files.
+        nfiles = len(self.data_files)
+        ptypes = sorted(set(ptype for b in file_blocks.values() for ptype in b))
+        self._particle_blocks = {}
+        empty = (np.empty((0, 3)), np.empty((0, 3)))
+        for ptype in ptypes:
+            boxes = [file_blocks.get(i, {}).get(ptype, empty) for i in range(nfiles)]
+            counts = [left.shape[0] for left, _ in boxes]
+            self._particle_blocks[ptype] = (
+                np.concatenate([[0], np.cumsum(counts)]).astype("int64"),
+                np.concatenate([left for left, _ in boxes]),
+                np.concatenate([right for _, right in boxes]),
+            )
+
+    def _load_particle_blocks(self, fn):
+        if not os.path.exists(fn):
+            return False
+        try:
+            with np.load(fn) as data:
+                if not np.array_equal(data["header"], self._particle_blocks_header()):
+                    return False
+                self._particle_blocks = {
+                    str(ptype): (
+                        data[f"{ptype}_offsets"],
+                        data[f"{ptype}_left"],
+                        data[f"{ptype}_right"],
+                    )
+                    for ptype in data["ptypes"]
+                }
+        except (OSError, KeyError, ValueError):
+            mylog.debug("Could not read the particle block index %s", fn)
+            return False
+        return True
+
+    def _save_particle_blocks(self, fn):
+        data = {
+            "header": self._particle_blocks_header(),
+            "ptypes": np.array(sorted(self._particle_blocks), dtype="str"),
+        }
+        for ptype, (offsets, left, right) in self._particle_blocks.items():
+            data[f"{ptype}_offsets"] = offsets
+            data[f"{ptype}_left"] = left
+            data[f"{ptype}_right"] = right
+        save_npz_cache(fn, **data)
+
+    def _get_particle_ranges(self, data_file, ptype, selector):
+        """Return the ranges of particles of *ptype* in *data_file* that
+        *selector* may select.
+
+        The ranges are a list of ``(start, end)`` offsets from the first
+        particle of the data file.  ``None`` is returned when the block index
+        is disabled or the selector cannot test bounding boxes, in which case
+        every particle of the data file must be read.
+        """
+        if self._particle_blocks is None or ptype not in self._particle_blocks:
+            return None
+        if getattr(selector, "is_all_data", False):
+            return None
+        offsets, left, right = self._particle_blocks[ptype]
+        b0, b1 = offsets[data_file.file_id], offsets[data_file.file_id + 1]
+        try:
+            selected = selector.select_grids(
+                left[b0:b1], right[b0:b1], np.zeros((b1 - b0, 1), dtype="int32")
+            )
+        except RuntimeError:
+            return None
+        # Merge runs of consecutive selected blocks into single ranges.
+        edges = np.diff(np.concatenate([[0], selected.astype("int8"), [0]]))
+        starts = np.flatnonzero(edges == 1) * self._index_block_size
+        ends = np.flatnonzero(edges == -1) * self._index_block_size
+        np.minimum(ends, data_file.total_particles[ptype], out=ends)
+        return list(zip(starts.tolist(), ends.tolist()))
+
     def _detect_output_fields(self):
         # TODO: Add additional fields
         dsl = []
@@ -438,32 +438,51 @@ cdef class SelectorObject:
         cdef np.float64_t re[3]
         cdef np.ndarray[np.int64_t, ndim=2] indices
         cdef np.ndarray[np.float64_t, ndim=2] coords
+        cdef np.ndarray[np.float64_t, ndim=2] block_le
+        cdef np.ndarray[np.float64_t, ndim=2] block_re
         cdef np.ndarray[np.uint8_t, ndim=1] mask
-        cdef int i, j, k, selected
+        cdef int i, j, k, b, selected
         cdef int npoints, nv = mesh._connectivity_length
         cdef int ndim = mesh.connectivity_coords.shape[1]
+        cdef int block_size = mesh._element_block_size
         cdef int total = 0
         cdef int offset = mesh._index_offset
         coords = _ensure_code(mesh.connectivity_coords)
         indices = mesh.connectivity_indices
         npoints = indices.shape[0]
         mask = np.zeros(npoints, dtype='uint8')
-        for i in range(npoints):
-            selected = 0
-            for k in range(3):
-                le[k] = 1e60
-                re[k] = -1e60
-            for j in range(nv):
-                for k in range(ndim):
-                    pos = coords[indices[i, j] - offset, k]
-                    le[k] = fmin(pos, le[k])
-                    re[k] = fmax(pos, re[k])
-                for k in range(2, ndim - 1, -1):
-                    le[k] = self.domain_center[k]
-                    re[k] = self.domain_center[k]
-            selected = self.select_bbox(le, re)
-            total += selected
-            mask[i] = selected
+        # The elements are only tested within the runs of elements, and the
+        # runs within the mesh, whose bounding boxes the selector touches.
+        block_le, block_re = mesh.element_block_bounds
+        if block_le.shape[0] == 0: return None
+        for k in range(ndim):
+            le[k] = block_le[:, k].min()
+            re[k] = block_re[:, k].max()
+        for k in range(2, ndim - 1, -1):
+            le[k] = self.domain_center[k]
+            re[k] = self.domain_center[k]
+        if self.select_bbox(le, re) == 0: return None
+        for b in range(block_le.shape[0]):
+            for k in range(ndim):
+                le[k] = block_le[b, k]
+                re[k] = block_re[b, k]
+            if self.select_bbox(le, re) == 0: continue
+            for i in range(b * block_size, min((b + 1) * block_size, npoints)):
+                selected = 0
+                for k in range(3):
+                    le[k] = 1e60
+                    re[k] = -1e60
+                for j in range(nv):
+                    for k in range(ndim):
+                        pos = coords[indices[i, j] - offset, k]
+                        le[k] = fmin(pos, le[k])
+                        re[k] = fmax(pos, re[k])
+                    for k in range(2, ndim - 1, -1):
+                        le[k] = self.domain_center[k]
+                        re[k] = self.domain_center[k]
+                selected = self.select_bbox(le, re)
+                total += selected
+                mask[i] = selected
         if total == 0: return None
         return mask.astype("bool")
 
@@ -557,7 +576,7 @@ cdef class SelectorObject:
         for i in range(3):
             left_edge[i] = data.grid.left_edge[i]
             right_edge[i] = data.grid.right_edge[i]
-            dds[i] = (right_edge[i] - left_edge[i])/data.grid.dims[i]
+            dds[i] = data.grid.dds[i]
             dim[i] = data.grid.dims[i]
         with nogil:
             pos[0] = left_edge[0] + dds[0] * 0.5
@@ -1475,6 +1494,51 @@ cdef class CuttingPlaneSelector(SelectorObject):
 
 cutting_selector = CuttingPlaneSelector
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void visit_grid_cell_range(SelectorObject selector,
+                                GridVisitorData *data,
+                                grid_visitor_function *func,
+                                np.uint8_t *cached_mask,
+                                int ind[6]):
+    # Visit every cell of a grid, selecting the ones inside the index ranges
+    # ind[2*d] <= i < ind[2*d+1] that are not covered by a child grid.  This
+    # is the grid visitor counterpart of the fill_mask implementations that
+    # pick cells by index rather than by calling select_cell.
+    cdef int i, j, k
+    cdef int this_level = 0
+    cdef int dim[3]
+    cdef np.uint8_t selected
+    cdef int level = data.grid.level
+    if level < selector.min_level or level > selector.max_level:
+        return
+    if level == selector.max_level:
+        this_level = 1
+    for i in range(3):
+        dim[i] = data.grid.dims[i]
+    with nogil:
+        data.pos[0] = 0
+        for i in range(dim[0]):
+            data.pos[1] = 0
+            for j in range(dim[1]):
+                data.pos[2] = 0
+                for k in range(dim[2]):
+                    if cached_mask != NULL:
+                        selected = ba_get_value(cached_mask, data.global_index)
+                    elif ind[0] <= i < ind[1] and ind[2] <= j < ind[3] \
+                            and ind[4] <= k < ind[5]:
+                        if this_level == 1 or check_child_masked(data) == 0:
+                            selected = 1
+                        else:
+                            selected = 0
+                    else:
+                        selected = 0
+                    func(data, selected)
+                    data.global_index += 1
+                    data.pos[2] += 1
+                data.pos[1] += 1
+            data.pos[0] += 1
+
 cdef class SliceSelector(SelectorObject):
     cdef int axis
     cdef np.float64_t coord
@@ -1540,6 +1604,26 @@ cdef class SliceSelector(SelectorObject):
             if total == 0: return None
             return mask.astype("bool")
 
+    @cython.cdivision(True)
+    cdef void visit_grid_cells(self, GridVisitorData *data,
+                              grid_visitor_function *func,
+                              np.uint8_t *cached_mask = NULL):
+        # fill_mask picks the layer of cells by index, which can differ from
+        # select_cell when the slice lies on a cell face, so we do the same.
+        cdef int ind[6]
+        cdef int i
+        cdef np.int64_t icoord
+        for i in range(3):
+            if i == self.axis:
+                icoord = <np.int64_t>(
+                    (self.coord - data.grid.left_edge[i])/data.grid.dds[i])
+                ind[2*i] = iclip(icoord, 0, data.grid.dims[i] - 1)
+                ind[2*i+1] = ind[2*i] + 1
+            else:
+                ind[2*i] = 0
+                ind[2*i+1] = data.grid.dims[i]
+        visit_grid_cell_range(self, data, func, cached_mask, ind)
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.cdivision(True)
@@ -1653,6 +1737,22 @@ cdef class OrthoRaySelector(SelectorObject):
             if total == 0: return None
             return mask.astype("bool")
 
+    @cython.cdivision(True)
+    cdef void visit_grid_cells(self, GridVisitorData *data,
+                              grid_visitor_function *func,
+                              np.uint8_t *cached_mask = NULL):
+        # As with fill_mask, the column of cells is picked by index.
+        cdef int ind[6]
+        ind[2*self.axis] = 0
+        ind[2*self.axis+1] = data.grid.dims[self.axis]
+        ind[2*self.px_ax] = <int> ((self.px - data.grid.left_edge[self.px_ax]) /
+                                   data.grid.dds[self.px_ax])
+        ind[2*self.px_ax+1] = ind[2*self.px_ax] + 1
+        ind[2*self.py_ax] = <int> ((self.py - data.grid.left_edge[self.py_ax]) /
+                                   data.grid.dds[self.py_ax])
+        ind[2*self.py_ax+1] = ind[2*self.py_ax] + 1
+        visit_grid_cell_range(self, data, func, cached_mask, ind)
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.cdivision(True)
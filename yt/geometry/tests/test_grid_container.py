@@ -136,6 +136,20 @@ def test_find_points():
     assert_raises(ValueError, test_ds.index._find_points, [0], 1.0, [2, 3])
 
 
+def test_grid_parent_ind():
+    """The parents read by the frontend are those of the grids"""
+    test_ds = setup_test_ds()
+    index = test_ds.index
+    assert index._grid_parent_ind is not None
+    parent_ind, multiple_parents = index._get_grid_parent_ind()
+    expected = [
+        -1 if grid.Parent is None else grid.Parent.id - grid.Parent._id_offset
+        for grid in index.grids
+    ]
+    assert_equal(parent_ind, expected)
+    assert not multiple_parents
+
+
 def test_grid_arrays_view():
     ds = setup_test_ds()
     tree = ds.index._get_grid_tree()
@@ -144,3 +158,121 @@ def test_grid_arrays_view():
     assert_equal(grid_arr["right_edge"], ds.index.grid_right_edge)
     assert_equal(grid_arr["dims"], ds.index.grid_dimensions)
     assert_equal(grid_arr["level"], ds.index.grid_levels[:, 0])
+
+
+def test_grid_tree_counts():
+    """The GridTree must select the same cells as the grids themselves"""
+    from yt.testing import fake_amr_ds
+
+    grid_data_2d = [
+        dict(
+            left_edge=[0.0, 0.0, 0.0],
+            right_edge=[1.0, 1.0, 1.0],
+            level=0,
+            dimensions=[16, 16, 1],
+        ),
+        dict(
+            left_edge=[0.25, 0.5, 0.0],
+            right_edge=[0.5, 0.75, 1.0],
+            level=1,
+            dimensions=[8, 8, 1],
+        ),
+    ]
+    for grid in grid_data_2d:
+        grid["density"] = (np.ones(grid["dimensions"]), "g/cm**3")
+    ds_2d = load_amr_grids(grid_data_2d, [16, 16, 1])
+
+    for ds in [setup_test_ds(), fake_amr_ds(), ds_2d]:
+        index = ds.index
+        assert index._use_fast_index(ds.all_data())
+        tree = index._get_grid_tree()
+        c = ds.domain_center + ds.arr(1e-3 * ds.domain_width.d, "code_length")
+        dobjs = [
+            ds.sphere(c, 0.2 * ds.domain_width[0]),
+            ds.region(c, c - 0.3 * ds.domain_width, c + 0.2 * ds.domain_width),
+            ds.slice(0, c[0]),
+            ds.slice(2, c[2]),
+            ds.ortho_ray(1, (c[0], c[2])),
+        ]
+        for dobj in dobjs:
+            counts = tree.count_grids(dobj.selector)
+            gi = dobj.selector.select_grids(
+                index.grid_left_edge, index.grid_right_edge, index.grid_levels
+            )
+            expected = np.zeros(index.num_grids, dtype="int64")
+            expected[gi] = [g.count(dobj.selector) for g in index.grids[gi]]
+            assert_equal(counts, expected)
+            assert_equal(dobj["index", "ones"].size, counts.sum())
+
+
+def test_grid_tree_counts_curvilinear():
+    """Curvilinear datasets count their selections grid by grid"""
+    from yt.testing import fake_amr_ds
+
+    for geometry in ["spherical", "cylindrical"]:
+        ds = fake_amr_ds(geometry=geometry)
+        index = ds.index
+        assert not index._use_fast_index(ds.all_data())
+        for grid in index.grids:
+            # The region grid ghost zones are filled from.
+            left_edge = grid.LeftEdge - grid.dds
+            right_edge = grid.RightEdge + grid.dds
+            dobj = ds.region((left_edge + right_edge) / 2, left_edge, right_edge)
+            dobj.index._identify_base_chunk(dobj)
+            expected = sum(g.count(dobj.selector) for g in dobj._chunk_info)
+            assert_equal(dobj.size, expected)
+
+
+def test_grid_tree_multiple_parents():
+    """The GridTree follows the grids' own parents when a grid has several"""
+    grid_data = [
+        dict(
+            left_edge=[0.0, 0.0, 0.0],
+            right_edge=[1.0, 1.0, 1.0],
+            level=0,
+            dimensions=[8, 8, 8],
+        ),
+        dict(
+            left_edge=[0.0, 0.0, 0.0],
+            right_edge=[0.5, 1.0, 1.0],
+            level=1,
+            dimensions=[8, 16, 16],
+        ),
+        dict(
+            left_edge=[0.5, 0.0, 0.0],
+            right_edge=[1.0, 1.0, 1.0],
+            level=1,
+            dimensions=[8, 16, 16],
+        ),
+        # This grid lies over both of the grids above.
+        dict(
+            left_edge=[0.375, 0.25, 0.25],
+            right_edge=[0.625, 0.75, 0.75],
+            level=2,
+            dimensions=[8, 16, 16],
+        ),
+    ]
+    for grid in grid_data:
+        grid["density"] = (np.ones(grid["dimensions"]), "g/cm**3")
+    ds = load_amr_grids(grid_data, [8, 8, 8])
+    index = ds.index
+    indices, levels, nchild, children = index._get_grid_tree().return_tree_info()
+    for i, grid in enumerate(index.grids):
+        tree_children = [g for g in index.grids if g.Parent is grid]
+        assert_equal(nchild[i], len(tree_children))
+        if tree_children:
+            assert_equal(children[i], [g.id - g._id_offset for g in tree_children])
+    # The finest grid is found where it lies over its parent.
+    child = index.grids[3]
+    parent = child.Parent
+    left_edge = np.maximum(child.LeftEdge, parent.LeftEdge).d
+    right_edge = np.minimum(child.RightEdge, parent.RightEdge).d
+    x, y, z = (left_edge + right_edge) / 2
+    _, ind = index._find_points([x], [y], [z])
+    assert_equal(ind, [3])
+    # Such a hierarchy is not nested, so selections go grid by grid.
+    assert not index._use_fast_index(ds.all_data())
+    sp = ds.sphere([0.5, 0.5, 0.5], 0.3)
+    assert_equal(
+        sp["index", "ones"].size, sum(g.count(sp.selector) for g in index.grids)
+    )
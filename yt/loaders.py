@@ -16,6 +16,7 @@ from yt.utilities.exceptions import (
     YTSimulationNotIdentified,
     YTUnidentifiedDataType,
 )
+from yt.utilities.format_detection import PathProbe, recall_format, remember_format
 from yt.utilities.hierarchy_inspection import find_lowest_subclasses
 from yt.utilities.lib.misc_utilities import get_box_grids_level
 from yt.utilities.object_registries import (
@@ -83,15 +84,39 @@ def load(fn, *args, **kwargs):
                 msg += f"\n(Also tried '{alt_fn}')."
             raise FileNotFoundError(msg)
 
+    # Outputs of the same simulation are very likely to share a format, so
+    # try the one found last for a similar path first.  Its registered
+    # subclasses are tried too, since they may be more specialised front ends
+    # for this output.  The remembered class is only a hint: if it is not
+    # valid for this path, or several of its subclasses are, the full search
+    # below runs and reports unidentified or ambiguous formats as usual.
+    cls = recall_format(fn, args, kwargs)
+    if (
+        cls is not None
+        and output_type_registry.get(cls.__name__) is cls
+        and cls._is_valid(fn, *args, **kwargs)
+    ):
+        candidates = [cls] + [
+            c
+            for c in output_type_registry.values()
+            if c is not cls and issubclass(c, cls) and c._is_valid(fn, *args, **kwargs)
+        ]
+        candidates = find_lowest_subclasses(candidates)
+        if len(candidates) == 1:
+            remember_format(fn, candidates[0], args, kwargs)
+            return candidates[0](fn, *args, **kwargs)
+
+    probe = PathProbe(fn)
     candidates = []
     for cls in output_type_registry.values():
-        if cls._is_valid(fn, *args, **kwargs):
+        if probe.matches(cls) and cls._is_valid(fn, *args, **kwargs):
             candidates.append(cls)
 
     # Find only the lowest subclasses, i.e. most specialised front ends
     candidates = find_lowest_subclasses(candidates)
 
     if len(candidates) == 1:
+        remember_format(fn, candidates[0], args, kwargs)
         return candidates[0](fn, *args, **kwargs)
 
     if len(candidates) > 1:
@@ -187,7 +212,12 @@ def load_uniform_grid(
     ----------
     data : dict
         This is a dict of numpy arrays or (numpy array, unit spec) tuples.
-        The keys are the field names.
+        The keys are the field names.  Arrays are copied, except for
+        memory-mapped arrays (``np.memmap``), which are only read from disk
+        as the data is accessed.  With ``nprocs=1``, a field may also be
+        given as a callable taking the grid index (0) and the field name
+        tuple and returning the data, which is only called when the field is
+        read.
     domain_dimensions : array_like
         This is the domain dimensions of the grid
     length_unit : string
@@ -196,7 +226,8 @@ def load_uniform_grid(
         Size of computational domain in units specified by length_unit.
         Defaults to a cubic unit-length domain.
     nprocs: integer, optional
-        If greater than 1, will create this number of subarrays out of data
+        If greater than 1, will create this number of subarrays out of data.
+        The subarrays are views of the data, not copies.
     sim_time : float, optional
         The simulation time in seconds
     mass_unit : string
@@ -271,6 +302,8 @@ def load_uniform_grid(
         # Used much further below.
         pdata = {"number_of_particles": number_of_particles}
         for key in list(data.keys()):
+            if callable(data[key]):
+                continue
             if len(data[key].shape) == 1 or key[0] == "io":
                 if not isinstance(key, tuple):
                     field = ("io", key)
@@ -283,9 +316,15 @@ def load_uniform_grid(
         particle_types = {}
 
     if nprocs > 1:
+        if any(callable(val) for val in data.values()):
+            raise RuntimeError(
+                "Fields given as callables cannot be decomposed, "
+                "load them with nprocs=1 or with load_amr_grids."
+            )
         temp = {}
         new_data = {}
         for key in data.keys():
+            # Each grid gets a view of the data; nothing is copied.
             psize = get_psize(np.array(data[key].shape), nprocs)
             grid_left_edges, grid_right_edges, shapes, slices = decompose_array(
                 data[key].shape, psize, bbox
@@ -388,10 +427,13 @@ def load_amr_grids(
     grid_data : list of dicts
         This is a list of dicts. Each dict must have entries "left_edge",
         "right_edge", "dimensions", "level", and then any remaining entries are
-        assumed to be fields. Field entries must map to an NDArray. The grid_data
-        may also include a particle count. If no particle count is supplied, the
-        dataset is understood to contain no particles. The grid_data will be
-        modified in place and can't be assumed to be static.
+        assumed to be fields. Field entries must map to an NDArray, or to a
+        callable taking the index of the grid and the field name tuple and
+        returning the data of the grid, which is only called when the field
+        is read; either can be given in a (data, unit spec) tuple. The
+        grid_data may also include a particle count. If no particle count is
+        supplied, the dataset is understood to contain no particles. The
+        grid_data will be modified in place and can't be assumed to be static.
     domain_dimensions : array_like
         This is the domain dimensions of the grid
     length_unit : string or float
@@ -604,6 +646,8 @@ def load_particles(
         This is a dict of numpy arrays or (numpy array, unit name) tuples,
         where the keys are the field names. Particles positions must be named
         "particle_position_x", "particle_position_y", and "particle_position_z".
+        Arrays are copied, except for memory-mapped arrays (``np.memmap``),
+        which are only read from disk as the data is accessed.
     length_unit : float
         Conversion factor from simulation length units to centimeters
     bbox : array_like (xdim:zdim, LE:RE), optional
@@ -1,7 +1,14 @@
+import os
+import shutil
+import stat
+import tempfile
+
+import numpy as np
 from nose.tools import assert_raises
 
 from yt import YTQuantity
-from yt.funcs import validate_axis, validate_center
+from yt.config import ytcfg
+from yt.funcs import get_thread_count, save_npz_cache, validate_axis, validate_center
 from yt.testing import assert_equal, fake_amr_ds
 
 
@@ -51,3 +58,30 @@ def test_validate_center():
         "CustomCenter'."
     )
     assert_equal(str(ex.exception)[:50], desired[:50])
+
+
+def test_save_npz_cache():
+    tmpdir = tempfile.mkdtemp()
+    old_umask = os.umask(0o022)
+    try:
+        fn = os.path.join(tmpdir, "cache.npz")
+        assert save_npz_cache(fn, a=np.arange(3))
+        assert_equal(stat.S_IMODE(os.stat(fn).st_mode), 0o644)
+        with np.load(fn) as data:
+            assert_equal(data["a"], np.arange(3))
+        assert_equal(os.listdir(tmpdir), ["cache.npz"])
+    finally:
+        os.umask(old_umask)
+        shutil.rmtree(tmpdir)
+
+
+def test_get_thread_count():
+    old_value = ytcfg.get("yt", "numthreads")
+    try:
+        # A single thread runs unless a number of threads is set.
+        ytcfg["yt", "numthreads"] = "0"
+        assert_equal(get_thread_count(), 1)
+        ytcfg["yt", "numthreads"] = "3"
+        assert_equal(get_thread_count(), 3)
+    finally:
+        ytcfg["yt", "numthreads"] = old_value
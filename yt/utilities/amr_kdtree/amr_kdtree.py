@@ -1,7 +1,9 @@
 import operator
+from contextlib import contextmanager
 
 import numpy as np
 
+from yt.config import ytcfg
 from yt.funcs import iterable, mylog
 from yt.geometry.grid_geometry_handler import GridIndex
 from yt.utilities.amr_kdtree.amr_kdtools import (
@@ -9,6 +11,7 @@ from yt.utilities.amr_kdtree.amr_kdtools import (
     scatter_image,
     send_to_parent,
 )
+from yt.utilities.io_handler import IOCache
 from yt.utilities.lib.amr_kdtools import Node
 from yt.utilities.lib.partitioned_grid import PartitionedGrid
 from yt.utilities.math_utils import periodic_position
@@ -180,8 +183,11 @@ class AMRKDTree(ParallelAnalysisInterface):
         ParallelAnalysisInterface.__init__(self)
 
         self.ds = ds
-        self.current_vcds = []
-        self.current_saved_grids = []
+        # Vertex-centered data of grids, keyed by (grid id, field, no_ghost),
+        # so that the bricks of a grid share one computation.
+        self.vcd_cache = IOCache(
+            ytcfg.getint("yt", "kdtree_brick_cache_size") * 1024 ** 2
+        )
         self.bricks = []
         self.brick_dimensions = []
         self.sdx = ds.index.get_smallest_dx()
@@ -218,6 +224,8 @@ class AMRKDTree(ParallelAnalysisInterface):
             log_fields = [log_fields]
         new_log_fields = list(log_fields)
         self.tree.trunk.set_dirty(regenerate_data)
+        if force:
+            self.vcd_cache.clear()
         self.fields = new_fields
 
         if self.log_fields is not None and not regenerate_data:
@@ -231,6 +239,7 @@ class AMRKDTree(ParallelAnalysisInterface):
         self.brick_dimensions = []
         bricks = []
 
+        self.build_bricks(self.tree.trunk.kd_traverse())
         for b in self.traverse():
             list(map(_apply_log, b.my_data, flip_log, self.log_fields))
             bricks.append(b)
@@ -324,51 +333,120 @@ class AMRKDTree(ParallelAnalysisInterface):
         if node.data is not None and not node.dirty:
             return node.data
         grid = self.ds.index.grids[node.grid - self._id_offset]
-        dds = grid.dds.ndarray_view()
-        gle = grid.LeftEdge.ndarray_view()
-        nle = node.get_left_edge()
-        nre = node.get_right_edge()
-        li = np.rint((nle - gle) / dds).astype("int32")
-        ri = np.rint((nre - gle) / dds).astype("int32")
-        dims = (ri - li).astype("int32")
-        assert np.all(grid.LeftEdge <= nle)
-        assert np.all(grid.RightEdge >= nre)
-
-        if grid in self.current_saved_grids and not node.dirty:
-            dds = self.current_vcds[self.current_saved_grids.index(grid)]
-        else:
-            dds = []
-            vcd = grid.get_vertex_centered_data(
-                self.fields, smoothed=True, no_ghost=self.no_ghost
-            )
-            for i, field in enumerate(self.fields):
-                if self.log_fields[i]:
-                    dds.append(np.log10(vcd[field].astype("float64")))
-                else:
-                    dds.append(vcd[field].astype("float64"))
-                self.current_saved_grids.append(grid)
-                self.current_vcds.append(dds)
+        brick = self._cut_grid_bricks(grid, [node], *self._read_grid(grid))[0]
+        self._set_brick(node, brick)
+        return brick
+
+    def build_bricks(self, nodes):
+        r"""Construct the bricks of many nodes at once.
+
+        The nodes are grouped by the grid they belong to, so that the vertex
+        centered data and selection mask of every grid are computed once for
+        all of its bricks.  When ghost zones are used, the raw field data
+        read for a grid is kept in the dataset's IO cache while the bricks
+        are built, so that neighboring grids do not read it again.
 
+        Parameters
+        ----------
+        nodes : iterable of Node
+            The nodes to build the bricks of.  Nodes whose brick is already
+            up to date are skipped.
+        """
+        nodes = [n for n in nodes if n.data is None or n.dirty]
+        grid_nodes = {}
+        for node in nodes:
+            grid_nodes.setdefault(node.grid, []).append(node)
+        grids = [self.ds.index.grids[gid - self._id_offset] for gid in grid_nodes]
+
+        bricks = {}
+        with self._shared_reads():
+            for grid in grids:
+                gnodes = grid_nodes[grid.id]
+                gbricks = self._cut_grid_bricks(grid, gnodes, *self._read_grid(grid))
+                for node, brick in zip(gnodes, gbricks):
+                    bricks[node.node_id] = brick
+        for node in nodes:
+            self._set_brick(node, bricks[node.node_id])
+
+    @contextmanager
+    def _shared_reads(self):
+        # Ghost zones are filled from the neighbors of each grid, which are
+        # the grids built around the same time, so keep what is read in the
+        # dataset's IO cache for the duration of the build if it is off.
+        io_cache = self.ds.io_cache
+        if self.no_ghost or io_cache.enabled or not self.vcd_cache.enabled:
+            yield
+            return
+        io_cache.max_bytes = self.vcd_cache.max_bytes
+        try:
+            yield
+        finally:
+            io_cache.max_bytes = 0
+            io_cache.clear()
+
+    def _get_vertex_centered_data(self, grid):
+        keys = [(grid.id, field, self.no_ghost) for field in self.fields]
+        vcds = [self.vcd_cache.get(key) for key in keys]
+        missing = [field for field, vcd in zip(self.fields, vcds) if vcd is None]
+        if missing:
+            new_vcds = grid.get_vertex_centered_data(
+                missing, smoothed=True, no_ghost=self.no_ghost
+            )
+            for i, (key, field) in enumerate(zip(keys, self.fields)):
+                if vcds[i] is None:
+                    vcds[i] = new_vcds[field].d.astype("float64")
+                    self.vcd_cache.put(key, vcds[i])
+        return vcds
+
+    def _read_grid(self, grid):
+        # The vertex-centered data and selection mask of a grid.
+        vcds = self._get_vertex_centered_data(grid)
         if self.data_source.selector is None:
-            mask = np.ones(dims, dtype="uint8")
+            grid_mask = None
         else:
-            mask = self.data_source.selector.fill_mask(grid)[
-                li[0] : ri[0], li[1] : ri[1], li[2] : ri[2]
-            ].astype("uint8")
+            grid_mask = self.data_source.selector.fill_mask(grid)
+        return vcds, grid_mask
 
-        data = [
-            d[li[0] : ri[0] + 1, li[1] : ri[1] + 1, li[2] : ri[2] + 1].copy()
-            for d in dds
-        ]
+    def _cut_grid_bricks(self, grid, nodes, vcds, grid_mask):
+        # Build the bricks of the nodes, which all belong to grid, from the
+        # data read for it.
+        dds = grid.dds.ndarray_view()
+        gle = grid.LeftEdge.ndarray_view()
+        gre = grid.RightEdge.ndarray_view()
+        bricks = []
+        for node in nodes:
+            nle = node.get_left_edge()
+            nre = node.get_right_edge()
+            li = np.rint((nle - gle) / dds).astype("int32")
+            ri = np.rint((nre - gle) / dds).astype("int32")
+            dims = (ri - li).astype("int32")
+            assert np.all(gle <= nle)
+            assert np.all(gre >= nre)
 
-        brick = PartitionedGrid(
-            grid.id, data, mask, nle.copy(), nre.copy(), dims.astype("int64")
-        )
+            if grid_mask is None:
+                mask = np.ones(dims, dtype="uint8")
+            else:
+                mask = grid_mask[li[0] : ri[0], li[1] : ri[1], li[2] : ri[2]].astype(
+                    "uint8"
+                )
+
+            data = []
+            for vcd, log_field in zip(vcds, self.log_fields):
+                d = vcd[li[0] : ri[0] + 1, li[1] : ri[1] + 1, li[2] : ri[2] + 1]
+                data.append(np.log10(d) if log_field else d.copy())
+
+            bricks.append(
+                PartitionedGrid(
+                    grid.id, data, mask, nle.copy(), nre.copy(), dims.astype("int64")
+                )
+            )
+        return bricks
+
+    def _set_brick(self, node, brick):
         node.data = brick
         node.dirty = False
         if not self._initialized:
-            self.brick_dimensions.append(dims)
-        return brick
+            self.brick_dimensions.append(np.array(brick.source_mask.shape, "int32"))
 
     def locate_brick(self, position):
         r"""Given a position, find the node that contains it.
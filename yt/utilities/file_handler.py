@@ -1,3 +1,4 @@
+import threading
 from contextlib import contextmanager
 
 from yt.utilities.on_demand_imports import NotAModule, _h5py as h5py
@@ -103,6 +104,11 @@ def warn_netcdf(fn):
         )
 
 
+# The netCDF library is not thread-safe, so files are only accessed by one
+# thread at a time, for instance while datasets are loaded in the background.
+netcdf4_lock = threading.RLock()
+
+
 class NetCDF4FileHandler:
     def __init__(self, filename):
         self.filename = filename
@@ -111,6 +117,7 @@ class NetCDF4FileHandler:
     def open_ds(self):
         from yt.utilities.on_demand_imports import _netCDF4 as netCDF4
 
-        ds = netCDF4.Dataset(self.filename)
-        yield ds
-        ds.close()
+        with netcdf4_lock:
+            ds = netCDF4.Dataset(self.filename)
+            yield ds
+            ds.close()
@@ -0,0 +1,147 @@
+"""
+Cheap checks used by :func:`yt.loaders.load` to find the format of a dataset.
+
+Calling ``_is_valid`` on every registered frontend means dozens of file
+opens for a single ``load``, since many of them open the file with h5py or
+read its header.  Instead, each Dataset class can declare what paths of its
+format look like:
+
+``_file_extensions``
+    A tuple of suffixes, one of which the path must end with.
+``_file_signatures``
+    A tuple of byte strings, one of which a regular file must begin with.
+    This does not exclude directories.  The HDF5 signature is also found
+    after a user block, at offsets 512, 1024, 2048 and so on.
+``_dir_signature``
+    A tuple of names, all of which must exist inside the path, which must
+    be a directory.
+
+``_is_valid`` is then only called on the classes whose hints the path
+matches.  Hints must never exclude a path ``_is_valid`` would accept, so a
+class that cannot describe its paths cheaply just leaves them as None.
+
+The format found for a path is also remembered for the paths that only
+differ from it by numbers, e.g. later outputs of the same simulation.  The
+next ``load`` of one of those only checks the remembered format.
+"""
+
+import os
+import re
+from collections import OrderedDict
+
+HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+NETCDF_SIGNATURES = (b"CDF\x01", b"CDF\x02", b"CDF\x05", HDF5_SIGNATURE)
+
+# How many path patterns to remember formats for.
+_MAX_REMEMBERED_FORMATS = 256
+_remembered_formats = OrderedDict()
+
+
+class PathProbe:
+    """
+    Facts about a path that are looked up at most once, however many
+    formats ask about them.
+    """
+
+    def __init__(self, fn):
+        self.fn = str(fn)
+        self._isfile = self._isdir = None
+        self._listing = None
+        self._signatures = {}
+
+    @property
+    def isfile(self):
+        if self._isfile is None:
+            self._isfile = os.path.isfile(self.fn)
+        return self._isfile
+
+    @property
+    def isdir(self):
+        if self._isdir is None:
+            self._isdir = os.path.isdir(self.fn)
+        return self._isdir
+
+    @property
+    def listing(self):
+        if self._listing is None:
+            try:
+                self._listing = set(os.listdir(self.fn))
+            except OSError:
+                self._listing = set()
+        return self._listing
+
+    def has_signature(self, signature):
+        if signature not in self._signatures:
+            self._signatures[signature] = self._read_signature(signature)
+        return self._signatures[signature]
+
+    def _read_signature(self, signature):
+        n = len(signature)
+        try:
+            with open(self.fn, "rb") as f:
+                if f.read(n) == signature:
+                    return True
+                if signature != HDF5_SIGNATURE:
+                    return False
+                size = os.fstat(f.fileno()).st_size
+                offset = 512
+                while offset + n <= size:
+                    f.seek(offset)
+                    if f.read(n) == signature:
+                        return True
+                    offset *= 2
+        except OSError:
+            # Let _is_valid decide about anything we cannot read.
+            return True
+        return False
+
+    def matches(self, cls):
+        """
+        Return False if the hints declared by ``cls`` rule this path out.
+        """
+        extensions = getattr(cls, "_file_extensions", None)
+        if extensions is not None and not self.fn.endswith(tuple(extensions)):
+            return False
+        dir_signature = getattr(cls, "_dir_signature", None)
+        if dir_signature is not None:
+            if not self.isdir or not all(n in self.listing for n in dir_signature):
+                return False
+        signatures = getattr(cls, "_file_signatures", None)
+        if signatures is not None and self.isfile:
+            if not any(self.has_signature(s) for s in signatures):
+                return False
+        return True
+
+
+def _format_key(fn, args, kwargs):
+    fn = str(fn)
+    if os.path.exists(fn):
+        fn = os.path.abspath(fn)
+    # Outputs of one simulation differ by their numbers, both in the file
+    # names and in the directory names.
+    return (re.sub(r"\d+", "#", fn), len(args), tuple(sorted(kwargs)))
+
+
+def recall_format(fn, args=(), kwargs=None):
+    """
+    Return the class last found for a path like ``fn``, or None.
+    """
+    return _remembered_formats.get(_format_key(fn, args, kwargs or {}))
+
+
+def remember_format(fn, cls, args=(), kwargs=None):
+    """
+    Remember that ``cls`` is the format of ``fn`` and of paths like it.
+    """
+    key = _format_key(fn, args, kwargs or {})
+    _remembered_formats.pop(key, None)
+    _remembered_formats[key] = cls
+    while len(_remembered_formats) > _MAX_REMEMBERED_FORMATS:
+        _remembered_formats.popitem(last=False)
+
+
+def forget_formats():
+    """
+    Forget every format remembered by :func:`remember_format`.
+    """
+    _remembered_formats.clear()
@@ -1,22 +1,146 @@
 import os
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from functools import _make_key, lru_cache
+from functools import wraps
+from itertools import islice
 
 import numpy as np
 
+from yt.config import ytcfg
 from yt.geometry.selection_routines import GridSelector
 from yt.utilities.on_demand_imports import _h5py as h5py
 
 io_registry = {}
 
-use_caching = 0
 
+class IOCache:
+    """
+    A least-recently-used cache of raw field arrays read from disk, bounded by
+    the number of bytes it holds.
 
-def _make_io_key(args, *_args, **kwargs):
-    self, obj, field, ctx = args
-    # Ignore self because we have a self-specific cache
-    return _make_key((obj.id, field), *_args, **kwargs)
+    Entries are keyed by ``(object id, field)``.  Each dataset's IO handler
+    owns one of these, which is exposed as ``ds.io_cache``.  The cache is
+    disabled when ``max_bytes`` is zero, which is the default unless the
+    ``io_cache_size`` configuration option (in megabytes) says otherwise.
+
+    Parameters
+    ----------
+    max_bytes : int
+        The largest number of bytes of array data to keep.
+
+    Examples
+    --------
+
+    >>> ds = yt.load("IsolatedGalaxy/galaxy0030/galaxy0030")
+    >>> ds.io_cache.max_bytes = 1024 ** 3
+    >>> sp = ds.sphere("c", (10, "kpc"))
+    >>> sp["gas", "density"]
+    >>> print(ds.io_cache.misses, ds.io_cache.hits)
+    """
+
+    def __init__(self, max_bytes=0):
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self._max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self._max_bytes > 0
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        with self._lock:
+            self._max_bytes = int(value)
+            self._evict()
+
+    def get(self, key):
+        """
+        Return the array stored under ``key``, or None if it is not present.
+        """
+        with self._lock:
+            data = self._data.get(key, None)
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        """
+        Store ``data`` under ``key``, evicting the least recently used entries
+        to stay under ``max_bytes``.  Arrays larger than ``max_bytes`` are not
+        stored.
+        """
+        if data.nbytes > self._max_bytes:
+            return
+        # Consumers share the cached array, so nobody gets to modify it.
+        data.flags.writeable = False
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._data[key] = data
+            self.nbytes += data.nbytes
+            self._evict()
+
+    def _evict(self):
+        while self.nbytes > self._max_bytes and len(self._data) > 0:
+            _, data = self._data.popitem(last=False)
+            self.nbytes -= data.nbytes
+
+    def clear(self):
+        """
+        Drop every entry from the cache and reset the hit and miss counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return "IOCache(entries=%s, nbytes=%s, max_bytes=%s, hits=%s, misses=%s)" % (
+            len(self),
+            self.nbytes,
+            self.max_bytes,
+            self.hits,
+            self.misses,
+        )
+
+
+def _cached_read_obj_field(io, read_obj_field):
+    # Wrap a bound _read_obj_field so that it consults the handler's IOCache.
+    # The extra context argument (open file handles, scratch buffers) is not
+    # part of the key.
+    @wraps(read_obj_field)
+    def _read_obj_field(obj, field, *args, **kwargs):
+        cache = io.field_cache
+        if not cache.enabled:
+            return read_obj_field(obj, field, *args, **kwargs)
+        key = (obj.id, field)
+        data = cache.get(key)
+        if data is None:
+            data = read_obj_field(obj, field, *args, **kwargs)
+            cache.put(key, data)
+        return data
+
+    return _read_obj_field
 
 
 class BaseIOHandler:
@@ -24,17 +148,11 @@ class BaseIOHandler:
     _dataset_type = None
     _particle_reader = False
     _cache_on = False
-    _misses = 0
-    _hits = 0
 
     def __init_subclass__(cls, *args, **kwargs):
         super().__init_subclass__(*args, **kwargs)
         if hasattr(cls, "_dataset_type"):
             io_registry[cls._dataset_type] = cls
-        if use_caching and hasattr(cls, "_read_obj_field"):
-            cls._read_obj_field = lru_cache(
-                maxsize=use_caching, typed=True, make_key=_make_io_key
-            )(cls._read_obj_field)
 
     def __init__(self, ds):
         self.queue = defaultdict(dict)
@@ -47,6 +165,28 @@ class BaseIOHandler:
         # and assume all non-specified vector fields are 3D
         if not isinstance(self._vector_fields, dict):
             self._vector_fields = dict((field, 3) for field in self._vector_fields)
+        self.field_cache = IOCache(ytcfg.getint("yt", "io_cache_size") * 1024 ** 2)
+        # We wrap the bound method, rather than the one on the class, so that
+        # subclasses calling their parent's _read_obj_field through super()
+        # do not store the same data twice.
+        if hasattr(self, "_read_obj_field"):
+            self._read_obj_field = _cached_read_obj_field(self, self._read_obj_field)
+
+    @property
+    def _hits(self):
+        return self.field_cache.hits
+
+    @_hits.setter
+    def _hits(self, value):
+        self.field_cache.hits = value
+
+    @property
+    def _misses(self):
+        return self.field_cache.misses
+
+    @_misses.setter
+    def _misses(self, value):
+        self.field_cache.misses = value
 
     # We need a function for reading a list of sets
     # and a function for *popping* from a queue all the appropriate sets
@@ -54,6 +194,55 @@ class BaseIOHandler:
     def preload(self, chunk, fields, max_size):
         yield self
 
+    def _prefetch(self, chunks, read_chunk):
+        """
+        Yield ``(chunk, read_chunk(chunk))`` for every chunk in ``chunks``.
+
+        If the ``io_prefetch_depth`` configuration option is positive, the
+        reads for up to that many chunks past the one being yielded are issued
+        on a pool of ``io_prefetch_threads`` threads, so that disk access
+        overlaps with whatever the caller does with the current chunk.
+        Otherwise each chunk is read only when it is reached.
+        """
+        depth = ytcfg.getint("yt", "io_prefetch_depth")
+        if depth <= 0:
+            for chunk in chunks:
+                yield chunk, read_chunk(chunk)
+            return
+        nthreads = max(ytcfg.getint("yt", "io_prefetch_threads"), 1)
+        chunks = iter(chunks)
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=nthreads)
+        try:
+            for chunk in islice(chunks, depth):
+                pending.append((chunk, executor.submit(read_chunk, chunk)))
+            while pending:
+                chunk, future = pending.popleft()
+                # Keep the queue full before we hand control back to the caller
+                for next_chunk in islice(chunks, 1):
+                    future_next = executor.submit(read_chunk, next_chunk)
+                    pending.append((next_chunk, future_next))
+                yield chunk, future.result()
+        finally:
+            # If we have been stopped early, do not bother finishing reads
+            # nobody is going to look at.
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _prefetched_io_iter(self, chunks, fields):
+        # io_iter, but with whole chunks read ahead of time when prefetching
+        # has been turned on.
+        if ytcfg.getint("yt", "io_prefetch_depth") <= 0:
+            yield from self.io_iter(chunks, fields)
+            return
+
+        def read_chunk(chunk):
+            return list(self.io_iter([chunk], fields))
+
+        for _chunk, chunk_data in self._prefetch(chunks, read_chunk):
+            yield from chunk_data
+
     def peek(self, grid, field):
         return self.queue[grid.id].get(field, None)
 
@@ -114,7 +303,7 @@ class BaseIOHandler:
             else:
                 rv[field] = np.empty(size, dtype="=f8")
         ind = {field: 0 for field in fields}
-        for field, obj, data in self.io_iter(chunks, fields):
+        for field, obj, data in self._prefetched_io_iter(chunks, fields):
             if data is None:
                 continue
             if isinstance(selector, GridSelector) and field not in nodal_fields:
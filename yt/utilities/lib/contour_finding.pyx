@@ -488,6 +488,89 @@ def update_joins(np.ndarray[np.int64_t, ndim=2] joins,
                         contour_ids[ci,cj,ck] = j + 1
                         break
 
+cdef inline np.int64_t uf_find(np.int64_t *parent, np.int64_t i) nogil:
+    # Path halving
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def merge_tree_sweep(np.ndarray[np.int64_t, ndim=1] cell_levels,
+                     np.ndarray[np.int64_t, ndim=2] edges,
+                     int nlevels):
+    """
+    Build the merge tree of a set of connected cells in a single sweep.
+
+    Each cell is above the threshold of every level up to its own, and two
+    cells sharing an edge are connected at every level both are above.  The
+    edges are added to a union-find structure from the highest level down,
+    and the components found at each level are recorded after its edges are
+    added.
+
+    Returns the component of the highest level each cell is in, and for
+    every component, its level and the component it lies in one level
+    down, or -1 on the lowest level.
+    """
+    cdef np.int64_t ncells = cell_levels.shape[0]
+    cdef np.int64_t nedges = edges.shape[0]
+    cdef np.int64_t i, j, r, c, k, ci = 0, ei = 0
+    cdef np.int64_t prev_start = 0, prev_end = 0, start
+    cdef np.ndarray[np.int64_t, ndim=1] edge_levels = np.minimum(
+        cell_levels[edges[:, 0]], cell_levels[edges[:, 1]])
+    cdef np.ndarray[np.int64_t, ndim=1] corder = np.argsort(
+        -cell_levels, kind="stable")
+    cdef np.ndarray[np.int64_t, ndim=1] eorder = np.argsort(
+        -edge_levels, kind="stable")
+    cdef np.ndarray[np.int64_t, ndim=1] uf_parent = np.arange(
+        ncells, dtype="int64")
+    cdef np.ndarray[np.int64_t, ndim=1] uf_size = np.ones(ncells, "int64")
+    cdef np.ndarray[np.int64_t, ndim=1] stamp = np.zeros(ncells, "int64") - 1
+    cdef np.ndarray[np.int64_t, ndim=1] root_comp = np.zeros(ncells, "int64")
+    cdef np.ndarray[np.int64_t, ndim=1] cell_comp = \
+        np.zeros(ncells, "int64") - 1
+    cdef np.int64_t *parent = <np.int64_t *> uf_parent.data
+    comp_parent = []
+    comp_level = []
+    comp_rep = []
+    for k in range(nlevels - 1, -1, -1):
+        while ei < nedges and edge_levels[eorder[ei]] == k:
+            i = uf_find(parent, edges[eorder[ei], 0])
+            j = uf_find(parent, edges[eorder[ei], 1])
+            ei += 1
+            if i == j: continue
+            if uf_size[i] < uf_size[j]:
+                i, j = j, i
+            parent[j] = i
+            uf_size[i] += uf_size[j]
+        start = len(comp_level)
+        # Every component of the level above lies in one of this level.
+        for c in range(prev_start, prev_end):
+            r = uf_find(parent, comp_rep[c])
+            if stamp[r] != k:
+                stamp[r] = k
+                root_comp[r] = len(comp_level)
+                comp_parent.append(-1)
+                comp_level.append(k)
+                comp_rep.append(r)
+            comp_parent[c] = root_comp[r]
+        while ci < ncells and cell_levels[corder[ci]] == k:
+            i = corder[ci]
+            r = uf_find(parent, i)
+            if stamp[r] != k:
+                stamp[r] = k
+                root_comp[r] = len(comp_level)
+                comp_parent.append(-1)
+                comp_level.append(k)
+                comp_rep.append(r)
+            cell_comp[i] = root_comp[r]
+            ci += 1
+        prev_start = start
+        prev_end = len(comp_level)
+    return (cell_comp, np.array(comp_level, dtype="int64"),
+            np.array(comp_parent, dtype="int64"))
+
 cdef class FOFNode:
     cdef np.int64_t tag, count
     def __init__(self, np.int64_t tag):
@@ -101,6 +101,36 @@ def smallest_fwidth(np.ndarray[np.float64_t, ndim=2] coords,
             fwidth = fmin(fwidth, RE[j] - LE[j])
     return fwidth
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def element_block_bounds(np.ndarray[np.float64_t, ndim=2] coords,
+                         np.ndarray[np.int64_t, ndim=2] indices,
+                         int offset = 0, int block_size = 1024):
+    """The bounding boxes of runs of *block_size* consecutive elements.
+
+    Returns the left and right edges of the boxes, with one row per run
+    and one column per dimension of *coords*.
+    """
+    cdef int nc = indices.shape[0]
+    cdef int nv = indices.shape[1]
+    cdef int ndim = coords.shape[1]
+    cdef int nb = (nc + block_size - 1) // block_size
+    cdef np.ndarray[np.float64_t, ndim=2] LE
+    cdef np.ndarray[np.float64_t, ndim=2] RE
+    cdef np.float64_t pos
+    cdef int i, j, k, b
+    LE = np.full((nb, ndim), 1e60, dtype="float64")
+    RE = np.full((nb, ndim), -1e60, dtype="float64")
+    for i in range(nc):
+        b = i // block_size
+        for j in range(nv):
+            for k in range(ndim):
+                pos = coords[indices[i, j] - offset, k]
+                LE[b, k] = fmin(pos, LE[b, k])
+                RE[b, k] = fmax(pos, RE[b, k])
+    return LE, RE
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.cdivision(True)
@@ -149,6 +149,277 @@ def new_bin_profile3d(np.ndarray[np.intp_t, ndim=1] bins_x,
         used[bin_x,bin_y,bin_z] = 1
     return
 
+# The fused binning kernel below bins at most this many dimensions.
+DEF MAX_BIN_DIMS = 3
+# Elements below which a chunk is not worth its own partial accumulators.
+DEF MIN_CHUNK_ELEMENTS = 65536
+
+cdef struct ProfileBinning:
+    int ndim
+    int nf
+    np.int64_t nbins
+    np.float64_t *bsrc[MAX_BIN_DIMS]
+    np.float64_t bscale[MAX_BIN_DIMS]
+    np.float64_t *edges[MAX_BIN_DIMS]
+    int nb[MAX_BIN_DIMS]
+    int take_log[MAX_BIN_DIMS]
+    np.float64_t start[MAX_BIN_DIMS]
+    np.float64_t idx[MAX_BIN_DIMS]
+    np.float64_t **fsrc
+    np.float64_t *fscale
+    np.float64_t *wsrc
+    np.float64_t wscale
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline int _find_bin(ProfileBinning *pb, int d, np.float64_t v) nogil:
+    # The bin holding v, with the same convention as np.digitize, or -1 if
+    # v is not strictly inside the outer edges.
+    cdef np.float64_t *edges = pb.edges[d]
+    cdef int nb = pb.nb[d]
+    cdef int lo, hi, mid, b
+    if not (v > edges[0] and v < edges[nb]):
+        return -1
+    # Guess the bin assuming evenly spaced edges, then check it.
+    if pb.take_log[d]:
+        b = <int> ((math.log10(v) - pb.start[d]) * pb.idx[d])
+    else:
+        b = <int> ((v - pb.start[d]) * pb.idx[d])
+    if b >= 0 and b < nb and edges[b] <= v and v < edges[b + 1]:
+        return b
+    lo = 0
+    hi = nb
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if edges[mid] <= v:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _bin_elements(ProfileBinning *pb, np.int64_t start, np.int64_t end,
+                        np.float64_t *wresult, np.float64_t *bresult,
+                        np.float64_t *mresult, np.float64_t *qresult,
+                        np.uint8_t *used) nogil:
+    cdef np.int64_t i, k, kf
+    cdef int d, b, fi
+    cdef np.float64_t wval, bval, oldwr, bval_mresult
+    for i in range(start, end):
+        k = 0
+        b = 0
+        for d in range(pb.ndim):
+            b = _find_bin(pb, d, pb.bsrc[d][i] * pb.bscale[d])
+            if b < 0:
+                break
+            k = k * pb.nb[d] + b
+        if b < 0:
+            continue
+        if pb.wsrc == NULL:
+            wval = 1.0
+        else:
+            wval = pb.wsrc[i] * pb.wscale
+        # Skip field value entries where the weight field is zero
+        if wval == 0:
+            continue
+        oldwr = wresult[k]
+        wresult[k] += wval
+        kf = k * pb.nf
+        for fi in range(pb.nf):
+            bval = pb.fsrc[fi][i] * pb.fscale[fi]
+            bval_mresult = bval - mresult[kf + fi]
+            # qresult has to have the previous wresult
+            qresult[kf + fi] += oldwr * wval * bval_mresult * bval_mresult / \
+                (oldwr + wval)
+            bresult[kf + fi] += wval * bval
+            # mresult needs the new wresult
+            mresult[kf + fi] += wval * bval_mresult / wresult[k]
+        used[k] = 1
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def bin_profile(bin_sources, bin_scales, bin_edges, bin_logs,
+                field_sources, field_scales, weight_source, weight_scale,
+                np.float64_t[:] wresult,
+                np.float64_t[:, :] bresult,
+                np.float64_t[:, :] mresult,
+                np.float64_t[:, :] qresult,
+                np.uint8_t[:] used,
+                int num_threads = 1):
+    r"""Accumulate weighted sums, means and variances of fields in bins.
+
+    This does the work of np.digitize and new_bin_profile1d, 2d and 3d in
+    a single pass, reading the bin fields, the profiled fields and the
+    weights straight from their buffers.  Values are multiplied by their
+    scale as they are read, which converts them to the units of the bin
+    edges or of the profile.  Elements outside of the outer bin edges, or
+    with a weight of zero, are skipped.
+
+    Chunks of elements are binned on separate threads into partial
+    accumulators, which are then merged into the results.
+
+    Parameters
+    ----------
+    bin_sources : list of arrays
+        The contiguous float64 values of each of the (up to 3) bin fields.
+    bin_scales : list of floats
+        The factor each bin field is multiplied by.
+    bin_edges : list of arrays
+        The bin edges along each dimension.
+    bin_logs : list of bools
+        Whether the edges along each dimension are logarithmically spaced.
+        This is only used to guess bins quickly; edges of any spacing give
+        correct results.
+    field_sources, field_scales : lists
+        The contiguous float64 values of each profiled field and their scale.
+    weight_source, weight_scale : array or None, float
+        The weights of each element.  If None, every weight is one.
+    wresult, bresult, mresult, qresult, used : arrays
+        The total weight, weighted sum, weighted mean and weighted sum of
+        squared deviations of each bin (with one column per field for the
+        last three), and whether the bin received any values, flattened over
+        the bins.  These are updated in place.
+    num_threads : int
+        The largest number of threads to use.
+    """
+    cdef ProfileBinning pb
+    cdef int d, fi, c, nchunks
+    cdef np.int64_t n, k, kf, nbins
+    cdef np.float64_t w1, w2, wtot, m1, m2, delta
+    cdef np.ndarray[np.float64_t, ndim=1] edges
+    cdef np.ndarray[np.float64_t, ndim=1] src
+    cdef np.float64_t[:, :] wacc
+    cdef np.float64_t[:, :, :] bacc, macc, qacc
+    cdef np.uint8_t[:, :] uacc
+    cdef np.float64_t *wres
+    cdef np.float64_t *bres
+    cdef np.float64_t *mres
+    cdef np.float64_t *qres
+    cdef np.uint8_t *ures
+
+    pb.ndim = len(bin_sources)
+    pb.nf = len(field_sources)
+    if pb.ndim < 1 or pb.ndim > MAX_BIN_DIMS:
+        raise ValueError("Can only bin along 1 to %s dimensions" % MAX_BIN_DIMS)
+    # Keep every buffer alive, and contiguous, while we hold pointers to it.
+    buffers = []
+    n = -1
+    nbins = 1
+    for d in range(pb.ndim):
+        src = np.ascontiguousarray(bin_sources[d], dtype="float64")
+        edges = np.ascontiguousarray(bin_edges[d], dtype="float64")
+        buffers += [src, edges]
+        if n == -1:
+            n = src.shape[0]
+        elif src.shape[0] != n:
+            raise ValueError("All bin fields must have the same size")
+        pb.bsrc[d] = <np.float64_t *> src.data
+        pb.bscale[d] = bin_scales[d]
+        pb.edges[d] = <np.float64_t *> edges.data
+        pb.nb[d] = edges.shape[0] - 1
+        nbins *= pb.nb[d]
+        pb.take_log[d] = bool(bin_logs[d]) and edges[0] > 0
+        if pb.take_log[d]:
+            pb.start[d] = math.log10(edges[0])
+            pb.idx[d] = pb.nb[d] / (math.log10(edges[pb.nb[d]]) - pb.start[d])
+        else:
+            pb.start[d] = edges[0]
+            pb.idx[d] = pb.nb[d] / (edges[pb.nb[d]] - pb.start[d])
+    pb.nbins = nbins
+    if wresult.shape[0] != nbins or used.shape[0] != nbins or \
+       bresult.shape[0] != nbins or bresult.shape[1] != pb.nf or \
+       mresult.shape[0] != nbins or mresult.shape[1] != pb.nf or \
+       qresult.shape[0] != nbins or qresult.shape[1] != pb.nf:
+        raise ValueError("The result arrays do not match the bins and fields")
+    if n == 0 or nbins == 0:
+        return
+
+    pb.fsrc = <np.float64_t **> malloc(sizeof(np.float64_t *) * max(pb.nf, 1))
+    pb.fscale = <np.float64_t *> malloc(sizeof(np.float64_t) * max(pb.nf, 1))
+    try:
+        for fi in range(pb.nf):
+            src = np.ascontiguousarray(field_sources[fi], dtype="float64")
+            if src.shape[0] != n:
+                raise ValueError("All fields must have the same size")
+            buffers.append(src)
+            pb.fsrc[fi] = <np.float64_t *> src.data
+            pb.fscale[fi] = field_scales[fi]
+        pb.wsrc = NULL
+        pb.wscale = 1.0
+        if weight_source is not None:
+            src = np.ascontiguousarray(weight_source, dtype="float64")
+            if src.shape[0] != n:
+                raise ValueError("The weight field must have the same size")
+            buffers.append(src)
+            pb.wsrc = <np.float64_t *> src.data
+            pb.wscale = weight_scale
+
+        # Only split the elements if each chunk has enough of them to be
+        # worth the partial accumulators it is given.
+        nchunks = max(1, min(num_threads, n // MIN_CHUNK_ELEMENTS, n // nbins))
+        if nchunks == 1:
+            with nogil:
+                _bin_elements(&pb, 0, n, &wresult[0], &bresult[0, 0],
+                              &mresult[0, 0], &qresult[0, 0], &used[0])
+            return
+
+        # The first chunk goes straight into the results, the others into
+        # partial accumulators that are merged into them afterwards.
+        wacc = np.zeros((nchunks - 1, nbins), dtype="float64")
+        bacc = np.zeros((nchunks - 1, nbins, pb.nf), dtype="float64")
+        macc = np.zeros((nchunks - 1, nbins, pb.nf), dtype="float64")
+        qacc = np.zeros((nchunks - 1, nbins, pb.nf), dtype="float64")
+        uacc = np.zeros((nchunks - 1, nbins), dtype="uint8")
+        for c in prange(nchunks, nogil=True, schedule="static",
+                        num_threads=nchunks):
+            if c == 0:
+                wres = &wresult[0]
+                bres = &bresult[0, 0]
+                mres = &mresult[0, 0]
+                qres = &qresult[0, 0]
+                ures = &used[0]
+            else:
+                wres = &wacc[c - 1, 0]
+                bres = &bacc[c - 1, 0, 0]
+                mres = &macc[c - 1, 0, 0]
+                qres = &qacc[c - 1, 0, 0]
+                ures = &uacc[c - 1, 0]
+            _bin_elements(&pb, c * n // nchunks, (c + 1) * n // nchunks,
+                          wres, bres, mres, qres, ures)
+
+        # Combine the weighted means and sums of squared deviations of two
+        # sets of values with total weights w1 and w2 and means m1 and m2:
+        # m12 = m1 + (m2 - m1) * w2 / (w1 + w2)
+        # q12 = q1 + q2 + (m2 - m1)**2 * w1 * w2 / (w1 + w2)
+        # Chunks are merged in order, so that the results do not depend on
+        # how the threads were scheduled.
+        for c in range(nchunks - 1):
+            for k in prange(nbins, nogil=True, schedule="static",
+                            num_threads=num_threads):
+                if not uacc[c, k]:
+                    continue
+                w1 = wresult[k]
+                w2 = wacc[c, k]
+                wtot = w1 + w2
+                for fi in range(pb.nf):
+                    m1 = mresult[k, fi]
+                    m2 = macc[c, k, fi]
+                    delta = m2 - m1
+                    bresult[k, fi] += bacc[c, k, fi]
+                    qresult[k, fi] += qacc[c, k, fi]
+                    if wtot != 0:
+                        mresult[k, fi] = m1 + delta * w2 / wtot
+                        qresult[k, fi] += delta * delta * w1 * w2 / wtot
+                wresult[k] = wtot
+                used[k] = 1
+    finally:
+        free(pb.fsrc)
+        free(pb.fscale)
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.cdivision(True)
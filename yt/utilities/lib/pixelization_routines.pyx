@@ -989,10 +989,18 @@ def pixelize_sph_kernel_projection(
         kernel_name="cubic",
         weight_field=None,
         int check_period=1,
-        period=None):
+        period=None,
+        method="integrate"):
+    """
+    Smooth SPH particles onto a buffer of pixels, integrated along the line
+    of sight.  If method is "mip", each pixel instead keeps the largest
+    value of the particles whose kernel covers it, so the buffer should
+    start out at -inf.
+    """
 
     cdef np.intp_t xsize, ysize
     cdef np.float64_t x_min, x_max, y_min, y_max, prefactor_j
+    cdef int mip
     cdef np.int64_t xi, yi, x0, x1, y0, y1
     cdef np.float64_t q_ij2, posx_diff, posy_diff, ih_j2
     cdef np.float64_t x, y, dx, dy, idx, idy, h_j2, px, py
@@ -1004,7 +1012,10 @@ def pixelize_sph_kernel_projection(
     cdef np.float64_t xiterv[2]
     cdef np.float64_t yiterv[2]
 
-    if weight_field is not None:
+    if method not in ("integrate", "mip"):
+        raise NotImplementedError(method)
+    mip = method == "mip"
+    if weight_field is not None and not mip:
         _weight_field = weight_field
 
     xiter[0] = yiter[0] = 0
@@ -1079,7 +1090,9 @@ def pixelize_sph_kernel_projection(
                     ih_j2 = 1.0/h_j2
         
                     prefactor_j = pmass[j] / pdens[j] / hsml[j]**2
-                    if weight_field is None:
+                    if mip:
+                        prefactor_j = quantity_to_smooth[j]
+                    elif weight_field is None:
                         prefactor_j *= quantity_to_smooth[j]
                     else:
                         prefactor_j *= quantity_to_smooth[j] * _weight_field[j]
@@ -1105,6 +1118,10 @@ def pixelize_sph_kernel_projection(
                             if q_ij2 >= 1:
                                 continue
         
+                            if mip:
+                                buff[xi, yi] = fmax(buff[xi, yi], prefactor_j)
+                                continue
+
                             # see equation 32 of the SPLASH paper
                             # now we just use the kernel projection
                             buff[xi, yi] +=  prefactor_j * itab.interpolate(q_ij2)
@@ -1195,16 +1212,43 @@ def interpolate_sph_grid_gather(np.float64_t[:, :, :] buff,
     perform nearest neighbor search and SPH interpolation at the centre of each
     cell in the grid.
     """
+    interpolate_sph_grid_gather_fields(
+        np.asarray(buff)[np.newaxis], tree_positions, bounds, hsml, pmass,
+        pdens, np.asarray(quantity_to_smooth)[np.newaxis], kdtree,
+        use_normalization=use_normalization, kernel_name=kernel_name,
+        pbar=pbar, num_neigh=num_neigh)
 
-    cdef np.float64_t q_ij, h_j2, ih_j2, prefactor_j, smoothed_quantity_j
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def interpolate_sph_grid_gather_fields(np.float64_t[:, :, :, :] buffs,
+        np.float64_t[:, ::1] tree_positions, np.float64_t[:] bounds,
+        np.float64_t[:] hsml, np.float64_t[:] pmass, np.float64_t[:] pdens,
+        np.float64_t[:, :] quantities, PyKDTree kdtree,
+        int use_normalization=1, kernel_name="cubic", pbar=None,
+        int num_neigh=32):
+    """
+    As interpolate_sph_grid_gather, for any number of fields at once.  The
+    neighbors of each cell are only searched for once, and ``buffs[i]``
+    receives the interpolated values of ``quantities[i]``.
+
+    Returns the largest distance between the center of a cell and the
+    furthest of its neighbors.
+    """
+
+    cdef np.float64_t q_ij, h_j2, ih_j2, prefactor_j, w
     cdef np.float64_t dx, dy, dz
     cdef np.float64_t[::1] pos = np.zeros(3, dtype="float64")
     cdef np.float64_t * pos_ptr = &pos[0]
-    cdef int i, j, k, particle, index
+    cdef int i, j, k, f, particle, index
+    cdef int nf = buffs.shape[0]
     cdef BoundedPriorityQueue queue = BoundedPriorityQueue(num_neigh, True)
     cdef np.float64_t[:, :, :] buff_den
     cdef KDTree * ctree = kdtree._tree
     cdef int prog
+    cdef np.float64_t max_h2 = 0.0
+
+    if quantities.shape[0] != nf:
+        raise ValueError("There must be one buffer for each quantity.")
 
     # Which dimensions shall we use for spatial distances?
     cdef axes_range axes
@@ -1212,24 +1256,24 @@ def interpolate_sph_grid_gather(np.float64_t[:, :, :] buff,
 
     # Only allocate memory if we are using normalization
     if use_normalization:
-        buff_den = np.zeros([buff.shape[0], buff.shape[1],
-                             buff.shape[2]], dtype="float64")
+        buff_den = np.zeros([buffs.shape[1], buffs.shape[2],
+                             buffs.shape[3]], dtype="float64")
 
     kernel_func = get_kernel_func(kernel_name)
-    dx = (bounds[1] - bounds[0]) / buff.shape[0]
-    dy = (bounds[3] - bounds[2]) / buff.shape[1]
-    dz = (bounds[5] - bounds[4]) / buff.shape[2]
+    dx = (bounds[1] - bounds[0]) / buffs.shape[1]
+    dy = (bounds[3] - bounds[2]) / buffs.shape[2]
+    dz = (bounds[5] - bounds[4]) / buffs.shape[3]
 
     # Loop through all the positions we want to interpolate the SPH field onto
     pbar = get_pbar(title="Interpolating (gather) SPH field",
-                    maxval=(buff.shape[0]*buff.shape[1]*buff.shape[2] //
+                    maxval=(buffs.shape[1]*buffs.shape[2]*buffs.shape[3] //
                             10000)*10000)
 
     prog = 0
     with nogil:
-        for i in range(0, buff.shape[0]):
-            for j in range(0, buff.shape[1]):
-                for k in range(0, buff.shape[2]):
+        for i in range(0, buffs.shape[1]):
+            for j in range(0, buffs.shape[2]):
+                for k in range(0, buffs.shape[3]):
                     prog += 1
                     if prog % 10000 == 0:
                         with gil:
@@ -1250,6 +1294,8 @@ def interpolate_sph_grid_gather(np.float64_t[:, :, :] buff,
                     # of the furthest nearest neighbor
                     h_j2 = queue.heap[0]
                     ih_j2 = 1.0/h_j2
+                    if h_j2 > max_h2:
+                        max_h2 = h_j2
 
                     # Loop through each nearest neighbor and add contribution to the
                     # buffer
@@ -1260,18 +1306,20 @@ def interpolate_sph_grid_gather(np.float64_t[:, :, :] buff,
                         prefactor_j = (pmass[particle] / pdens[particle] /
                                        hsml[particle]**3)
                         q_ij = math.sqrt(queue.heap[index]*ih_j2)
-                        smoothed_quantity_j = (prefactor_j *
-                                               quantity_to_smooth[particle] *
-                                               kernel_func(q_ij))
+                        w = kernel_func(q_ij)
 
                         # See equations 6, 9, and 11 of the SPLASH paper
-                        buff[i, j, k] += smoothed_quantity_j
+                        for f in range(nf):
+                            buffs[f, i, j, k] += prefactor_j * quantities[f, particle] * w
 
                         if use_normalization:
-                            buff_den[i, j, k] += prefactor_j * kernel_func(q_ij)
+                            buff_den[i, j, k] += prefactor_j * w
 
     if use_normalization:
-        normalization_3d_utility(buff, buff_den)
+        for f in range(nf):
+            normalization_3d_utility(buffs[f], buff_den)
+
+    return math.sqrt(max_h2)
 
 @cython.initializedcheck(False)
 @cython.boundscheck(False)
@@ -1405,14 +1453,103 @@ def pixelize_sph_kernel_arbitrary_grid(np.float64_t[:, :, :] buff,
         np.float64_t[:] quantity_to_smooth,
         bounds, pbar=None, kernel_name="cubic",
         int check_period=1, period=None):
+    pixelize_sph_kernel_arbitrary_grid_fields(
+        np.asarray(buff)[np.newaxis], posx, posy, posz, hsml, pmass, pdens,
+        np.asarray(quantity_to_smooth)[np.newaxis], bounds, pbar=pbar,
+        kernel_name=kernel_name, check_period=check_period, period=period)
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def pixelize_sph_kernel_arbitrary_grid_fields(
+        np.float64_t[:, :, :, :] buffs,
+        np.float64_t[:] posx, np.float64_t[:] posy, np.float64_t[:] posz,
+        np.float64_t[:] hsml, np.float64_t[:] pmass,
+        np.float64_t[:] pdens,
+        np.float64_t[:, :] quantities,
+        bounds, np.float64_t[:, :, :] buff_den=None, pbar=None,
+        kernel_name="cubic", int check_period=1, period=None,
+        int num_threads=1):
+    """
+    Deposit any number of particle fields onto a grid with the SPH kernel
+    of each particle, in a single pass over the particles.
+
+    ``buffs[i]`` receives the smoothed values of ``quantities[i]``, and
+    ``buff_den``, if given, the smoothed value of one, by which the fields
+    may then be normalized.  The grid is split into slabs along its first
+    axis, one per thread, so that no two threads ever add to the same cell
+    and the results do not depend on the number of threads.  The particles
+    are deposited in batches, between which interrupts are checked for and
+    ``pbar`` is updated.
+    """
+    cdef np.float64_t[:, :, :] den
+    cdef np.float64_t gbounds[6]
+    cdef np.float64_t gperiod[3]
+    cdef int use_den = buff_den is not None
+    cdef np.int64_t xsize = buffs.shape[1]
+    cdef np.int64_t nslabs, s
+    cdef np.int64_t npart = posx.shape[0]
+    cdef np.int64_t pstart, pend
+    cdef kernel_func kernel = get_kernel_func(kernel_name)
+
+    if quantities.shape[0] != buffs.shape[0]:
+        raise ValueError("There must be one buffer for each quantity.")
+    if use_den:
+        den = buff_den
+    else:
+        den = np.zeros((1, 1, 1), dtype="float64")
+    for i in range(6):
+        gbounds[i] = bounds[i]
+    gperiod[0] = gperiod[1] = gperiod[2] = 0.0
+    if period is not None:
+        for i in range(3):
+            gperiod[i] = period[i]
+
+    nslabs = max(1, min(num_threads, xsize))
+    for pstart in range(0, npart, 100000):
+        pend = min(pstart + 100000, npart)
+        if nslabs == 1:
+            with nogil:
+                _deposit_sph_slab(buffs, den, use_den, posx, posy, posz, hsml,
+                                  pmass, pdens, quantities, gbounds, gperiod,
+                                  check_period, pstart, pend, 0, xsize, kernel)
+        else:
+            for s in prange(nslabs, nogil=True, schedule="dynamic",
+                            num_threads=nslabs):
+                _deposit_sph_slab(buffs, den, use_den, posx, posy, posz, hsml,
+                                  pmass, pdens, quantities, gbounds, gperiod,
+                                  check_period, pstart, pend,
+                                  s * xsize // nslabs,
+                                  (s + 1) * xsize // nslabs, kernel)
+        PyErr_CheckSignals()
+        if pbar is not None:
+            pbar.update(pend - pstart)
 
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _deposit_sph_slab(np.float64_t[:, :, :, :] buffs,
+        np.float64_t[:, :, :] den, int use_den,
+        np.float64_t[:] posx, np.float64_t[:] posy, np.float64_t[:] posz,
+        np.float64_t[:] hsml, np.float64_t[:] pmass,
+        np.float64_t[:] pdens,
+        np.float64_t[:, :] quantities,
+        np.float64_t *bounds, np.float64_t *period, int check_period,
+        np.int64_t pstart, np.int64_t pend,
+        np.int64_t xstart, np.int64_t xend, kernel_func kernel) nogil:
+    # Adds the particles pstart <= j < pend overlapping the cells
+    # xstart <= xi < xend of the grid to them.
     cdef np.intp_t xsize, ysize, zsize
     cdef np.float64_t x_min, x_max, y_min, y_max, z_min, z_max, prefactor_j
     cdef np.int64_t xi, yi, zi, x0, x1, y0, y1, z0, z1
     cdef np.float64_t q_ij, posx_diff, posy_diff, posz_diff, px, py, pz
     cdef np.float64_t x, y, z, dx, dy, dz, idx, idy, idz, h_j3, h_j2, h_j, ih_j
-    cdef int index, i, j, k, ii, jj, kk
-    cdef np.float64_t period_x, period_y, period_z
+    cdef np.float64_t w
+    cdef np.int64_t j
+    cdef int ii, jj, kk, f
+    cdef int nf = buffs.shape[0]
 
     cdef int xiter[2]
     cdef int yiter[2]
@@ -1424,12 +1561,7 @@ def pixelize_sph_kernel_arbitrary_grid(np.float64_t[:, :, :] buff,
     xiter[0] = yiter[0] = ziter[0] = 0
     xiterv[0] = yiterv[0] = ziterv[0] = 0.0
 
-    if period is not None:
-        period_x = period[0]
-        period_y = period[1]
-        period_z = period[2]
-
-    xsize, ysize, zsize = buff.shape[0], buff.shape[1], buff.shape[2]
+    xsize, ysize, zsize = buffs.shape[1], buffs.shape[2], buffs.shape[3]
     x_min = bounds[0]
     x_max = bounds[1]
     y_min = bounds[2]
@@ -1444,106 +1576,104 @@ def pixelize_sph_kernel_arbitrary_grid(np.float64_t[:, :, :] buff,
     idy = 1.0/dy
     idz = 1.0/dz
 
-    kernel_func = get_kernel_func(kernel_name)
+    for j in range(pstart, pend):
+        xiter[1] = yiter[1] = ziter[1] = 999
+
+        if check_period == 1:
+            if posx[j] - hsml[j] < x_min:
+                xiter[1] = +1
+                xiterv[1] = period[0]
+            elif posx[j] + hsml[j] > x_max:
+                xiter[1] = -1
+                xiterv[1] = -period[0]
+            if posy[j] - hsml[j] < y_min:
+                yiter[1] = +1
+                yiterv[1] = period[1]
+            elif posy[j] + hsml[j] > y_max:
+                yiter[1] = -1
+                yiterv[1] = -period[1]
+            if posz[j] - hsml[j] < z_min:
+                ziter[1] = +1
+                ziterv[1] = period[2]
+            elif posz[j] + hsml[j] > z_max:
+                ziter[1] = -1
+                ziterv[1] = -period[2]
+
+        for ii in range(2):
+            if xiter[ii] == 999: continue
+            px = posx[j] + xiterv[ii]
+            if (px + hsml[j] < x_min) or (px - hsml[j] > x_max): continue
+
+            x0 = <np.int64_t> ( (px - hsml[j] - x_min) * idx)
+            x1 = <np.int64_t> ( (px + hsml[j] - x_min) * idx)
+            x0 = iclip(x0-1, xstart, xend)
+            x1 = iclip(x1+1, xstart, xend)
+            if x0 >= x1: continue
+
+            for jj in range(2):
+                if yiter[jj] == 999: continue
+                py = posy[j] + yiterv[jj]
+                if (py + hsml[j] < y_min) or (py - hsml[j] > y_max): continue
+                for kk in range(2):
+                    if ziter[kk] == 999: continue
+                    pz = posz[j] + ziterv[kk]
+                    if (pz + hsml[j] < z_min) or (pz - hsml[j] > z_max): continue
 
-    with nogil:
-        for j in range(0, posx.shape[0]):
-            if j % 50000 == 0:
-                with gil:
-                    if(pbar is not None):
-                        pbar.update(50000)
-                    PyErr_CheckSignals()
+                    y0 = <np.int64_t> ( (py - hsml[j] - y_min) * idy)
+                    y1 = <np.int64_t> ( (py + hsml[j] - y_min) * idy)
+                    y0 = iclip(y0-1, 0, ysize)
+                    y1 = iclip(y1+1, 0, ysize)
 
-            xiter[1] = yiter[1] = ziter[1] = 999
+                    z0 = <np.int64_t> ( (pz - hsml[j] - z_min) * idz)
+                    z1 = <np.int64_t> ( (pz + hsml[j] - z_min) * idz)
+                    z0 = iclip(z0-1, 0, zsize)
+                    z1 = iclip(z1+1, 0, zsize)
 
-            if check_period == 1:
-                if posx[j] - hsml[j] < x_min:
-                    xiter[1] = +1
-                    xiterv[1] = period_x
-                elif posx[j] + hsml[j] > x_max:
-                    xiter[1] = -1
-                    xiterv[1] = -period_x
-                if posy[j] - hsml[j] < y_min:
-                    yiter[1] = +1
-                    yiterv[1] = period_y
-                elif posy[j] + hsml[j] > y_max:
-                    yiter[1] = -1
-                    yiterv[1] = -period_y
-                if posz[j] - hsml[j] < z_min:
-                    ziter[1] = +1
-                    ziterv[1] = period_z
-                elif posz[j] + hsml[j] > z_max:
-                    ziter[1] = -1
-                    ziterv[1] = -period_z
+                    h_j3 = fmax(hsml[j]*hsml[j]*hsml[j], dx*dy*dz)
+                    h_j = math.cbrt(h_j3)
+                    h_j2 = h_j*h_j
+                    ih_j = 1/h_j
 
-            for ii in range(2):
-                if xiter[ii] == 999: continue
-                px = posx[j] + xiterv[ii]
-                if (px + hsml[j] < x_min) or (px - hsml[j] > x_max): continue
-                for jj in range(2):
-                    if yiter[jj] == 999: continue
-                    py = posy[j] + yiterv[jj]
-                    if (py + hsml[j] < y_min) or (py - hsml[j] > y_max): continue
-                    for kk in range(2):
-                        if ziter[kk] == 999: continue
-                        pz = posz[j] + ziterv[kk]
-                        if (pz + hsml[j] < z_min) or (pz - hsml[j] > z_max): continue
-
-                        x0 = <np.int64_t> ( (px - hsml[j] - x_min) * idx)
-                        x1 = <np.int64_t> ( (px + hsml[j] - x_min) * idx)
-                        x0 = iclip(x0-1, 0, xsize)
-                        x1 = iclip(x1+1, 0, xsize)
-            
-                        y0 = <np.int64_t> ( (py - hsml[j] - y_min) * idy)
-                        y1 = <np.int64_t> ( (py + hsml[j] - y_min) * idy)
-                        y0 = iclip(y0-1, 0, ysize)
-                        y1 = iclip(y1+1, 0, ysize)
-            
-                        z0 = <np.int64_t> ( (pz - hsml[j] - z_min) * idz)
-                        z1 = <np.int64_t> ( (pz + hsml[j] - z_min) * idz)
-                        z0 = iclip(z0-1, 0, zsize)
-                        z1 = iclip(z1+1, 0, zsize)
-            
-                        h_j3 = fmax(hsml[j]*hsml[j]*hsml[j], dx*dy*dz)
-                        h_j = math.cbrt(h_j3)
-                        h_j2 = h_j*h_j
-                        ih_j = 1/h_j
-            
-                        prefactor_j = pmass[j] / pdens[j] / hsml[j]**3
-                        prefactor_j *= quantity_to_smooth[j]
-            
-                        # Now we know which voxels to deposit onto for this particle,
-                        # so loop over them and add this particle's contribution
-                        for xi in range(x0, x1):
-                            x = (xi + 0.5) * dx + x_min
-            
-                            posx_diff = px - x
-                            posx_diff = posx_diff * posx_diff
-                            if posx_diff > h_j2:
+                    prefactor_j = pmass[j] / pdens[j] / hsml[j]**3
+
+                    # Now we know which voxels to deposit onto for this particle,
+                    # so loop over them and add this particle's contribution
+                    for xi in range(x0, x1):
+                        x = (xi + 0.5) * dx + x_min
+
+                        posx_diff = px - x
+                        posx_diff = posx_diff * posx_diff
+                        if posx_diff > h_j2:
+                            continue
+
+                        for yi in range(y0, y1):
+                            y = (yi + 0.5) * dy + y_min
+
+                            posy_diff = py - y
+                            posy_diff = posy_diff * posy_diff
+                            if posy_diff > h_j2:
                                 continue
-            
-                            for yi in range(y0, y1):
-                                y = (yi + 0.5) * dy + y_min
-            
-                                posy_diff = py - y
-                                posy_diff = posy_diff * posy_diff
-                                if posy_diff > h_j2:
+
+                            for zi in range(z0, z1):
+                                z = (zi + 0.5) * dz + z_min
+
+                                posz_diff = pz - z
+                                posz_diff = posz_diff * posz_diff
+                                if posz_diff > h_j2:
                                     continue
-            
-                                for zi in range(z0, z1):
-                                    z = (zi + 0.5) * dz + z_min
-            
-                                    posz_diff = pz - z
-                                    posz_diff = posz_diff * posz_diff
-                                    if posz_diff > h_j2:
-                                        continue
-            
-                                    # see equation 4 of the SPLASH paper
-                                    q_ij = math.sqrt(posx_diff + posy_diff + posz_diff) * ih_j
-                                    if q_ij >= 1:
-                                        continue
-            
-                                    buff[xi, yi, zi] += prefactor_j * kernel_func(q_ij)
+
+                                # see equation 4 of the SPLASH paper
+                                q_ij = math.sqrt(posx_diff + posy_diff + posz_diff) * ih_j
+                                if q_ij >= 1:
+                                    continue
+
+                                # The kernel is evaluated once for every
+                                # field deposited.
+                                w = kernel(q_ij)
+                                for f in range(nf):
+                                    buffs[f, xi, yi, zi] += prefactor_j * quantities[f, j] * w
+                                if use_den:
+                                    den[xi, yi, zi] += prefactor_j * w
 
 
 def pixelize_element_mesh_line(np.ndarray[np.float64_t, ndim=2] coords,
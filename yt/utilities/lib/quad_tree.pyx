@@ -23,7 +23,7 @@ from yt.utilities.exceptions import YTIntDomainOverflow
 
 cdef extern from "platform_dep.h":
     # NOTE that size_t might not be int
-    void *alloca(int)
+    void *alloca(int) nogil
 
 cdef struct QuadTreeNode:
     np.float64_t *val
@@ -33,11 +33,11 @@ cdef struct QuadTreeNode:
 
 ctypedef void QTN_combine(QuadTreeNode *self,
         np.float64_t *val, np.float64_t weight_val,
-        int nvals)
+        int nvals) nogil
 
 cdef void QTN_add_value(QuadTreeNode *self,
         np.float64_t *val, np.float64_t weight_val,
-        int nvals):
+        int nvals) nogil:
     cdef int i
     for i in range(nvals):
         self.val[i] += val[i]
@@ -45,13 +45,13 @@ cdef void QTN_add_value(QuadTreeNode *self,
 
 cdef void QTN_max_value(QuadTreeNode *self,
         np.float64_t *val, np.float64_t weight_val,
-        int nvals):
+        int nvals) nogil:
     cdef int i
     for i in range(nvals):
         self.val[i] = fmax(val[i], self.val[i])
     self.weight_val = 1.0
 
-cdef void QTN_refine(QuadTreeNode *self, int nvals):
+cdef void QTN_refine(QuadTreeNode *self, int nvals) nogil:
     cdef int i, j
     cdef np.int64_t npos[2]
     cdef np.float64_t *tvals = <np.float64_t *> alloca(
@@ -66,7 +66,7 @@ cdef void QTN_refine(QuadTreeNode *self, int nvals):
                         npos, nvals, tvals, 0.0)
 
 cdef QuadTreeNode *QTN_initialize(np.int64_t pos[2], int nvals,
-                        np.float64_t *val, np.float64_t weight_val):
+                        np.float64_t *val, np.float64_t weight_val) nogil:
     cdef QuadTreeNode *node
     cdef int i, j
     node = <QuadTreeNode *> malloc(sizeof(QuadTreeNode))
@@ -112,7 +112,7 @@ cdef class QuadTree:
             self.combine = QTN_max_value
         else:
             raise NotImplementedError
-        self.merged = 1
+        self.merged = 1 if method == "integrate" else -1
         self.max_level = 0
         cdef int i, j
         cdef np.int64_t pos[2]
@@ -144,7 +144,7 @@ cdef class QuadTree:
         self.num_cells = self.top_grid_dims[0] * self.top_grid_dims[1]
         free(vals)
 
-    cdef int count_total_cells(self, QuadTreeNode *root):
+    cdef int count_total_cells(self, QuadTreeNode *root) nogil:
         cdef int total = 0
         cdef int i, j
         if root.children[0][0] == NULL: return 1
@@ -240,7 +240,7 @@ cdef class QuadTree:
     cdef int add_to_position(self,
                  int level, np.int64_t pos[2],
                  np.float64_t *val,
-                 np.float64_t weight_val, int skip = 0):
+                 np.float64_t weight_val, int skip = 0) nogil:
         cdef int i, j, L
         cdef QuadTreeNode *node
         node = self.find_on_root_level(pos, level)
@@ -261,7 +261,8 @@ cdef class QuadTree:
         return 0
 
     @cython.cdivision(True)
-    cdef QuadTreeNode *find_on_root_level(self, np.int64_t pos[2], int level):
+    cdef QuadTreeNode *find_on_root_level(self, np.int64_t pos[2],
+                                          int level) nogil:
         # We need this because the root level won't just have four children
         # So we find on the root level, then we traverse the tree.
         cdef np.int64_t i, j
@@ -301,19 +302,24 @@ cdef class QuadTree:
             np.ndarray[np.float64_t, ndim=2] pvals,
             np.ndarray[np.float64_t, ndim=1] pweight_vals):
         cdef int ps = pxs.shape[0]
-        cdef int p, rv
+        cdef int p, rv = 0
         cdef np.float64_t *vals
         cdef np.float64_t *data = <np.float64_t *> pvals.data
         cdef np.int64_t pos[2]
-        for p in range(ps):
-            vals = data + self.nvals*p
-            pos[0] = pxs[p]
-            pos[1] = pys[p]
-            rv = self.add_to_position(level[p], pos, vals, pweight_vals[p])
-            if rv == -1:
-                raise YTIntDomainOverflow(
-                    (self.last_dims[0], self.last_dims[1]),
-                    (self.top_grid_dims[0], self.top_grid_dims[1]))
+        # The tree is only ever modified by one thread at a time, so other
+        # threads can fill their own trees while this one does.
+        with nogil:
+            for p in range(ps):
+                vals = data + self.nvals*p
+                pos[0] = pxs[p]
+                pos[1] = pys[p]
+                rv = self.add_to_position(level[p], pos, vals, pweight_vals[p])
+                if rv == -1:
+                    break
+        if rv == -1:
+            raise YTIntDomainOverflow(
+                (self.last_dims[0], self.last_dims[1]),
+                (self.top_grid_dims[0], self.top_grid_dims[1]))
         return
 
     @cython.boundscheck(False)
@@ -531,7 +537,7 @@ cdef class QuadTree:
         free(self.root_nodes)
 
 cdef void QTN_merge_nodes(QuadTreeNode *n1, QuadTreeNode *n2, int nvals,
-                          QTN_combine *func):
+                          QTN_combine *func) nogil:
     # We have four choices when merging nodes.
     # 1. If both nodes have no refinement, then we add values of n2 to n1.
     # 2. If both have refinement, we call QTN_merge_nodes on all four children.
@@ -552,10 +558,7 @@ cdef void QTN_merge_nodes(QuadTreeNode *n1, QuadTreeNode *n2, int nvals,
             for j in range(2):
                 n1.children[i][j] = n2.children[i][j]
                 n2.children[i][j] = NULL
-    elif n1.children[0][0] != NULL and n2.children[0][0] == NULL:
-        pass
-    else:
-        raise RuntimeError
+    # Otherwise n1 has refinement and n2 does not, and we are done.
 
 def merge_quadtrees(QuadTree qt1, QuadTree qt2, method = 1):
     cdef int i, j
@@ -571,10 +574,11 @@ def merge_quadtrees(QuadTree qt1, QuadTree qt2, method = 1):
         raise NotImplementedError
     if qt1.merged != 0 or qt2.merged != 0:
         assert(qt1.merged == qt2.merged)
-    for i in range(qt1.top_grid_dims[0]):
-        for j in range(qt1.top_grid_dims[1]):
-            QTN_merge_nodes(qt1.root_nodes[i][j],
-                            qt2.root_nodes[i][j],
-                            qt1.nvals, func)
-            qt1.num_cells += qt1.count_total_cells(
-                                qt1.root_nodes[i][j])
+    with nogil:
+        for i in range(qt1.top_grid_dims[0]):
+            for j in range(qt1.top_grid_dims[1]):
+                QTN_merge_nodes(qt1.root_nodes[i][j],
+                                qt2.root_nodes[i][j],
+                                qt1.nvals, func)
+                qt1.num_cells += qt1.count_total_cells(
+                                    qt1.root_nodes[i][j])
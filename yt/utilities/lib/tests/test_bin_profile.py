@@ -0,0 +1,71 @@
+import numpy as np
+
+from yt.testing import assert_allclose, assert_equal
+from yt.utilities.lib.misc_utilities import bin_profile, new_bin_profile2d
+
+
+def _reference_profile(x, y, fields, weight, x_bins, y_bins):
+    pfilter = (x > x_bins[0]) & (x < x_bins[-1]) & (y > y_bins[0]) & (y < y_bins[-1])
+    shape = (x_bins.size - 1, y_bins.size - 1)
+    wresult = np.zeros(shape)
+    bresult = np.zeros(shape + (fields.shape[1],))
+    mresult = np.zeros_like(bresult)
+    qresult = np.zeros_like(bresult)
+    used = np.zeros(shape, dtype="bool")
+    new_bin_profile2d(
+        np.digitize(x[pfilter], x_bins) - 1,
+        np.digitize(y[pfilter], y_bins) - 1,
+        weight[pfilter],
+        np.ascontiguousarray(fields[pfilter]),
+        wresult,
+        bresult,
+        mresult,
+        qresult,
+        used,
+    )
+    return wresult, bresult, mresult, qresult, used
+
+
+def test_bin_profile():
+    np.random.seed(0x4D3D3D3)
+    n = 400000
+    x = 10 ** np.random.uniform(-3, 3, n)
+    y = np.random.uniform(0, 1, n)
+    y[::97] = np.nan
+    fields = np.random.random((n, 2))
+    weight = np.random.random(n)
+    weight[::13] = 0.0
+    x_bins = np.logspace(-2, 2, 33)
+    # Edges that are not evenly spaced still give the right bins.
+    y_bins = np.sort(np.random.uniform(0.1, 0.9, 17))
+    # Values are scaled as they are read.
+    scale = 1e-5
+    answer = _reference_profile(x * scale, y, fields, weight, x_bins * scale, y_bins)
+
+    nbins = (x_bins.size - 1) * (y_bins.size - 1)
+    for num_threads in (1, 4):
+        wresult = np.zeros(nbins)
+        bresult = np.zeros((nbins, 2))
+        mresult = np.zeros_like(bresult)
+        qresult = np.zeros_like(bresult)
+        used = np.zeros(nbins, dtype="uint8")
+        bin_profile(
+            [x, y],
+            [scale, 1.0],
+            [x_bins * scale, y_bins],
+            [True, False],
+            [fields[:, 0], fields[:, 1]],
+            [1.0, 1.0],
+            weight,
+            1.0,
+            wresult,
+            bresult,
+            mresult,
+            qresult,
+            used,
+            num_threads=num_threads,
+        )
+        results = (wresult, bresult, mresult, qresult)
+        for result, ref in zip(results, answer):
+            assert_allclose(result.reshape(ref.shape), ref, rtol=1e-10)
+        assert_equal(used.reshape(answer[-1].shape).astype("bool"), answer[-1])
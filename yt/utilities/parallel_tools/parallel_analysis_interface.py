@@ -67,7 +67,9 @@ def default_mpi_excepthook(exception_type, exception_value, tb):
     MPI.COMM_WORLD.Abort(1)
 
 
-def enable_parallelism(suppress_logging=False, communicator=None):
+def enable_parallelism(
+    suppress_logging=False, communicator=None, backend="mpi", nprocs=None
+):
     """
     This method is used inside a script to turn on MPI parallelism, via
     mpi4py.  More information about running yt in parallel can be found
@@ -82,8 +84,21 @@ def enable_parallelism(suppress_logging=False, communicator=None):
     communicator : mpi4py.MPI.Comm
         The MPI communicator to use. This controls which processes yt can see.
         If not specified, will be set to COMM_WORLD.
+
+    backend : str
+        Either "mpi", or "processes" to run the loops of parallel_objects and
+        DatasetSeries.piter in worker processes forked on the local machine,
+        without MPI.  Other operations still run serially in that case.
+
+    nprocs : int
+        The number of processes used by the "processes" backend.  Defaults to
+        the number of CPUs.
     """
     global parallel_capable, MPI
+    if backend == "processes":
+        return _enable_process_parallelism(nprocs)
+    elif backend != "mpi":
+        raise ValueError(f"Unknown parallelism backend: {backend}")
     try:
         from mpi4py import MPI as _MPI
     except ImportError:
@@ -150,6 +165,19 @@ def enable_parallelism(suppress_logging=False, communicator=None):
     return True
 
 
+def _enable_process_parallelism(nprocs=None):
+    if not hasattr(os, "fork"):
+        mylog.info("os.fork is not available. Disabling parallel computation")
+        return False
+    if nprocs is None:
+        nprocs = os.cpu_count() or 1
+    ytcfg["yt", "__parallel_processes"] = str(nprocs)
+    if nprocs < 2:
+        return False
+    mylog.info("Parallel computation enabled over %s local processes", nprocs)
+    return True
+
+
 # Because the dtypes will == correctly but do not hash the same, we need this
 # function for dictionary access.
 def get_mpi_type(dtype):
@@ -436,7 +464,15 @@ class ResultsStorage:
     result_id = None
 
 
-def parallel_objects(objects, njobs=0, storage=None, barrier=True, dynamic=False):
+def parallel_objects(
+    objects,
+    njobs=0,
+    storage=None,
+    barrier=True,
+    dynamic=False,
+    preload=None,
+    processes=None,
+):
     r"""This function dispatches components of an iterable to different
     processors.
 
@@ -474,6 +510,25 @@ def parallel_objects(objects, njobs=0, storage=None, barrier=True, dynamic=False
         128 processors available, only 127 will be available to iterate over
         objects as one will be load balancing the rest.
 
+    preload : callable, optional
+        Given an iterator over the pairs of an index and an object assigned to
+        this processor, returns an iterator over the same pairs with each
+        object replaced by the one to yield.  This lets
+        :meth:`~yt.data_objects.time_series.DatasetSeries.piter` load the next
+        datasets of a processor while it is busy with one.  It is not used
+        with dynamic load balancing.
+    processes : bool, optional
+        Whether the objects may be dispatched to worker processes if
+        parallelism was enabled with ``backend="processes"``.  Worker
+        processes only send back the results in *storage*, so by default only
+        loops that pass *storage* are dispatched to them; other loops run
+        serially, in the calling process.
+
+    If parallelism was enabled with ``backend="processes"`` and *processes* is
+    true, the objects are instead dispatched to worker processes forked on the
+    local machine, as many as *njobs* if it is set.  With dynamic load
+    balancing, every one of these processes iterates over objects.
+
 
     Examples
     --------
@@ -498,6 +553,20 @@ def parallel_objects(objects, njobs=0, storage=None, barrier=True, dynamic=False
     ...
 
     """
+    nprocs = ytcfg.getint("yt", "__parallel_processes")
+    if processes is None:
+        processes = storage is not None
+    if nprocs > 1 and not parallel_capable and processes:
+        from .worker_processes import process_parallel_objects
+
+        if njobs > 0:
+            nprocs = min(njobs, nprocs)
+        for my_obj in process_parallel_objects(
+            objects, nprocs, storage=storage, dynamic=dynamic, preload=preload
+        ):
+            yield my_obj
+        return
+
     if dynamic:
         from .task_queue import dynamic_parallel_objects
 
@@ -530,6 +599,8 @@ def parallel_objects(objects, njobs=0, storage=None, barrier=True, dynamic=False
     # If our objects object is slice-aware, like time series data objects are,
     # this will prevent intermediate objects from being created.
     oiter = itertools.islice(enumerate(objects), my_new_id, None, njobs)
+    if preload is not None:
+        oiter = preload(oiter)
     for result_id, obj in oiter:
         if storage is not None:
             rstore = ResultsStorage()
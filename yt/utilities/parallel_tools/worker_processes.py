@@ -0,0 +1,243 @@
+import atexit
+import inspect
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import signal
+import sys
+import threading
+import traceback
+
+import yt.utilities.logger
+from yt.config import ytcfg
+from yt.utilities.logger import ytLogger as mylog
+
+from .parallel_analysis_interface import ResultsStorage
+
+
+def _claim(counter):
+    # Hands out the index of the next object not yet claimed by any worker.
+    with counter.get_lock():
+        result_id = counter.value
+        counter.value += 1
+    return result_id
+
+
+def _iterate(objects, worker_id, nworkers, storage, counter, results, preload):
+    if counter is None:
+        # If our objects object is slice-aware, like time series data objects
+        # are, this will prevent intermediate objects from being created.
+        oiter = itertools.islice(enumerate(objects), worker_id, None, nworkers)
+        if preload is not None:
+            oiter = preload(oiter)
+    else:
+        oiter = enumerate(objects)
+        next_id = _claim(counter)
+    for result_id, obj in oiter:
+        if counter is not None and result_id < next_id:
+            continue
+        if storage is not None:
+            rstore = ResultsStorage()
+            rstore.result_id = result_id
+            yield rstore, obj
+            results[rstore.result_id] = rstore.result
+        else:
+            yield obj
+        if counter is not None:
+            next_id = _claim(counter)
+
+
+def _setup_worker(worker_id):
+    # Loops nested in this one run serially in each worker.
+    ytcfg["yt", "__parallel_processes"] = "1"
+    f = logging.Formatter("W%03i %s" % (worker_id, yt.utilities.logger.ufstring))
+    if len(yt.utilities.logger.ytLogger.handlers) > 0:
+        yt.utilities.logger.ytLogger.handlers[0].setFormatter(f)
+
+
+def _send_and_exit(fd, status, results, error):
+    # Sends back what a worker found and ends its process, rather than going
+    # on with the rest of the script.
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((status, results, error), f, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(status)
+
+
+def _report_when_left(fd, results, worker_id):
+    # The loop of a worker has been left before its end.  An error raised in
+    # the body of the loop propagates in the frames of the caller, and never
+    # reaches the generators running the loop, so it is caught as pdb would:
+    # the frames of the caller are traced until they handle the error, or go
+    # on after a ``break``.
+    def report(*exc_info):
+        sys.settrace(None)
+        if exc_info[0] is None:
+            error = f"Worker {worker_id} left its loop before the end."
+        else:
+            error = "".join(traceback.format_exception(*exc_info))
+        _send_and_exit(fd, 1, results, error)
+
+    def trace(frame, event, arg):
+        # The generators enclosing this one are resumed to be closed as well,
+        # before anything else runs.
+        caller = frame
+        while caller is not None:
+            if caller in closing or caller.f_code is report.__code__:
+                return None
+            caller = caller.f_back
+        if event == "call" and frame.f_code.co_flags & inspect.CO_GENERATOR:
+            closing.append(frame)
+            return None
+        exc_info = arg if event == "exception" else sys.exc_info()
+        if event == "return" or exc_info[0] is GeneratorExit:
+            return trace
+        # The first line of a handler runs before the error is available.
+        if exc_info[0] is None and not waited:
+            waited.append(frame)
+            return trace
+        report(*exc_info)
+
+    closing = []
+    waited = []
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_flags & inspect.CO_GENERATOR:
+            closing.append(frame)
+        else:
+            frame.f_trace = trace
+        frame = frame.f_back
+    # The loop may also be at the top level of the script, in which case the
+    # error, if any, goes straight to sys.excepthook.
+    sys.excepthook = report
+    atexit.register(report, None, None, None)
+    sys.settrace(trace)
+
+
+def _run_worker(objects, worker_id, nworkers, storage, counter, preload, fd):
+    # The loop over the objects of a worker runs in the process forked for
+    # it.  Once the loop is over, or has been left early, the results are
+    # sent back and the process exits, rather than going on with the rest of
+    # the script.
+    results = {}
+    try:
+        _setup_worker(worker_id)
+        yield from _iterate(
+            objects, worker_id, nworkers, storage, counter, results, preload
+        )
+    except GeneratorExit:
+        _report_when_left(fd, results, worker_id)
+        raise
+    except BaseException:
+        # Errors raised while iterating over the objects themselves.
+        _send_and_exit(fd, 1, results, traceback.format_exc())
+    _send_and_exit(fd, 0, results, None)
+
+
+def _collect(worker_id, pid, fd):
+    try:
+        with os.fdopen(fd, "rb") as f:
+            status, results, error = pickle.load(f)
+    except (EOFError, pickle.UnpicklingError):
+        status, results, error = 1, {}, "It stopped without sending its results."
+    os.waitpid(pid, 0)
+    if status != 0:
+        raise RuntimeError(f"Worker process {worker_id} failed:\n{error}")
+    return results
+
+
+def process_parallel_objects(
+    objects, nprocs, storage=None, dynamic=False, preload=None
+):
+    r"""Dispatch the objects of an iterable to *nprocs* processes.
+
+    This is the backend of
+    :func:`~yt.utilities.parallel_tools.parallel_analysis_interface.parallel_objects`
+    when parallelism is enabled with ``backend="processes"``.  The calling
+    process forks a worker for every process but one, and each process, the
+    calling one included, runs the body of the loop over its own share of the
+    objects.  The results stored by each worker are sent back to the calling
+    process, which alone carries on once every worker is done.
+
+    Parameters
+    ----------
+    objects : Iterable
+        The list of objects to dispatch to different processes.
+    nprocs : int
+        The number of processes, the calling one included.
+    storage : dict
+        This is a dictionary, which will be filled with results during the
+        course of the iteration.
+    dynamic : bool
+        If True, each process takes the next object not yet taken by any
+        other once it is done with one.  Otherwise, process ``i`` iterates
+        over objects ``i``, ``i + nprocs``, ``i + 2 * nprocs`` and so on.
+    preload : callable, optional
+        As for parallel_objects, applied by each process to the objects
+        assigned to it when the load is not balanced dynamically.
+
+    Notes
+    -----
+    A process forked while other threads are running only has a copy of the
+    thread that forked it, and any lock held by the others at that time stays
+    held forever in the copy.  This is why the objects are iterated over
+    serially, in the calling process, if any other thread is alive, such as
+    those reading chunks ahead of time (``io_prefetch_depth``) or loading the
+    next datasets of a series (``prefetch_datasets``).  A loop dispatched to
+    worker processes should therefore not be nested in a loop using these.
+    Errors raised in a worker are raised again in the calling process, as a
+    RuntimeError holding their traceback.
+    """
+    if nprocs > 1 and threading.active_count() > 1:
+        mylog.warning(
+            "Running a parallel loop serially, as worker processes "
+            "cannot be forked safely while other threads are running."
+        )
+        nprocs = 1
+    counter = None
+    if dynamic:
+        counter = multiprocessing.get_context("fork").Value("q", 0)
+    workers = []
+    # Output buffered before the fork would otherwise be printed by every
+    # process.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for worker_id in range(1, nprocs):
+        rfd, wfd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(rfd)
+            for _, _, fd in workers:
+                os.close(fd)
+            yield from _run_worker(
+                objects, worker_id, nprocs, storage, counter, preload, wfd
+            )
+        os.close(wfd)
+        workers.append((worker_id, pid, rfd))
+
+    all_results = {}
+    try:
+        old_nprocs = ytcfg.get("yt", "__parallel_processes")
+        ytcfg["yt", "__parallel_processes"] = "1"
+        try:
+            yield from _iterate(
+                objects, 0, nprocs, storage, counter, all_results, preload
+            )
+        finally:
+            ytcfg["yt", "__parallel_processes"] = old_nprocs
+        while workers:
+            worker_id, pid, fd = workers.pop(0)
+            all_results.update(_collect(worker_id, pid, fd))
+    finally:
+        # The loop was left early, so the remaining workers are stopped.
+        for _, pid, fd in workers:
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+            os.close(fd)
+    if storage is not None:
+        storage.update(all_results)
@@ -2,7 +2,8 @@ import itertools
 
 import numpy as np
 
-from yt.testing import assert_almost_equal, fake_amr_ds
+from yt.testing import assert_almost_equal, assert_equal, fake_amr_ds
+from yt.utilities.amr_kdtree.api import AMRKDTree
 
 
 def test_amr_kdtree_set_fields():
@@ -24,3 +25,30 @@ def test_amr_kdtree_set_fields():
                 else:
                     data = np.log10(block.my_data[i])
                 assert_almost_equal(gold[iblock][i], data)
+
+
+def test_amr_kdtree_build_bricks():
+    ds = fake_amr_ds(fields=["density", "pressure"])
+    fields = ds.field_list
+    for no_ghost in (True, False):
+        kd = AMRKDTree(ds)
+        kd.set_fields(fields, [True, False], no_ghost)
+        bricks = [block.my_data for block in kd.traverse()]
+        assert_equal(len(bricks), len(kd.bricks))
+
+        # Every brick is cut from the vertex-centered data of its grid.
+        for node in kd.tree.trunk.kd_traverse():
+            grid = ds.index.grids[node.grid - kd._id_offset]
+            vcd = grid.get_vertex_centered_data(fields, no_ghost=no_ghost)
+            li = np.rint((node.get_left_edge() - grid.LeftEdge.d) / grid.dds.d)
+            ri = np.rint((node.get_right_edge() - grid.LeftEdge.d) / grid.dds.d)
+            sl = tuple(slice(int(l), int(r) + 1) for l, r in zip(li, ri))
+            assert_almost_equal(node.data.my_data[0], np.log10(vcd[fields[0]][sl]))
+            assert_equal(node.data.my_data[1], vcd[fields[1]][sl])
+
+        # Bricks of a subset of the fields are cut from cached data.
+        misses = kd.vcd_cache.misses
+        kd.set_fields(fields[1:], [False], no_ghost)
+        assert_equal(kd.vcd_cache.misses, misses)
+        for node in kd.tree.trunk.kd_traverse():
+            assert_equal(node.data.my_data, bricks.pop(0)[1:])
@@ -11,7 +11,7 @@ from yt.testing import (
 )
 from yt.units.yt_array import YTArray, YTQuantity
 from yt.utilities.answer_testing.framework import data_dir_load
-from yt.utilities.cosmology import Cosmology
+from yt.utilities.cosmology import Cosmology, IntegralTable
 from yt.utilities.on_demand_imports import _yaml as yaml
 
 local_dir = os.path.dirname(os.path.abspath(__file__))
@@ -196,6 +196,42 @@ def test_z_t_analytic():
         )
 
 
+def test_array_inputs():
+    """
+    Make sure distances and times of arrays of redshifts match those of
+    each redshift.
+    """
+
+    co = Cosmology()
+    z = np.linspace(0, 10, 21)
+    for fname in ("comoving_radial_distance", "lookback_time", "luminosity_distance"):
+        func = getattr(co, fname)
+        values = func(0.5, z)
+        for i, zz in enumerate(z):
+            assert_rel_equal(values[i], func(0.5, zz), 12)
+    t = co.t_from_z(z)
+    assert_rel_equal(t[3], co.t_from_z(z[3]), 12)
+    assert_rel_equal(co.z_from_t(t), z, 10)
+    assert_equal(co.z_from_t(co.t_from_z(0)), 0)
+
+
+def test_integral_table():
+    """
+    Test the tabulated integrals against analytic ones.
+    """
+
+    x = np.linspace(-20, 20, 1000)
+    table = IntegralTable(np.exp)
+    assert_rel_equal(table(x), np.expm1(x), 10)
+    # The inverse is ill-conditioned where the function is small.
+    x = x[x > -5]
+    assert_rel_equal(table.inverse(np.expm1(x)), x, 10)
+
+    table = IntegralTable(lambda x: np.exp(-x), origin=np.inf)
+    assert_rel_equal(table(x), -np.exp(-x), 10)
+    assert_rel_equal(table.inverse(-np.exp(-x)), x, 10)
+
+
 def test_dark_factor():
     """
     Test that dark factor returns same value for when not
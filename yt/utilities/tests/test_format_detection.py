@@ -0,0 +1,153 @@
+import os
+import tempfile
+
+from yt.testing import assert_equal
+from yt.utilities.format_detection import (
+    HDF5_SIGNATURE,
+    PathProbe,
+    forget_formats,
+    recall_format,
+    remember_format,
+)
+
+
+class AnyFormat:
+    _file_extensions = None
+    _file_signatures = None
+    _dir_signature = None
+
+
+class HDF5Format(AnyFormat):
+    _file_signatures = (HDF5_SIGNATURE,)
+
+
+class DatFormat(AnyFormat):
+    _file_extensions = (".dat",)
+
+
+class HeaderDirFormat(AnyFormat):
+    _dir_signature = ("Header",)
+
+
+def test_path_probe():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        h5_fn = os.path.join(tmpdir, "plain.h5")
+        with open(h5_fn, "wb") as f:
+            f.write(HDF5_SIGNATURE + b"\0" * 100)
+        # An HDF5 file with a user block before the superblock
+        ub_fn = os.path.join(tmpdir, "userblock.dat")
+        with open(ub_fn, "wb") as f:
+            f.write(b"\0" * 1024 + HDF5_SIGNATURE + b"\0" * 100)
+        text_fn = os.path.join(tmpdir, "output.dat")
+        with open(text_fn, "w") as f:
+            f.write("not hdf5\n")
+        with open(os.path.join(tmpdir, "Header"), "w") as f:
+            f.write("header\n")
+
+        expected = {
+            h5_fn: [True, True, False, False],
+            ub_fn: [True, True, True, False],
+            text_fn: [True, False, True, False],
+            # Signatures do not rule out directories.
+            tmpdir: [True, True, False, True],
+        }
+        formats = [AnyFormat, HDF5Format, DatFormat, HeaderDirFormat]
+        for fn, matches in expected.items():
+            probe = PathProbe(fn)
+            assert_equal([probe.matches(cls) for cls in formats], matches)
+
+
+def test_remembered_formats():
+    forget_formats()
+    try:
+        remember_format("/data/run/DD0010/output_0010", HDF5Format)
+        assert recall_format("/data/run/DD0020/output_0020") is HDF5Format
+        assert recall_format("/data/run/DD0020/other_0020") is None
+        # Different keyword arguments may need a different format.
+        assert recall_format("/data/run/DD0020/output_0020", (), {"a": 1}) is None
+        remember_format("/data/run/DD0030/output_0030", DatFormat)
+        assert recall_format("/data/run/DD0010/output_0010") is DatFormat
+    finally:
+        forget_formats()
+
+
+class ParentFormat(AnyFormat):
+    def __init__(self, fn):
+        self.filename = fn
+
+    @classmethod
+    def _is_valid(cls, fn):
+        return True
+
+
+class ChildFormat(ParentFormat):
+    pass
+
+
+def test_remembered_format_subclasses():
+    # A remembered format gives way to a more specialised one that is also
+    # valid for a path.
+    from unittest import mock
+
+    from yt.data_objects.static_output import output_type_registry
+    from yt.loaders import load
+
+    registry = {"ParentFormat": ParentFormat, "ChildFormat": ChildFormat}
+    forget_formats()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fn = os.path.join(tmpdir, "output_0010")
+            open(fn, "w").close()
+            remember_format(fn, ParentFormat)
+            with mock.patch.dict(output_type_registry, registry, clear=True):
+                assert type(load(fn)) is ChildFormat
+                assert recall_format(fn) is ChildFormat
+    finally:
+        forget_formats()
+
+
+class InvalidFormat(ParentFormat):
+    @classmethod
+    def _is_valid(cls, fn):
+        return False
+
+
+class OtherFormat(ParentFormat):
+    pass
+
+
+def test_stale_remembered_format():
+    # A remembered format that is not valid for a path is only a hint: the
+    # full search runs, and still finds ambiguous paths.
+    from unittest import mock
+
+    from yt.data_objects.static_output import output_type_registry
+    from yt.loaders import load
+    from yt.testing import assert_raises
+    from yt.utilities.exceptions import YTAmbiguousDataType
+
+    forget_formats()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fn = os.path.join(tmpdir, "output_0010")
+            open(fn, "w").close()
+            registry = {"InvalidFormat": InvalidFormat, "ChildFormat": ChildFormat}
+            remember_format(fn, InvalidFormat)
+            with mock.patch.dict(output_type_registry, registry, clear=True):
+                assert type(load(fn)) is ChildFormat
+                assert recall_format(fn) is ChildFormat
+
+            registry["OtherFormat"] = OtherFormat
+            remember_format(fn, InvalidFormat)
+            with mock.patch.dict(output_type_registry, registry, clear=True):
+                assert_raises(YTAmbiguousDataType, load, fn)
+                assert recall_format(fn) is InvalidFormat
+
+            # So are paths for which several subclasses of the remembered
+            # format are valid.
+            registry["ParentFormat"] = ParentFormat
+            remember_format(fn, ParentFormat)
+            with mock.patch.dict(output_type_registry, registry, clear=True):
+                assert_raises(YTAmbiguousDataType, load, fn)
+    finally:
+        forget_formats()
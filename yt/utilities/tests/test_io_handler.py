@@ -0,0 +1,70 @@
+import numpy as np
+
+from yt.config import ytcfg
+from yt.testing import assert_equal, assert_raises
+from yt.utilities.io_handler import BaseIOHandler, IOCache
+
+
+def _read_prefetched(depth, chunks, stop=None):
+    old_depth = ytcfg.get("yt", "io_prefetch_depth")
+    ytcfg["yt", "io_prefetch_depth"] = str(depth)
+    reads = []
+
+    def read_chunk(chunk):
+        reads.append(chunk)
+        return chunk * 2
+
+    try:
+        io = BaseIOHandler(None)
+        rv = []
+        for chunk, data in io._prefetch(chunks, read_chunk):
+            rv.append((chunk, data))
+            if chunk == stop:
+                break
+    finally:
+        ytcfg["yt", "io_prefetch_depth"] = old_depth
+    return rv, reads
+
+
+def test_prefetch_order():
+    expected = [(i, 2 * i) for i in range(20)]
+    for depth in (0, 1, 4, 50):
+        rv, reads = _read_prefetched(depth, range(20))
+        assert_equal(rv, expected)
+        assert_equal(sorted(reads), list(range(20)))
+
+
+def test_prefetch_bounded():
+    # Stopping early should leave at most ``depth`` chunks read past the
+    # last one we looked at.
+    for depth in (0, 1, 3):
+        rv, reads = _read_prefetched(depth, iter(range(100)), stop=10)
+        assert_equal(len(rv), 11)
+        assert len(reads) <= 11 + depth
+
+
+def test_io_cache_lru():
+    cache = IOCache(max_bytes=3 * 800)
+    for i in range(3):
+        cache.put((i, "density"), np.ones(100))
+    assert_equal(len(cache), 3)
+    assert_equal(cache.nbytes, 2400)
+    # touch the oldest so that the second one is evicted next
+    assert cache.get((0, "density")) is not None
+    cache.put((3, "density"), np.ones(100))
+    assert (1, "density") not in cache
+    assert (0, "density") in cache
+    assert_equal(cache.get((1, "density")), None)
+    assert_equal((cache.hits, cache.misses), (1, 1))
+    # cached arrays are shared, so they must not be modified in place
+    data = cache.get((3, "density"))
+    with assert_raises(ValueError):
+        data[0] = 2.0
+    # an array larger than the whole budget is never stored
+    cache.put((4, "density"), np.ones(1000))
+    assert (4, "density") not in cache
+    cache.max_bytes = 800
+    assert_equal(len(cache), 1)
+    assert_equal(cache.nbytes, 800)
+    cache.clear()
+    assert_equal((len(cache), cache.nbytes, cache.hits, cache.misses), (0, 0, 0, 0))
@@ -16,6 +16,7 @@ from yt.loaders import load_uniform_grid
 from yt.utilities.lib.api import add_points_to_greyscale_image
 from yt.utilities.lib.pixelization_routines import pixelize_cylinder
 from yt.utilities.on_demand_imports import _h5py as h5py
+from yt.utilities.parallel_tools.parallel_analysis_interface import parallel_objects
 
 from .fixed_resolution_filters import apply_filter, filter_registry
 from .volume_rendering.api import off_axis_projection
@@ -702,14 +703,64 @@ class ParticleImageBuffer(FixedResolutionBuffer):
                 b = float(b.in_units("code_length"))
             bounds.append(b)
 
+        # The particles are splatted one IO chunk at a time, so that only the
+        # particles of a single chunk are ever held in memory.
+        dd = self.data_source.dd
+        weight_field = self.data_source.weight_field
+        buff = np.zeros(self.buff_size)
+        buff_mask = np.zeros(self.buff_size, dtype="int")
+        if weight_field is not None:
+            weight_buff = np.zeros(self.buff_size)
+            weight_buff_mask = np.zeros(self.buff_size, dtype="int")
+        units = weight_units = None
         ftype = item[0]
-        x_data = self.data_source.dd[ftype, self.x_field]
-        y_data = self.data_source.dd[ftype, self.y_field]
-        data = self.data_source.dd[item]
+        for chunk in parallel_objects(dd.chunks([], "io")):
+            data = chunk[item]
+            if data.size == 0:
+                continue
+            if units is None:
+                units = data.units
+            px, py, mask = self._pixel_positions(chunk, ftype, bounds)
+            data = data.in_units(units).d[mask]
+            if weight_field is None:
+                weight_data = None
+            else:
+                weight_data = chunk[weight_field]
+                if weight_units is None:
+                    weight_units = weight_data.units
+                weight_data = weight_data.in_units(weight_units).d[mask]
+                add_points_to_greyscale_image(
+                    weight_buff, weight_buff_mask, px, py, weight_data
+                )
+                data *= weight_data
+            add_points_to_greyscale_image(buff, buff_mask, px, py, data)
+
+        if dd.comm.size > 1:
+            buff = dd.comm.mpi_allreduce(buff, op="sum")
+            buff_mask = dd.comm.mpi_allreduce(buff_mask, op="max")
+            if weight_field is not None:
+                weight_buff = dd.comm.mpi_allreduce(weight_buff, op="sum")
+                weight_buff_mask = dd.comm.mpi_allreduce(weight_buff_mask, op="max")
+        if units is None:
+            units = dd.ds._get_field_info(*item).units
+
+        # remove values in no-particle region
+        buff[buff_mask == 0] = np.nan
+        ia = ImageArray(buff, units=units, info=self._get_info(item))
+
+        # divide by the weight_field, if needed
+        if weight_field is not None:
+            locs = np.where((weight_buff_mask > 0) & (weight_buff > 0))
+            ia[locs] /= weight_buff[locs]
+
+        self.data[item] = ia
+        return self.data[item]
 
-        # handle periodicity
-        dx = x_data.in_units("code_length").d - bounds[0]
-        dy = y_data.in_units("code_length").d - bounds[2]
+    def _pixel_positions(self, chunk, ftype, bounds):
+        # The fractional image coordinates of the particles of chunk, and
+        # which of them actually show up in the image.
+        dx = chunk[ftype, self.x_field].to("code_length").d - bounds[0]
+        dy = chunk[ftype, self.y_field].to("code_length").d - bounds[2]
         if self.periodic:
             dx %= float(self._period[0].in_units("code_length"))
             dy %= float(self._period[1].in_units("code_length"))
@@ -722,39 +773,7 @@ class ParticleImageBuffer(FixedResolutionBuffer):
         mask = np.logical_and(
             np.logical_and(px >= 0.0, px <= 1.0), np.logical_and(py >= 0.0, py <= 1.0)
         )
-
-        weight_field = self.data_source.weight_field
-        if weight_field is None:
-            weight_data = np.ones_like(data.v)
-        else:
-            weight_data = self.data_source.dd[weight_field]
-        splat_vals = weight_data[mask] * data[mask]
-
-        # splat particles
-        buff = np.zeros(self.buff_size)
-        buff_mask = np.zeros(self.buff_size).astype("int")
-        add_points_to_greyscale_image(buff, buff_mask, px[mask], py[mask], splat_vals)
-        # remove values in no-particle region
-        buff[buff_mask == 0] = np.nan
-        ia = ImageArray(buff, units=data.units, info=self._get_info(item))
-
-        # divide by the weight_field, if needed
-        if weight_field is not None:
-            weight_buff = np.zeros(self.buff_size)
-            weight_buff_mask = np.zeros(self.buff_size).astype("int")
-            add_points_to_greyscale_image(
-                weight_buff, weight_buff_mask, px[mask], py[mask], weight_data[mask]
-            )
-            weight_array = ImageArray(
-                weight_buff, units=weight_data.units, info=self._get_info(item)
-            )
-            # remove values in no-particle region
-            weight_buff[weight_buff_mask == 0] = np.nan
-            locs = np.where(weight_array > 0)
-            ia[locs] /= weight_array[locs]
-
-        self.data[item] = ia
-        return self.data[item]
+        return px[mask], py[mask], mask
 
     # over-ride the base class version, since we don't want to exclude
     # particle fields
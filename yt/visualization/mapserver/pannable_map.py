@@ -4,11 +4,11 @@ from functools import wraps
 import bottle
 import numpy as np
 
-from yt.utilities.lib.misc_utilities import get_color_bounds
 from yt.utilities.png_writer import write_png_to_string
-from yt.visualization.fixed_resolution import FixedResolutionBuffer
 from yt.visualization.image_writer import apply_colormap
 
+from .tile_pyramid import TilePyramid
+
 local_dir = os.path.dirname(__file__)
 
 
@@ -30,11 +30,28 @@ def exc_writeout(f):
 class PannableMapServer:
     _widget_name = "pannable_map"
 
-    def __init__(self, data, field, takelog, cmap, route_prefix=""):
+    def __init__(
+        self,
+        data,
+        field,
+        takelog,
+        cmap,
+        route_prefix="",
+        tile_cache_dir=None,
+        tile_cache_size=256 * 1024 ** 2,
+        nthreads=4,
+    ):
         self.data = data
         self.ds = data.ds
         self.field = field
         self.cmap = cmap
+        self.tiles = TilePyramid(
+            data,
+            tile_size=256,
+            max_bytes=tile_cache_size,
+            cache_dir=tile_cache_dir,
+            nthreads=nthreads,
+        )
 
         bottle.route(f"{route_prefix}/map/:field/:L/:x/:y.png")(self.map)
         bottle.route(f"{route_prefix}/map/:field/:L/:x/:y.png")(self.map)
@@ -42,13 +59,9 @@ class PannableMapServer:
         bottle.route(f"{route_prefix}/:field")(self.index)
         bottle.route(f"{route_prefix}/index.html")(self.index)
         bottle.route(f"{route_prefix}/list", "GET")(self.list_fields)
-        # This is a double-check, since we do not always mandate this for
-        # slices:
-        self.data[self.field] = self.data[self.field].astype("float64")
         bottle.route(f"{route_prefix}/static/:path", "GET")(self.static)
 
         self.takelog = takelog
-        self._lock = False
 
         for unit in ["Gpc", "Mpc", "kpc", "pc"]:
             v = self.ds.domain_width[0].in_units(unit).value
@@ -57,59 +70,24 @@ class PannableMapServer:
         self.unit = unit
         self.px2unit = self.ds.domain_width[0].in_units(unit).value / 256
 
-    def lock(self):
-        import time
-
-        while self._lock:
-            time.sleep(0.01)
-        self._lock = True
-
-    def unlock(self):
-        self._lock = False
-
     def map(self, field, L, x, y):
         if "," in field:
             field = tuple(field.split(","))
+        L, x, y = int(L), int(x), int(y)
         cmap = self.cmap
-        dd = 1.0 / (2.0 ** (int(L)))
-        relx = int(x) * dd
-        rely = int(y) * dd
-        DW = self.ds.domain_right_edge - self.ds.domain_left_edge
-        xl = self.ds.domain_left_edge[0] + relx * DW[0]
-        yl = self.ds.domain_left_edge[1] + rely * DW[1]
-        xr = xl + dd * DW[0]
-        yr = yl + dd * DW[1]
-        try:
-            self.lock()
-            w = 256  # pixels
-            data = self.data[field]
-            frb = FixedResolutionBuffer(self.data, (xl, xr, yl, yr), (w, w))
-            cmi, cma = get_color_bounds(
-                self.data["px"],
-                self.data["py"],
-                self.data["pdx"],
-                self.data["pdy"],
-                data,
-                self.ds.domain_left_edge[0],
-                self.ds.domain_right_edge[0],
-                self.ds.domain_left_edge[1],
-                self.ds.domain_right_edge[1],
-                dd * DW[0] / (64 * 256),
-                dd * DW[0],
-            )
-        finally:
-            self.unlock()
+        cmi, cma = self.tiles.color_bounds(field, L)
+        tile = self.tiles[field, L, x, y]
+        # Tiles one level down are the next ones requested when zooming in.
+        self.tiles.prefetch(field, L, x, y)
 
         if self.takelog:
             cmi = np.log10(cmi)
             cma = np.log10(cma)
             to_plot = apply_colormap(
-                np.log10(frb[field]), color_bounds=(cmi, cma), cmap_name=cmap
+                np.log10(tile), color_bounds=(cmi, cma), cmap_name=cmap
             )
         else:
-            to_plot = apply_colormap(
-                frb[field], color_bounds=(cmi, cma), cmap_name=cmap
-            )
+            to_plot = apply_colormap(tile, color_bounds=(cmi, cma), cmap_name=cmap)
 
         rv = write_png_to_string(to_plot)
         return rv
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from yt.funcs import write_file_atomically
+from yt.utilities.io_handler import IOCache
+from yt.utilities.lib.misc_utilities import get_color_bounds
+from yt.visualization.fixed_resolution import FixedResolutionBuffer
+
+
+class TilePyramid:
+    r"""
+    Square tiles of the image of a slice or projection at every zoom level.
+
+    At level ``L`` the domain is covered by ``2**L`` by ``2**L`` tiles of
+    ``tile_size`` pixels on a side.  Each tile is pixelized once and kept in a
+    least-recently-used cache holding at most ``max_bytes`` bytes of tiles.
+    If ``cache_dir`` is set, tiles are also written there, and read back from
+    there rather than pixelized again once they have left the memory cache.
+    They are stored in a subdirectory named by a hash of the dataset, the
+    axis, weight field and data source of the image and the tile size, so
+    that images of different data can share a ``cache_dir``.
+    Tiles are pixelized on a pool of ``nthreads`` threads, so that several
+    requests can be served at the same time; a tile requested again while it
+    is being pixelized is not pixelized twice.
+
+    Parameters
+    ----------
+    data_source : YTSlice or YTQuadTreeProj
+        The slice or projection to make images of.
+    tile_size : int
+        The number of pixels on each side of a tile.  Default: 256
+    max_bytes : int
+        The largest number of bytes of tiles to keep in memory.
+        Default: 256 MB
+    cache_dir : string, optional
+        A directory in which to store every pixelized tile.
+    nthreads : int
+        The number of threads pixelizing tiles.  Default: 4
+
+    Examples
+    --------
+
+    >>> ds = load("IsolatedGalaxy/galaxy0030/galaxy0030")
+    >>> proj = ds.proj(("gas", "density"), "z")
+    >>> tiles = TilePyramid(proj)
+    >>> image = tiles[("gas", "density"), 3, 4, 2]
+    """
+
+    def __init__(
+        self,
+        data_source,
+        tile_size=256,
+        max_bytes=256 * 1024 ** 2,
+        cache_dir=None,
+        nthreads=4,
+    ):
+        self.data_source = data_source
+        self.ds = data_source.ds
+        self.tile_size = tile_size
+        self.cache = IOCache(max_bytes)
+        self.cache_dir = cache_dir
+        self._source_hash = self._hash_source()
+        self._executor = ThreadPoolExecutor(max_workers=nthreads)
+        self._pending = {}
+        self._color_bounds = {}
+        self._fields = set()
+        # Reentrant, as a future may finish while it is being registered.
+        self._lock = threading.RLock()
+        self._field_lock = threading.Lock()
+
+    def __getitem__(self, key):
+        return self.get_tile(*key)
+
+    def tile_bounds(self, level, x, y):
+        """The x and y extent of a tile, in the domain's x and y axes."""
+        dd = 1.0 / 2.0 ** level
+        DW = self.ds.domain_right_edge - self.ds.domain_left_edge
+        xl = self.ds.domain_left_edge[0] + x * dd * DW[0]
+        yl = self.ds.domain_left_edge[1] + y * dd * DW[1]
+        return (xl, xl + dd * DW[0], yl, yl + dd * DW[1])
+
+    def get_tile(self, field, level, x, y):
+        """Return the pixelized tile *x*, *y* of *field* at zoom *level*."""
+        return self.submit(field, level, x, y).result()
+
+    def submit(self, field, level, x, y):
+        """Start pixelizing a tile, and return a future for its image."""
+        key = (field, level, x, y)
+        with self._lock:
+            future = self._pending.get(key, None)
+            if future is None:
+                future = self._executor.submit(self._get_tile, key)
+                self._pending[key] = future
+                future.add_done_callback(lambda f: self._done(key))
+        return future
+
+    def prefetch(self, field, level, x, y):
+        """Start pixelizing the tiles that zooming in on a tile shows."""
+        for cx in (2 * x, 2 * x + 1):
+            for cy in (2 * y, 2 * y + 1):
+                key = (field, level + 1, cx, cy)
+                if key not in self.cache:
+                    self.submit(*key)
+
+    def _done(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _hash_source(self):
+        source = self.data_source
+        # Projections may be restricted to another data object.
+        sub_source = getattr(source, "data_source", None)
+        s = ";".join(
+            [
+                self.ds._hash(),
+                str(source.axis),
+                str(getattr(source, "weight_field", None)),
+                str(getattr(source, "method", None)),
+                source._hash,
+                "" if sub_source is None else sub_source._hash,
+                str(self.tile_size),
+            ]
+        )
+        return hashlib.md5(s.encode("utf-8")).hexdigest()
+
+    def _tile_filename(self, key):
+        field, level, x, y = key
+        if isinstance(field, tuple):
+            field = "_".join(field)
+        return os.path.join(
+            self.cache_dir, self._source_hash, field, str(level), f"{x}_{y}.npy"
+        )
+
+    def _get_tile(self, key):
+        tile = self.cache.get(key)
+        if tile is not None:
+            return tile
+        fn = None
+        if self.cache_dir is not None:
+            fn = self._tile_filename(key)
+            if os.path.exists(fn):
+                tile = np.load(fn)
+        if tile is None:
+            tile = self._pixelize(*key)
+            if fn is not None:
+                self._save_tile(fn, tile)
+        self.cache.put(key, tile)
+        return tile
+
+    def _save_tile(self, fn, tile):
+        os.makedirs(os.path.dirname(fn), exist_ok=True)
+        write_file_atomically(fn, lambda f: np.save(f, tile), suffix=".npy")
+
+    def _load_field(self, field):
+        # Generating fields of the data source is not thread safe, so every
+        # field is generated once before any tile is pixelized from it.
+        with self._field_lock:
+            if field not in self._fields:
+                for f in ("px", "py", "pdx", "pdy"):
+                    self.data_source[f]
+                self.data_source[field] = self.data_source[field].astype("float64")
+                self._fields.add(field)
+
+    def _pixelize(self, field, level, x, y):
+        self._load_field(field)
+        w = self.tile_size
+        frb = FixedResolutionBuffer(
+            self.data_source, self.tile_bounds(level, x, y), (w, w)
+        )
+        return np.asarray(frb[field].d, dtype="float64")
+
+    def color_bounds(self, field, level):
+        """The smallest and largest values shown by any tile of a level."""
+        key = (field, level)
+        if key not in self._color_bounds:
+            self._load_field(field)
+            data = self.data_source
+            dd = 1.0 / 2.0 ** level
+            DW = self.ds.domain_right_edge - self.ds.domain_left_edge
+            self._color_bounds[key] = get_color_bounds(
+                data["px"],
+                data["py"],
+                data["pdx"],
+                data["pdy"],
+                data[field],
+                self.ds.domain_left_edge[0],
+                self.ds.domain_right_edge[0],
+                self.ds.domain_left_edge[1],
+                self.ds.domain_right_edge[1],
+                dd * DW[0] / (64 * self.tile_size),
+                dd * DW[0],
+            )
+        return self._color_bounds[key]
+
+    def clear(self):
+        """Drop every tile held in memory."""
+        self.cache.clear()
+        self._color_bounds.clear()
+
+    def shutdown(self):
+        """Stop the threads pixelizing tiles, once they are done."""
+        self._executor.shutdown(wait=True)
@@ -8,10 +8,12 @@ import numpy as np
 
 from yt.data_objects.particle_filters import add_particle_filter
 from yt.data_objects.profiles import create_profile
+from yt.frontends.gadget.testing import fake_gadget_hdf5
 from yt.loaders import load
 from yt.testing import (
     assert_allclose,
     assert_array_almost_equal,
+    assert_equal,
     fake_particle_ds,
     requires_file,
 )
@@ -381,6 +383,32 @@ class TestParticleProjectionPlotSave(unittest.TestCase):
                 ):
                     pplot_wf.save()
 
+    def test_particle_plot_chunks(self):
+        # Particles are splatted one data file at a time.
+        fn = fake_gadget_hdf5(npart=(0, 1000), nfiles=4)
+        test_ds = load(fn)
+        ad = test_ds.all_data()
+        assert_equal(len(list(ad.chunks([], "io"))), 4)
+        x = ad["PartType1", "particle_position_x"].to("code_length").d
+        y = ad["PartType1", "particle_position_y"].to("code_length").d
+        mass = ad["PartType1", "particle_mass"]
+        vel = ad["PartType1", "particle_velocity_x"]
+        edges = np.linspace(0, float(test_ds.domain_width[0].to("code_length")), 65)
+        image = np.histogram2d(y, x, bins=edges, weights=mass.d)[0]
+        weighted = np.histogram2d(y, x, bins=edges, weights=(mass * vel).d)[0]
+        for field, weight_field, ref in [
+            ("particle_mass", None, image),
+            ("particle_velocity_x", "particle_mass", weighted / image),
+        ]:
+            plot = ParticleProjectionPlot(
+                test_ds, 2, ("PartType1", field), weight_field=weight_field
+            )
+            plot.set_buff_size(64)
+            frb = plot.frb[("PartType1", field)]
+            assert_equal(str(frb.units), str(ad["PartType1", field].units))
+            assert_allclose(frb.d[image > 0], ref[image > 0], rtol=1e-12)
+            assert np.all(np.isnan(frb.d[image == 0]))
+
     def test_creation_with_width(self):
         test_ds = fake_particle_ds()
         for width, (xlim, ylim, pwidth, _aun) in WIDTH_SPECS.items():
@@ -0,0 +1,77 @@
+import os
+import shutil
+import stat
+import tempfile
+
+import numpy as np
+
+from yt.testing import assert_equal, fake_random_ds
+from yt.visualization.fixed_resolution import FixedResolutionBuffer
+from yt.visualization.mapserver.tile_pyramid import TilePyramid
+
+
+def setup():
+    """Test specific setup."""
+    from yt.config import ytcfg
+
+    ytcfg["yt", "__withintesting"] = "True"
+
+
+def test_tile_pyramid():
+    ds = fake_random_ds(32, nprocs=4)
+    proj = ds.proj(("gas", "density"), 2)
+    field = ("gas", "density")
+    tmpdir = tempfile.mkdtemp()
+    old_umask = os.umask(0o022)
+    try:
+        tiles = TilePyramid(proj, tile_size=64, cache_dir=tmpdir)
+        images = {}
+        for key in [(0, 0, 0), (1, 1, 0), (2, 3, 2)]:
+            frb = FixedResolutionBuffer(proj, tiles.tile_bounds(*key), (64, 64))
+            images[key] = tiles[(field,) + key]
+            assert_equal(images[key], frb[field].d)
+        assert_equal(tiles.cache.misses, 3)
+
+        # Tiles asked for again, or asked for while they are being made, are
+        # only made once.
+        futures = [tiles.submit(field, 2, 3, 2) for i in range(4)]
+        futures += [tiles.submit(field, 3, 0, 0) for i in range(4)]
+        results = [f.result() for f in futures]
+        assert_equal(results[0], images[2, 3, 2])
+        assert_equal(results[4], results[7])
+        assert_equal(tiles.cache.misses, 4)
+
+        tiles.prefetch(field, 2, 3, 2)
+        tiles.shutdown()
+        level_dir = os.path.join(tmpdir, tiles._source_hash, "gas_density", "3")
+        assert_equal(len(os.listdir(level_dir)), 5)
+        # The tiles get the permissions set by the umask.
+        for fn in os.listdir(level_dir):
+            mode = os.stat(os.path.join(level_dir, fn)).st_mode
+            assert_equal(stat.S_IMODE(mode), 0o644)
+
+        # A new pyramid reads the tiles already on disk instead of
+        # pixelizing them again.
+        tiles = TilePyramid(proj, tile_size=64, cache_dir=tmpdir)
+        tiles._pixelize = None
+        for key, image in images.items():
+            assert_equal(tiles[(field,) + key], image)
+        cmi, cma = tiles.color_bounds(field, 0)
+        assert cmi <= np.min(images[0, 0, 0]) and cma >= np.max(images[0, 0, 0])
+        tiles.shutdown()
+
+        # Images of other data sharing the directory do not read these tiles.
+        for source in (
+            ds.proj(("gas", "density"), 0),
+            ds.proj(("gas", "density"), 2, weight_field=("gas", "density")),
+            ds.proj(("gas", "density"), 2, data_source=ds.sphere("c", 0.25)),
+            ds.slice(2, 0.5),
+        ):
+            other = TilePyramid(source, tile_size=64, cache_dir=tmpdir)
+            assert other._source_hash != tiles._source_hash
+            frb = FixedResolutionBuffer(source, other.tile_bounds(0, 0, 0), (64, 64))
+            assert_equal(other[field, 0, 0, 0], frb[field].d)
+            other.shutdown()
+    finally:
+        os.umask(old_umask)
+        shutil.rmtree(tmpdir)